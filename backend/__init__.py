@@ -3,10 +3,13 @@
 # --- Imports ---
 import os
 from flask import Flask, session, jsonify
-from .database import db
-from flask_migrate import Migrate
+from .database import db, init_sql_instrumentation, engine_options
+from .cache import response_cache
+from .jobs import jobs
+from .password_hasher import password_hasher
+from .session_store import init_session_store
+from .cli import LazyAppGroup
 from datetime import timedelta, date
-from flask_session import Session
 from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -18,8 +21,6 @@ import sys
 import logging
 
 # --- Extension Initialization ---
-migrate = Migrate()
-server_session = Session()
 limiter = Limiter(key_func=get_remote_address)
 bcrypt = Bcrypt()
 csrf = CSRFProtect()
@@ -52,25 +53,32 @@ def get_app_version(app_instance):
 def create_app(config_name=None):
     """Creates and configures the Flask application instance."""
     app = Flask(__name__, instance_relative_config=False)
+    app.cli = LazyAppGroup(app.name)
 
     # --- Configuration Loading ---
     flask_env = os.environ.get('FLASK_ENV', os.environ.get('NODE_ENV', 'development'))
     is_production = (flask_env == 'production')
     is_testing = (flask_env == 'testing')
     app.config['TESTING'] = is_testing
-    print(f"INFO: Loading {'Production' if is_production else ('Testing' if is_testing else 'Development')} Configuration")
     app.config['DEBUG'] = not is_production and not is_testing
 
+    # --- Logging ---
+    # app.logger is the 'backend' logger: DEBUG in development, WARNING otherwise (LOG_LEVEL overrides)
+    logger = app.logger
+    if os.environ.get('LOG_LEVEL'):
+        logger.setLevel(os.environ['LOG_LEVEL'].upper())
+    logger.info(f"Loading {'Production' if is_production else ('Testing' if is_testing else 'Development')} Configuration")
+
     # --- Database Configuration ---
     database_url = os.environ.get('DATABASE_URL')
     if is_testing:
         test_db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_app.db')
         database_url = f"sqlite:///{test_db_path}"
-        print(f"INFO: Using TESTING database: {database_url}")
+        logger.info(f"Using TESTING database: {database_url}")
     elif not database_url:
         if is_production:
              raise ValueError("FATAL: DATABASE_URL environment variable not set in production environment")
-        print("WARNING: DATABASE_URL environment variable not set. Using local SQLite 'backend/app.db'.")
+        logger.warning("DATABASE_URL environment variable not set. Using local SQLite 'backend/app.db'.")
         backend_folder_path = os.path.dirname(os.path.abspath(__file__))
         db_path = os.path.join(backend_folder_path, 'app.db')
         database_url = f"sqlite:///{db_path}"
@@ -78,6 +86,8 @@ def create_app(config_name=None):
          database_url = database_url.replace('postgres://', 'postgresql://', 1)
     app.config['SQLALCHEMY_DATABASE_URI'] = database_url
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Per-process connection pool (DB_POOL_SIZE, DB_MAX_OVERFLOW, ...); gunicorn.conf.py sizes it per worker
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(database_url)
 
     # --- Secret Key Configuration ---
     if is_testing:
@@ -85,15 +95,15 @@ def create_app(config_name=None):
     else:
         flask_secret_key = os.environ.get('FLASK_SECRET_KEY', 'dev-insecure-flask-key-replace-in-dotenv' if not is_production else None)
         if not flask_secret_key: raise ValueError("FATAL: FLASK_SECRET_KEY environment variable not set in production environment")
-        if flask_secret_key == 'dev-insecure-flask-key-replace-in-dotenv': print("WARNING: Using default insecure FLASK_SECRET_KEY.")
+        if flask_secret_key == 'dev-insecure-flask-key-replace-in-dotenv': logger.warning("Using default insecure FLASK_SECRET_KEY.")
         app.config['SECRET_KEY'] = flask_secret_key
 
     # --- Serializer Initialization ---
     try:
         app.password_reset_serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt='password-reset-salt')
-        print("INFO: URLSafeTimedSerializer initialized.")
+        logger.info("URLSafeTimedSerializer initialized.")
     except Exception as e:
-        print(f"FATAL: Failed to initialize URLSafeTimedSerializer: {e}")
+        logger.critical(f"Failed to initialize URLSafeTimedSerializer: {e}")
         raise
 
     # --- Frontend URL Configuration ---
@@ -101,12 +111,12 @@ def create_app(config_name=None):
     app.config['FRONTEND_BASE_URL'] = os.environ.get('FRONTEND_BASE_URL', default_frontend_url)
     if not app.config['FRONTEND_BASE_URL']:
          if is_production:
-             print("FATAL: FRONTEND_BASE_URL environment variable is not set (required for password reset emails).")
+             logger.critical("FRONTEND_BASE_URL environment variable is not set (required for password reset emails).")
          else:
-             print(f"WARNING: FRONTEND_BASE_URL not set, defaulting to '{default_frontend_url}' for development.")
+             logger.warning(f"FRONTEND_BASE_URL not set, defaulting to '{default_frontend_url}' for development.")
              app.config['FRONTEND_BASE_URL'] = default_frontend_url
     else:
-        print(f"INFO: FRONTEND_BASE_URL configured: {app.config['FRONTEND_BASE_URL']}")
+        logger.info(f"FRONTEND_BASE_URL configured: {app.config['FRONTEND_BASE_URL']}")
 
     # --- Mail Configuration (for smtplib) ---
     app.config['MAIL_SERVER'] = os.environ.get('MAIL_SERVER')
@@ -118,9 +128,13 @@ def create_app(config_name=None):
     app.config['MAIL_DEFAULT_SENDER'] = os.environ.get('MAIL_DEFAULT_SENDER', app.config['MAIL_USERNAME'])
 
     # --- Session Configuration ---
-    app.config['SESSION_TYPE'] = 'sqlalchemy'
-    app.config['SESSION_SQLALCHEMY'] = db
+    # sqlalchemy (the `sessions` table), redis (REDIS_URL) or local (process memory, development only)
+    app.config['SESSION_BACKEND'] = os.environ.get('SESSION_BACKEND', 'sqlalchemy')
     app.config['SESSION_SQLALCHEMY_TABLE'] = 'sessions'
+    # Per-process read cache for session payloads; 0 disables it
+    app.config['SESSION_READ_CACHE_SECONDS'] = int(os.environ.get('SESSION_READ_CACHE_SECONDS', 5))
+    # An unmodified session's stored expiry is pushed forward at most this often
+    app.config['SESSION_REFRESH_INTERVAL_SECONDS'] = int(os.environ.get('SESSION_REFRESH_INTERVAL_SECONDS', 60))
     app.config['SESSION_PERMANENT'] = True
     app.config['SESSION_KEY_PREFIX'] = 'session:'
     app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=int(os.environ.get('SESSION_LIFETIME_DAYS', 7)))
@@ -131,48 +145,92 @@ def create_app(config_name=None):
     # --- Application Version Loading ---
     app_version = get_app_version(app)
     app.config['APP_VERSION'] = app_version
-    print(f"INFO: Application Version loaded: {app.config.get('APP_VERSION')}")
+    logger.info(f"Application Version loaded: {app.config.get('APP_VERSION')}")
 
     # --- Middleware ---
     app.wsgi_app = ProxyFix(
         app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1
     )
 
+    # --- Password Hashing (bcrypt in a bounded pool, off the request thread) ---
+    # Inline under TESTING: spawning hash processes would dominate short test runs
+    app.config['BCRYPT_LOG_ROUNDS'] = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    app.config['AUTH_HASH_EXECUTOR'] = os.environ.get('AUTH_HASH_EXECUTOR', 'inline' if is_testing else 'thread')
+    app.config['AUTH_HASH_WORKERS'] = int(os.environ.get('AUTH_HASH_WORKERS', 2))
+    app.config['AUTH_HASH_MAX_PENDING'] = int(os.environ.get('AUTH_HASH_MAX_PENDING', 8))
+    app.config['AUTH_HASH_QUEUE_TIMEOUT'] = float(os.environ.get('AUTH_HASH_QUEUE_TIMEOUT', 5))
+
     # --- Initialize Extensions with App ---
     bcrypt.init_app(app)
+    password_hasher.init_app(app)
 
     # --- Initialize DB ---
     db.init_app(app) # Initialize Flask-SQLAlchemy
 
-    # --- Initialize Flask-Session ---
-    server_session.init_app(app) 
+    # --- SQL Instrumentation (Server-Timing header + per-request query log) ---
+    app.config['SQL_INSTRUMENTATION_ENABLED'] = os.environ.get('SQL_INSTRUMENTATION_ENABLED', 'true').lower() == 'true'
+    app.config['QUERY_BUDGET_STRICT'] = os.environ.get('QUERY_BUDGET_STRICT', 'false').lower() == 'true'
+    init_sql_instrumentation(app)
+
+    # --- Commander Catalog (in-process autocomplete snapshot) ---
+    # Seconds between max(updated_at) checks; 0 re-checks on every search
+    app.config['COMMANDER_CATALOG_CHECK_SECONDS'] = 0 if is_testing else int(os.environ.get('COMMANDER_CATALOG_CHECK_SECONDS', 30))
+
+    # --- Response Cache (per-user analytics responses, invalidated by data version) ---
+    # Off under TESTING because fixtures write directly to the DB without bumping versions
+    app.config['REDIS_URL'] = os.environ.get('REDIS_URL')
+    app.config['RESPONSE_CACHE_ENABLED'] = not is_testing and os.environ.get('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    app.config['RESPONSE_CACHE_BACKEND'] = os.environ.get('RESPONSE_CACHE_BACKEND', 'redis' if app.config['REDIS_URL'] and not is_testing else 'local')
+    app.config['RESPONSE_CACHE_TTL'] = int(os.environ.get('RESPONSE_CACHE_TTL', 300))
+    app.config['WEB_CONCURRENCY'] = int(os.environ.get('WEB_CONCURRENCY', 1)) # Worker processes (set by gunicorn.conf.py)
+    response_cache.init_app(app)
+
+    # --- Background Jobs (durable `jobs` table + in-process thread pool) ---
+    # Inline under TESTING so a request's side effects finish before it returns
+    app.config['JOBS_EXECUTOR'] = os.environ.get('JOBS_EXECUTOR', 'inline' if is_testing else 'thread')
+    app.config['JOBS_WORKERS'] = int(os.environ.get('JOBS_WORKERS', 2))
+    app.config['JOBS_POLL_SECONDS'] = int(os.environ.get('JOBS_POLL_SECONDS', 30))
+    app.config['MAIL_TIMEOUT'] = int(os.environ.get('MAIL_TIMEOUT', 30))
+    jobs.init_app(app)
+
+    # --- Initialize Server-Side Sessions ---
+    init_session_store(app)
     
-    # --- Initialize Flask-Migrate ---
-    migrate.init_app(app, db)
+    # --- Initialize Flask-Migrate (CLI only) ---
+    # Flask-Migrate imports Alembic, which only `flask db ...` needs; its init_app registers the `db` group
+    def load_migrate_commands():
+        from flask_migrate import Migrate
+        Migrate(app, db)
+        return app.cli.commands['db']
+    app.cli.add_lazy_command('db', load_migrate_commands)
 
     # --- Limiter Initialization ---
     if app.config.get("TESTING"):
         limiter.init_app(app)
         limiter.enabled = False
-        print("INFO: Rate limiting DISABLED for TESTING environment.")
+        logger.info("Rate limiting DISABLED for TESTING environment.")
     else:
         limiter.enabled = True
         redis_url = os.environ.get('REDIS_URL')
         if is_production and not redis_url:
-            print("WARNING: REDIS_URL environment variable not set in Production. Rate limiting will use memory storage (may be inconsistent).")
+            logger.warning("REDIS_URL environment variable not set in Production. Rate limiting will use memory storage (may be inconsistent).")
             limiter_storage_uri = "memory://"
         elif redis_url:
             limiter_storage_uri = redis_url
-            print("INFO: Rate limiting ENABLED using Redis.")
+            logger.info("Rate limiting ENABLED using Redis.")
         else:
             limiter_storage_uri = "memory://"
-            print("INFO: Rate limiting ENABLED using in-memory storage (development).")
+            logger.info("Rate limiting ENABLED using in-memory storage (development).")
         app.config['RATELIMIT_STORAGE_URL'] = limiter_storage_uri
+        # RATELIMIT_ENABLED=false is for local load tests (backend/scripts/load_test.py), which all come from one IP
+        app.config['RATELIMIT_ENABLED'] = os.environ.get('RATELIMIT_ENABLED', 'true').lower() == 'true'
+        if not app.config['RATELIMIT_ENABLED']:
+            logger.warning("Rate limiting DISABLED by RATELIMIT_ENABLED=false.")
         limiter.init_app(app) # Initialize Flask-Limiter
 
      # ---> INITIALIZE CSRFProtect HERE <---
     csrf.init_app(app)
-    print("INFO: CSRF Protection Initialized.") # Log confirmation
+    logger.info("CSRF Protection Initialized.") # Log confirmation
     
     # --- Error Handlers ---
     @app.errorhandler(429)
@@ -203,26 +261,32 @@ def create_app(config_name=None):
     try:
         from backend.routes import register_routes
         register_routes(app)
-        print("INFO: Routes registered successfully.")
+        logger.info("Routes registered successfully.")
     except ImportError as e:
-        print(f"ERROR: Could not import or register routes: {e}")
+        logger.error(f"Could not import or register routes: {e}")
         if app.config.get("TESTING"):
             raise RuntimeError(f"Failed to register routes during testing: {e}") from e
     except Exception as e:
-        print(f"ERROR: An unexpected error occurred during route registration: {e}")
+        logger.error(f"An unexpected error occurred during route registration: {e}")
         if app.config.get("TESTING"):
             raise RuntimeError(f"Unexpected error during route registration: {e}") from e
 
     # --- CLI Commands ---
-    try:
-        from manage import seed_deck_types, update_commanders_data, update_flags
-        app.cli.add_command(seed_deck_types, name='seed-deck-types')
-        app.cli.add_command(update_commanders_data, name='update-commanders')
-        app.cli.add_command(update_flags, name='update-flags')
-        print("INFO: Custom CLI commands registered successfully.")
-    except ImportError as e:
-        print(f"ERROR: Could not import or register custom CLI commands from manage.py: {e}")
-        print("INFO: Ensure manage.py is in the project root or adjust import path.")
+    # Imported from manage.py on first use, so serving requests never loads it (or requests, which it needs)
+    for name, attribute in (
+        ('seed-deck-types', 'seed_deck_types'),
+        ('update-commanders', 'update_commanders_data'),
+        ('update-flags', 'update_flags'),
+        ('rebuild-deck-stats', 'rebuild_deck_stats_command'),
+        ('rebuild-opponent-signatures', 'rebuild_opponent_signatures_command'),
+        ('replay-ratings', 'replay_ratings_command'),
+        ('import-matches', 'import_matches_command'),
+        ('seed-synthetic', 'seed_synthetic_command'),
+        ('run-jobs', 'run_jobs_command'),
+        ('tune-bcrypt', 'tune_bcrypt_command'),
+        ('purge-sessions', 'purge_sessions_command'),
+    ):
+        app.cli.add_lazy_command(name, f'manage:{attribute}')
 
     @app.cli.command("create-session-table")
     def create_session_table():
@@ -0,0 +1,208 @@
+# backend/cache.py
+from collections import OrderedDict
+import json
+import logging
+import secrets
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_ENTRIES = 2048
+GLOBAL_SCOPE = "global"
+
+# --- Backends ---
+
+class LocalCacheBackend:
+    """
+    Thread-safe in-process LRU with per-entry TTL. Version counters are never evicted.
+    Only correct when one process serves every request: another worker would not
+    see this one's version bumps and would keep answering 304 / stale bodies.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        # Versions restart at 0 with the process; the epoch keeps old ETags from matching
+        self.epoch = secrets.token_hex(4)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_version(self, key):
+        return self._versions.get(key, 0)
+
+    def get_versions(self, keys):
+        return [self._versions.get(key, 0) for key in keys]
+
+    def incr_version(self, key):
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            return self._versions[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.epoch = secrets.token_hex(4)
+
+
+class RedisCacheBackend:
+    """Shared cache in Redis (same REDIS_URL the rate limiter uses). Values are stored as JSON."""
+
+    def __init__(self, url, prefix="tcg:cache:"):
+        import redis  # Optional dependency, only needed for this backend
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.epoch = "r"
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def get_version(self, key):
+        raw = self.client.get(self.prefix + key)
+        return int(raw) if raw is not None else 0
+
+    def get_versions(self, keys):
+        return [int(raw) if raw is not None else 0 for raw in self.client.mget([self.prefix + key for key in keys])]
+
+    def incr_version(self, key):
+        # No expiry: a counter that reset to 0 could reproduce an ETag for different data
+        return self.client.incr(self.prefix + key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+# --- Response Cache ---
+
+class ResponseCache:
+    """
+    Caches per-user JSON responses. Keys embed the user's data version, so a write
+    only has to bump the version (bump_user_data_version) to make every cached
+    response for that user unreachable; stale entries then age out via TTL/LRU.
+    A user's version also carries the global one, so maintenance commands that
+    rewrite shared or many users' data (bump_global_data_version) invalidate
+    everyone at once. Backend errors are logged and treated as cache misses.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.ttl = DEFAULT_TTL_SECONDS
+
+    def init_app(self, app):
+        backend_name = app.config.get("RESPONSE_CACHE_BACKEND", "local")
+        self.ttl = app.config.get("RESPONSE_CACHE_TTL", DEFAULT_TTL_SECONDS)
+        app.extensions["response_cache"] = self
+        if backend_name == "redis":
+            self.backend = RedisCacheBackend(app.config["REDIS_URL"])
+        elif app.config.get("WEB_CONCURRENCY", 1) > 1:
+            # Versions must be shared by every worker; without Redis, cached bodies and ETags are off
+            logger.warning("Response cache and ETags disabled: the local backend only works with one worker process. Set REDIS_URL to enable them.")
+            self.backend = None
+            app.config["RESPONSE_CACHE_ENABLED"] = False
+        else:
+            self.backend = LocalCacheBackend(app.config.get("RESPONSE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+
+    def after_fork(self):
+        """
+        Gives a forked worker fresh local counters and a new epoch. A worker forked
+        from the preloaded master (including a recycled one) would otherwise restart
+        the inherited versions under the same epoch and could repeat an old ETag.
+        """
+        if isinstance(self.backend, LocalCacheBackend):
+            self.backend.clear()
+
+    @staticmethod
+    def _version_key(user_id):
+        return f"data_version:{user_id}"
+
+    def data_version(self, scope):
+        """
+        '<user version>.<global version>' for a user id, or the global version alone
+        for GLOBAL_SCOPE, read in one backend call. None if the backend is unavailable.
+        """
+        if self.backend is None:
+            return None
+        keys = [self._version_key(scope)]
+        if scope != GLOBAL_SCOPE:
+            keys.append(self._version_key(GLOBAL_SCOPE))
+        try:
+            return ".".join(str(version) for version in self.backend.get_versions(keys))
+        except Exception as e:
+            logger.error(f"Response cache version lookup failed: {e}")
+            return None
+
+    def etag_version(self, scope):
+        """'<epoch>.<version>' for a user id or GLOBAL_SCOPE (None if the backend is unavailable)."""
+        version = self.data_version(scope)
+        return None if version is None else f"{self.backend.epoch}.{version}"
+
+    def bump(self, user_id):
+        try:
+            self.backend.incr_version(self._version_key(user_id))
+        except Exception as e:
+            logger.error(f"Response cache invalidation failed for user {user_id}: {e}")
+
+    def get(self, key):
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Response cache read failed: {e}")
+            return None
+
+    def set(self, key, value, ttl=None):
+        try:
+            self.backend.set(key, value, ttl or self.ttl)
+        except Exception as e:
+            logger.error(f"Response cache write failed: {e}")
+
+    def clear(self):
+        self.backend.clear()
+
+
+response_cache = ResponseCache()
+
+def bump_user_data_version(user_id):
+    """Invalidates every cached response for a user. Call after committing a write to their data."""
+    if response_cache.backend is not None and user_id is not None:
+        response_cache.bump(user_id)
+
+def bump_global_data_version():
+    """
+    Invalidates every cached response and ETag, shared (e.g. /api/deck_types) and
+    per-user alike. Call after a command rewrites data outside one user's requests.
+    """
+    if response_cache.backend is not None:
+        response_cache.bump(GLOBAL_SCOPE)
@@ -0,0 +1,35 @@
+# backend/cli.py
+import importlib
+
+from flask.cli import AppGroup
+
+
+class LazyAppGroup(AppGroup):
+    """
+    The app's `flask` command group, with commands that are only imported when
+    the CLI looks them up (invoked, or listed by --help). Serving requests never
+    needs them, so the app factory skips manage.py with its dependencies
+    (e.g. requests) and Alembic.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = {}
+
+    def add_lazy_command(self, name, target):
+        """`target` is 'module:attribute' naming a click command, or a callable returning one."""
+        self.lazy_commands[name] = target
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx, name):
+        target = self.lazy_commands.pop(name, None)
+        if target is not None:
+            if callable(target):
+                command = target()
+            else:
+                module_name, attribute = target.split(":")
+                command = getattr(importlib.import_module(module_name), attribute)
+            self.add_command(command, name)
+        return super().get_command(ctx, name)
@@ -1,4 +1,112 @@
 # backend/database.py
+from flask import request, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, text
+import logging
+import os
+import time
 
-db = SQLAlchemy(session_options={"autocommit": False, "autoflush": False})
\ No newline at end of file
+db = SQLAlchemy(session_options={"autocommit": False, "autoflush": False})
+
+sql_logger = logging.getLogger("backend.sql")
+
+# Partial-index predicate for soft-deletable tables, as **kwargs to db.Index.
+# SQLite only uses a partial index when the query repeats the predicate term
+# literally, and `is_active == true()` compiles to `is_active = 1` there.
+ACTIVE_ROWS_ONLY = {"postgresql_where": text("is_active"), "sqlite_where": text("is_active = 1")}
+
+# --- Connection Pool ---
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 5
+DEFAULT_POOL_TIMEOUT_SECONDS = 10
+# Below the usual server/proxy idle cut-offs, so a pooled connection is never silently dead
+DEFAULT_POOL_RECYCLE_SECONDS = 1800
+
+def engine_options(database_url):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for `database_url`. Each process (gunicorn worker)
+    gets its own pool of DB_POOL_SIZE connections plus DB_MAX_OVERFLOW extra ones
+    under bursts; a request waits DB_POOL_TIMEOUT seconds for a free one. SQLite
+    keeps SQLAlchemy's defaults, since it has no server connections to pool.
+    """
+    if database_url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", DEFAULT_POOL_SIZE)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", DEFAULT_MAX_OVERFLOW)),
+        "pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT_SECONDS)),
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", DEFAULT_POOL_RECYCLE_SECONDS)),
+        "pool_pre_ping": os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true",
+    }
+
+def dispose_engines_after_fork(app):
+    """
+    Called in a freshly forked worker (gunicorn post_fork). Connections opened
+    by the parent while preloading are dropped from this process's pools
+    without closing them, since the parent still owns those sockets. The worker
+    then opens its own connections on first use.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+# --- Per-Request SQL Instrumentation ---
+
+REQUEST_STATS_KEY = "backend.sql_stats"
+QUERY_START_KEY = "backend.query_start"
+
+class QueryStats:
+    """Statements executed and cumulative DB time (seconds) for one request."""
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+def request_query_stats():
+    """QueryStats for the current request (None outside a request)."""
+    if not has_request_context():
+        return None
+    return request.environ.setdefault(REQUEST_STATS_KEY, QueryStats())
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        conn.info.setdefault(QUERY_START_KEY, []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(QUERY_START_KEY)
+    if not starts or not has_request_context():
+        return
+    stats = request_query_stats()
+    stats.count += 1
+    stats.duration += time.perf_counter() - starts.pop()
+
+def init_sql_instrumentation(app):
+    """
+    Counts statements and DB time per request on the app's engine, then reports
+    them as a Server-Timing header and one structured log line per request.
+    Disabled with SQL_INSTRUMENTATION_ENABLED = False.
+    """
+    if not app.config.get("SQL_INSTRUMENTATION_ENABLED", True):
+        return
+
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.after_request
+    def add_server_timing(response):
+        stats = request_query_stats()
+        if stats is None:
+            return response
+        duration_ms = stats.duration * 1000
+        response.headers.add("Server-Timing", f'db;dur={duration_ms:.1f};desc="{stats.count} queries"')
+        sql_logger.info(
+            f"sql_stats method={request.method} path={request.path} endpoint={request.endpoint} "
+            f"status={response.status_code} queries={stats.count} db_ms={duration_ms:.1f}",
+            extra={"sql_queries": stats.count, "sql_ms": round(duration_ms, 1), "endpoint": request.endpoint}
+        )
+        return response
@@ -0,0 +1,217 @@
+# backend/jobs.py
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+import logging
+import os
+import threading
+
+from sqlalchemy import select, update, or_, and_
+from .database import db
+from .models.job import Job, JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_FAILED
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_POLL_SECONDS = 30
+RETRY_BASE_SECONDS = 30 # Backoff doubles per failed attempt
+RUN_DUE_BATCH_SIZE = 100
+# A job left 'running' this long belongs to a worker that died mid-attempt
+STALE_RUNNING_SECONDS = 600
+EXECUTOR_INLINE = "inline"
+EXECUTOR_THREAD = "thread"
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help (the job is marked failed at once)."""
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+class JobQueue:
+    """
+    Runs slow side effects (SMTP delivery and the like) off the request path.
+    enqueue() commits a row to the `jobs` table and hands its id to a small
+    in-process thread pool; each attempt claims the row with a conditional UPDATE,
+    so a job runs once even if the poller and the pool race for it. Failed attempts
+    go back to 'pending' with exponential backoff and are picked up by the poller
+    thread (or `flask run-jobs`) until max_attempts.
+
+    With JOBS_EXECUTOR=inline (the TESTING default) jobs run synchronously inside
+    enqueue() and there is no poller. Threads are started once per process by
+    start(): gunicorn's post_fork calls it as each worker boots, and otherwise the
+    first request does. So retries and abandoned jobs are picked up after a restart
+    without waiting for a new enqueue, while the preloading master and CLI
+    commands never run threads, and children of a fork never share a dead pool.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.handlers = {}
+        self.mode = EXECUTOR_THREAD
+        self.workers = DEFAULT_WORKERS
+        self.poll_seconds = DEFAULT_POLL_SECONDS
+        self._executor = None
+        self._poller = None
+        self._pid = None
+        self._futures = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def init_app(self, app):
+        self.app = app
+        self.mode = app.config.get("JOBS_EXECUTOR", EXECUTOR_THREAD)
+        self.workers = app.config.get("JOBS_WORKERS", DEFAULT_WORKERS)
+        self.poll_seconds = app.config.get("JOBS_POLL_SECONDS", DEFAULT_POLL_SECONDS)
+        app.before_request(self.start)
+        app.extensions["jobs"] = self
+
+    def handler(self, kind):
+        """Registers the decorated function as the handler for jobs of `kind`; it receives the payload."""
+        def decorator(func):
+            self.handlers[kind] = func
+            return func
+        return decorator
+
+    # --- Producing ---
+
+    def enqueue(self, kind, payload, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        Durably records a job and schedules its first attempt. Commits the current
+        session, so call it after the request's own writes. Returns the job id.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'.")
+        job = Job(kind=kind, payload=payload, max_attempts=max_attempts, run_after=_utcnow())
+        db.session.add(job)
+        db.session.commit()
+        self._dispatch(job.id)
+        return job.id
+
+    def _dispatch(self, job_id):
+        if self.mode == EXECUTOR_INLINE:
+            self.run_job(job_id)
+            return
+        future = self._ensure_started().submit(self._run_in_context, job_id)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+
+    def _forget(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    # --- Threads ---
+
+    def start(self):
+        """Starts this process's pool and poller in thread mode (no-op once running here)."""
+        if self.mode == EXECUTOR_THREAD and self._pid != os.getpid():
+            self._ensure_started()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._stop.clear()
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jobs")
+                self._poller = None
+                if self.poll_seconds > 0:
+                    self._poller = threading.Thread(target=self._poll, name="jobs-poller", daemon=True)
+                    self._poller.start()
+            return self._executor
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                with self.app.app_context():
+                    for job_id in self.due_job_ids():
+                        self._dispatch(job_id)
+            except Exception as e:
+                logger.error(f"Job poller failed: {e}", exc_info=True)
+
+    def _run_in_context(self, job_id):
+        with self.app.app_context():
+            self.run_job(job_id)
+
+    def drain(self, timeout=None):
+        """Waits for the attempts already handed to the pool (tests and shutdown)."""
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures, timeout=timeout)
+
+    def shutdown(self):
+        self._stop.set()
+        with self._lock:
+            executor, self._executor, self._pid = self._executor, None, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    # --- Consuming ---
+
+    def due_job_ids(self, limit=RUN_DUE_BATCH_SIZE):
+        """Pending jobs whose backoff has elapsed, plus running jobs abandoned by a dead worker."""
+        now = _utcnow()
+        return db.session.scalars(
+            select(Job.id)
+            .where(or_(
+                and_(Job.status == JOB_PENDING, Job.run_after <= now),
+                and_(Job.status == JOB_RUNNING, Job.run_after <= now - timedelta(seconds=STALE_RUNNING_SECONDS))
+            ))
+            .order_by(Job.run_after, Job.id)
+            .limit(limit)
+        ).all()
+
+    def run_due(self, limit=RUN_DUE_BATCH_SIZE):
+        """Runs every due job in the calling thread. Returns the number of attempts made."""
+        attempts = 0
+        for job_id in self.due_job_ids(limit):
+            attempts += self.run_job(job_id)
+        return attempts
+
+    def _claim(self, job_id):
+        """Moves a due job to 'running' (run_after marks the claim); False if someone else has it."""
+        now = _utcnow()
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, or_(
+                Job.status == JOB_PENDING,
+                and_(Job.status == JOB_RUNNING, Job.run_after <= now - timedelta(seconds=STALE_RUNNING_SECONDS))
+            ))
+            .values(status=JOB_RUNNING, attempts=Job.attempts + 1, run_after=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        return claimed == 1
+
+    def run_job(self, job_id):
+        """One attempt at a job. Returns True if an attempt was made."""
+        if not self._claim(job_id):
+            return False
+        job = db.session.get(Job, job_id)
+        handler = self.handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise PermanentJobError(f"No handler registered for job kind '{job.kind}'.")
+            handler(job.payload)
+        except Exception as e:
+            db.session.rollback()
+            job = db.session.get(Job, job_id)
+            job.last_error = f"{type(e).__name__}: {e}"
+            if isinstance(e, PermanentJobError) or job.attempts >= job.max_attempts:
+                job.status = JOB_FAILED
+                logger.error(f"Job {job_id} ({job.kind}) failed for good after {job.attempts} attempts: {e}")
+            else:
+                job.status = JOB_PENDING
+                job.run_after = _utcnow() + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+                logger.warning(f"Job {job_id} ({job.kind}) attempt {job.attempts} failed, retrying: {e}")
+        else:
+            job.status = JOB_DONE
+            job.last_error = None
+            logger.info(f"Job {job_id} ({job.kind}) done after {job.attempts} attempt(s).")
+        db.session.commit()
+        return True
+
+
+jobs = JobQueue()
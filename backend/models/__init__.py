@@ -9,6 +9,10 @@ from .commander_deck import CommanderDeck
 from .deck_type import DeckType
 from .tag import Tag
 from .opponent_commander_in_match import OpponentCommanderInMatch
+from .deck_stats import DeckStats
+from .opponent_seat_signature import OpponentSeatSignature
+from .rating import Rating
+from .job import Job
 
 __all__ = [
     'User',
@@ -20,5 +24,9 @@ __all__ = [
     'LoggedMatch',
     'LoggedMatchResult',
     'UserDeck',
-    'OpponentCommanderInMatch'
+    'OpponentCommanderInMatch',
+    'DeckStats',
+    'OpponentSeatSignature',
+    'Rating',
+    'Job'
 ]
\ No newline at end of file
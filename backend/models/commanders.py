@@ -22,13 +22,15 @@ class Commander(db.Model):
     set_code = db.Column(db.String, nullable=True)
     image_url = db.Column(db.String, nullable=True)
     art_crop = db.Column(db.String, nullable=True)
-    updated_at = db.Column(db.TIMESTAMP, server_default=func.current_timestamp(), nullable=False)
+    updated_at = db.Column(db.TIMESTAMP, server_default=func.current_timestamp(), onupdate=func.current_timestamp(), nullable=False)
     partner = db.Column(db.Boolean, default=False, nullable=False, server_default="0")
     background = db.Column(db.Boolean, default=False, nullable=False, server_default="0")
     choose_a_background = db.Column(db.Boolean, default=False, nullable=False, server_default="0")
     friends_forever = db.Column(db.Boolean, default=False, nullable=False, server_default="0")
     doctor_companion = db.Column(db.Boolean, default=False, nullable=False, server_default="0")
     time_lord_doctor = db.Column(db.Boolean, default=False, nullable=False, server_default="0")
+    # SHA-1 of the persisted Scryfall fields; refreshes skip cards whose hash is unchanged
+    content_hash = db.Column(db.String(40), nullable=True)
 
     commander_decks = relationship(
         "CommanderDeck", 
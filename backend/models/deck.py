@@ -1,6 +1,6 @@
 # backend/models/deck.py
 
-from backend.database import db
+from backend.database import db, ACTIVE_ROWS_ONLY
 from backend.models.deck_type import DeckType
 from backend.models.commander_deck import CommanderDeck
 from backend.models.tag import deck_tags
@@ -28,8 +28,7 @@ class Deck(db.Model):
         Boolean,
         nullable=False,
         default=True,
-        server_default=text('TRUE'), # Use text for DB compatibility
-        index=True
+        server_default=text('TRUE') # Use text for DB compatibility; indexed via ix_decks_active_user_type
     )
     deleted_at = db.Column(
         DateTime(timezone=True),
@@ -46,6 +45,11 @@ class Deck(db.Model):
     commander_decks = db.relationship("CommanderDeck", back_populates="deck", uselist=False, cascade="all, delete-orphan")
     deck_url = db.Column(db.String(512), nullable=True)
 
+    __table_args__ = (
+        # A user's active decks (deck lists, ownership checks), optionally by type
+        Index('ix_decks_active_user_type', 'user_id', 'deck_type_id', **ACTIVE_ROWS_ONLY),
+    )
+
     # --- Instance Methods ---
     def to_dict(self):
         # Note: Callers should ensure this is only used for active decks
@@ -0,0 +1,50 @@
+# backend/models/deck_stats.py
+
+from backend.database import db
+from sqlalchemy import DateTime, Integer
+from sqlalchemy.sql import func
+
+SEAT_NUMBERS = (1, 2, 3, 4)
+
+class DeckStats(db.Model):
+    """
+    Rollup of a deck's active matches, maintained incrementally on every match write.
+    One row per deck; see backend/services/decks/deck_stats_service.py.
+    """
+    __tablename__ = "deck_stats"
+
+    # --- Columns ---
+    deck_id = db.Column(Integer, db.ForeignKey('decks.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+
+    total_matches = db.Column(Integer, nullable=False, default=0, server_default='0')
+    total_wins = db.Column(Integer, nullable=False, default=0, server_default='0')
+    total_draws = db.Column(Integer, nullable=False, default=0, server_default='0')
+    last_match = db.Column(DateTime(timezone=True), nullable=True)
+
+    # --- Per-Seat Counts (turn order 1-4) ---
+    seat_1_matches = db.Column(Integer, nullable=False, default=0, server_default='0')
+    seat_1_wins = db.Column(Integer, nullable=False, default=0, server_default='0')
+    seat_2_matches = db.Column(Integer, nullable=False, default=0, server_default='0')
+    seat_2_wins = db.Column(Integer, nullable=False, default=0, server_default='0')
+    seat_3_matches = db.Column(Integer, nullable=False, default=0, server_default='0')
+    seat_3_wins = db.Column(Integer, nullable=False, default=0, server_default='0')
+    seat_4_matches = db.Column(Integer, nullable=False, default=0, server_default='0')
+    seat_4_wins = db.Column(Integer, nullable=False, default=0, server_default='0')
+
+    updated_at = db.Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # --- Relationships ---
+    deck = db.relationship("Deck", backref=db.backref("stats", uselist=False, passive_deletes=True))
+
+    # --- Instance Methods ---
+    @property
+    def win_rate(self):
+        return round((self.total_wins / self.total_matches) * 100, 2) if self.total_matches else 0
+
+    def seat_stats(self, seat):
+        """Returns (matches, wins) for a turn-order seat."""
+        return getattr(self, f"seat_{seat}_matches") or 0, getattr(self, f"seat_{seat}_wins") or 0
+
+    def __repr__(self):
+        return f"<DeckStats deck_id={self.deck_id} matches={self.total_matches} wins={self.total_wins} draws={self.total_draws}>"
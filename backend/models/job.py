@@ -0,0 +1,43 @@
+# backend/models/job.py
+
+from backend.database import db
+from sqlalchemy import DateTime, Integer, String, Text, JSON
+from sqlalchemy.sql import func
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+class Job(db.Model):
+    """
+    Durable record of a background side effect (e.g. a password reset email).
+    Rows are written before the work is handed to the in-process thread pool, so a
+    crashed worker or a failed attempt is retried from here until max_attempts.
+    See backend/jobs.py.
+    """
+    __tablename__ = "jobs"
+
+    # --- Columns ---
+    id = db.Column(Integer, primary_key=True, autoincrement=True)
+    kind = db.Column(String(50), nullable=False)
+    payload = db.Column(JSON, nullable=False, default=dict)
+    status = db.Column(String(20), nullable=False, default=JOB_PENDING, server_default=JOB_PENDING)
+    attempts = db.Column(Integer, nullable=False, default=0, server_default='0')
+    max_attempts = db.Column(Integer, nullable=False, default=5, server_default='5')
+    run_after = db.Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = db.Column(Text, nullable=True)
+
+    created_at = db.Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = db.Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # --- Constraints ---
+    __table_args__ = (
+        db.CheckConstraint(
+            f"status IN ('{JOB_PENDING}', '{JOB_RUNNING}', '{JOB_DONE}', '{JOB_FAILED}')", name='check_job_status'
+        ),
+        db.Index('ix_jobs_status_run_after', 'status', 'run_after'),
+    )
+
+    def __repr__(self):
+        return f"<Job id={self.id} kind='{self.kind}' status={self.status} attempts={self.attempts}/{self.max_attempts}>"
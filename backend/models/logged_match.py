@@ -1,7 +1,7 @@
 import enum
 from sqlalchemy import CheckConstraint, ForeignKey # Removed UniqueConstraint, Index unless needed elsewhere
 from sqlalchemy.orm import relationship
-from backend.database import db
+from backend.database import db, ACTIVE_ROWS_ONLY
 # Removed: from backend.models.commanders import Commander (no longer direct FKs here for opponents)
 # Import the new model
 from backend.models.opponent_commander_in_match import OpponentCommanderInMatch
@@ -23,7 +23,7 @@ class LoggedMatch(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     timestamp = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
     result = db.Column(db.Integer, nullable=False)
-    is_active = db.Column(db.Boolean, default=True, nullable=False, index=True)
+    is_active = db.Column(db.Boolean, default=True, nullable=False) # Indexed through the partial indexes below
     deleted_at = db.Column(db.DateTime(timezone=True), nullable=True)
 
     logger_user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
@@ -53,6 +53,16 @@ class LoggedMatch(db.Model):
         CheckConstraint('result IN (0, 1, 2)', name='check_logged_match_result'),
         CheckConstraint('player_position >= 1 AND player_position <= 4', name='check_player_position_commander'),
         CheckConstraint('player_mulligans IS NULL OR player_mulligans >= 0', name='check_player_mulligans_non_negative'),
+        # Keyset pagination of match history: WHERE user/is_active, ORDER BY timestamp DESC, id DESC
+        db.Index('ix_logged_matches_user_active_timestamp_id', 'logger_user_id', 'is_active', db.text('timestamp DESC'), db.text('id DESC')),
+        # Partial indexes over active matches, one per hot query shape:
+        # the performance summary's single scan (covering, so it never reads the table)
+        db.Index('ix_logged_matches_active_user_summary', 'logger_user_id', 'timestamp', 'deck_id', 'player_position', 'result',
+                 postgresql_include=['id'], **ACTIVE_ROWS_ONLY),
+        # deck details (mulligans, matchups), deck_stats rebuilds and match history filtered by deck
+        db.Index('ix_logged_matches_active_deck_user_mulligans', 'deck_id', 'logger_user_id', 'player_mulligans', 'result', **ACTIVE_ROWS_ONLY),
+        # a deck's recent matches
+        db.Index('ix_logged_matches_active_deck_timestamp_id', 'deck_id', db.text('timestamp DESC'), db.text('id DESC'), **ACTIVE_ROWS_ONLY),
     )
 
     def get_result_enum(self) -> LoggedMatchResult | None:
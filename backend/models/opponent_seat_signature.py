@@ -0,0 +1,39 @@
+# backend/models/opponent_seat_signature.py
+
+from backend.database import db
+from sqlalchemy import Integer, String, Text
+from sqlalchemy.orm import relationship
+
+class OpponentSeatSignature(db.Model):
+    """
+    Canonical command zone of one opponent seat in a logged match, written by log_match.
+    `signature` is the seat's commander names sorted and joined with ' / ';
+    `signature_hash` is a stable digest of it used for indexed grouping.
+    See backend/services/matches/opponent_signature_service.py.
+    """
+    __tablename__ = "opponent_seat_signatures"
+
+    # --- Columns ---
+    id = db.Column(Integer, primary_key=True, autoincrement=True)
+    logged_match_id = db.Column(Integer, db.ForeignKey('logged_matches.id', ondelete='CASCADE'), nullable=False, index=True)
+    # Denormalized from the match so metagame queries can start from the user's own rows
+    logger_user_id = db.Column(Integer, db.ForeignKey('users.id'), nullable=False)
+    seat_number = db.Column(Integer, nullable=False)
+    signature = db.Column(Text, nullable=False)
+    signature_hash = db.Column(String(16), nullable=False)
+
+    # --- Relationships ---
+    logged_match = relationship(
+        "LoggedMatch",
+        backref=db.backref("seat_signatures", cascade="all, delete-orphan", passive_deletes=True)
+    )
+
+    # --- Constraints ---
+    __table_args__ = (
+        db.UniqueConstraint('logged_match_id', 'seat_number', name='uq_opponent_seat_signature_match_seat'),
+        db.CheckConstraint('seat_number >= 1 AND seat_number <= 4', name='check_oss_seat_number'),
+        db.Index('ix_opponent_seat_signatures_user_hash', 'logger_user_id', 'signature_hash'),
+    )
+
+    def __repr__(self):
+        return f"<OpponentSeatSignature match_id={self.logged_match_id} seat={self.seat_number} '{self.signature}'>"
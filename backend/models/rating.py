@@ -0,0 +1,43 @@
+# backend/models/rating.py
+
+from backend.database import db
+from sqlalchemy import DateTime, Float, Integer, String, Text
+from sqlalchemy.sql import func
+
+class Rating(db.Model):
+    """
+    Elo-style strength estimate of one of a user's decks or of an opponent command
+    zone (by seat signature) faced in that user's pods, with a Glicko-style
+    deviation that shrinks as it is played. Exactly one of deck_id / signature_hash
+    is set. Updated on every logged match and replayable from history; see
+    backend/services/matches/rating_service.py.
+    """
+    __tablename__ = "ratings"
+
+    # --- Columns ---
+    id = db.Column(Integer, primary_key=True, autoincrement=True)
+    user_id = db.Column(Integer, db.ForeignKey('users.id'), nullable=False)
+    deck_id = db.Column(Integer, db.ForeignKey('decks.id', ondelete='CASCADE'), nullable=True)
+    signature_hash = db.Column(String(16), nullable=True)
+    signature = db.Column(Text, nullable=True)
+
+    rating = db.Column(Float, nullable=False)
+    deviation = db.Column(Float, nullable=False)
+    games = db.Column(Integer, nullable=False, default=0, server_default='0')
+
+    updated_at = db.Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # --- Constraints ---
+    __table_args__ = (
+        db.CheckConstraint('(deck_id IS NULL) <> (signature_hash IS NULL)', name='check_rating_single_subject'),
+        db.UniqueConstraint('user_id', 'deck_id', name='uq_ratings_user_deck'),
+        db.UniqueConstraint('user_id', 'signature_hash', name='uq_ratings_user_signature'),
+    )
+
+    @property
+    def is_deck(self):
+        return self.deck_id is not None
+
+    def __repr__(self):
+        subject = f"deck_id={self.deck_id}" if self.is_deck else f"'{self.signature}'"
+        return f"<Rating user_id={self.user_id} {subject} rating={self.rating:.1f} deviation={self.deviation:.1f}>"
@@ -57,8 +57,8 @@ class Tag(db.Model):
     # --- Table Arguments ---
     __table_args__ = (
         UniqueConstraint('user_id', 'name', name='uq_user_tag_name'),
-        # Optional: Index for querying active tags for a user
-        # Index('ix_tags_user_id_is_active', 'user_id', 'is_active'),
+        # Active tags for a user (tag lists, tag resolution in log_match)
+        Index('ix_tags_user_id_is_active', 'user_id', 'is_active'),
     )
 
     # --- Instance Methods ---
@@ -0,0 +1,231 @@
+# backend/password_hasher.py
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import multiprocessing
+import os
+import threading
+import time
+
+import bcrypt
+from flask import request, has_request_context
+
+logger = logging.getLogger(__name__)
+hash_logger = logging.getLogger("backend.hash")
+
+DEFAULT_ROUNDS = 12
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 8
+DEFAULT_QUEUE_TIMEOUT_SECONDS = 5
+STATS_WINDOW = 1024 # Latest samples per operation kept for percentiles
+BCRYPT_PREFIX = b"2b"
+EXECUTOR_INLINE = "inline"
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+
+REQUEST_STATS_KEY = "backend.hash_stats"
+OP_HASH = "hash"
+OP_VERIFY = "verify"
+
+
+class HashingBusyError(Exception):
+    """Every hashing slot stayed taken for the queue timeout (reported to the client as a 503)."""
+
+
+class HashRequestStats:
+    """bcrypt operations and cumulative time (seconds) for one request."""
+    __slots__ = ("count", "duration", "wait")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.wait = 0.0
+
+
+def request_hash_stats():
+    """HashRequestStats for the current request (None outside a request)."""
+    if not has_request_context():
+        return None
+    return request.environ.setdefault(REQUEST_STATS_KEY, HashRequestStats())
+
+
+def rounds_of(password_hash):
+    """Cost factor of a '$2b$12$...' hash (None if it is not a bcrypt hash)."""
+    try:
+        return int(password_hash.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def _encode(value):
+    return value.encode("utf-8") if isinstance(value, str) else value
+
+
+class PasswordHasher:
+    """
+    bcrypt for the auth routes. Hashes run in a bounded pool of `workers` threads
+    (bcrypt releases the GIL, so a thread is enough to keep hashing off the
+    interpreter), which caps how many cores a burst of logins can take from the
+    web workers. The calling request thread still waits for its hash; under the
+    gthread worker the other request threads keep serving meanwhile. A process
+    pool (AUTH_HASH_EXECUTOR=process) only adds IPC and spawn cost. At most
+    workers + max pending hashes are in flight per process; a request that
+    cannot get a slot within the queue timeout gets HashingBusyError instead of
+    queueing forever. Hashes are
+    compatible with Flask-Bcrypt, and the cost factor comes from
+    BCRYPT_LOG_ROUNDS. Per-request time is added to Server-Timing, and rolling
+    per-operation latencies are kept for stats().
+    """
+
+    def __init__(self):
+        self.rounds = DEFAULT_ROUNDS
+        self.mode = EXECUTOR_THREAD
+        self.workers = DEFAULT_WORKERS
+        self.max_pending = DEFAULT_MAX_PENDING
+        self.queue_timeout = DEFAULT_QUEUE_TIMEOUT_SECONDS
+        self._executor = None
+        self._pid = None
+        self._slots = None
+        self._lock = threading.Lock()
+        self._samples = {OP_HASH: deque(maxlen=STATS_WINDOW), OP_VERIFY: deque(maxlen=STATS_WINDOW)}
+        self._totals = {OP_HASH: 0, OP_VERIFY: 0}
+
+    def init_app(self, app):
+        self.rounds = app.config.get("BCRYPT_LOG_ROUNDS", DEFAULT_ROUNDS)
+        self.mode = app.config.get("AUTH_HASH_EXECUTOR", EXECUTOR_THREAD)
+        self.workers = app.config.get("AUTH_HASH_WORKERS", DEFAULT_WORKERS)
+        self.max_pending = app.config.get("AUTH_HASH_MAX_PENDING", DEFAULT_MAX_PENDING)
+        self.queue_timeout = app.config.get("AUTH_HASH_QUEUE_TIMEOUT", DEFAULT_QUEUE_TIMEOUT_SECONDS)
+        self.shutdown()
+        app.extensions["password_hasher"] = self
+
+        @app.after_request
+        def add_hash_timing(response):
+            stats = request.environ.get(REQUEST_STATS_KEY)
+            if stats is None:
+                return response
+            duration_ms, wait_ms = stats.duration * 1000, stats.wait * 1000
+            response.headers.add("Server-Timing", f'hash;dur={duration_ms:.1f};desc="{stats.count} bcrypt"')
+            hash_logger.info(
+                f"hash_stats endpoint={request.endpoint} ops={stats.count} hash_ms={duration_ms:.1f} "
+                f"wait_ms={wait_ms:.1f} rounds={self.rounds}",
+                extra={"hash_ops": stats.count, "hash_ms": round(duration_ms, 1), "hash_wait_ms": round(wait_ms, 1)}
+            )
+            return response
+
+    # --- Pool ---
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # New process (first use or a forked worker): never reuse the parent's pool
+                self._pid = os.getpid()
+                self._slots = threading.BoundedSemaphore(self.workers + self.max_pending)
+                if self.mode == EXECUTOR_PROCESS:
+                    # spawn: the children only import bcrypt, not the app
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                elif self.mode == EXECUTOR_THREAD:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+                else:
+                    self._executor = None
+            return self._executor, self._slots
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor, self._pid = self._executor, None, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _run(self, op, func, *args):
+        executor, slots = self._ensure_started()
+        started = time.perf_counter()
+        if not slots.acquire(timeout=self.queue_timeout):
+            logger.warning(f"All {self.workers + self.max_pending} password hashing slots busy; rejecting {op}.")
+            raise HashingBusyError("Password hashing is busy, please retry.")
+        acquired = time.perf_counter()
+        try:
+            result = func(*args) if executor is None else executor.submit(func, *args).result()
+        finally:
+            slots.release()
+        self._record(op, acquired - started, time.perf_counter() - started)
+        return result
+
+    # --- Metrics ---
+
+    def _record(self, op, wait, duration):
+        with self._lock:
+            self._samples[op].append(duration)
+            self._totals[op] += 1
+        stats = request_hash_stats()
+        if stats is not None:
+            stats.count += 1
+            stats.duration += duration
+            stats.wait += wait
+
+    def stats(self):
+        """Per-operation count and latency (ms) over the latest STATS_WINDOW samples of this process."""
+        with self._lock:
+            snapshot = {op: sorted(samples) for op, samples in self._samples.items()}
+            totals = dict(self._totals)
+        report = {}
+        for op, samples in snapshot.items():
+            if not samples:
+                report[op] = {"count": totals[op]}
+                continue
+            report[op] = {
+                "count": totals[op],
+                "mean_ms": round(sum(samples) / len(samples) * 1000, 1),
+                "p50_ms": round(samples[len(samples) // 2] * 1000, 1),
+                "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1),
+                "max_ms": round(samples[-1] * 1000, 1),
+            }
+        return report
+
+    # --- Hashing ---
+
+    def hash(self, password, rounds=None):
+        """bcrypt hash of `password` at `rounds` (default BCRYPT_LOG_ROUNDS), as text."""
+        salt = bcrypt.gensalt(rounds or self.rounds, BCRYPT_PREFIX)
+        return self._run(OP_HASH, bcrypt.hashpw, _encode(password), salt).decode("utf-8")
+
+    def verify(self, password_hash, password):
+        if not password_hash or not password:
+            return False
+        try:
+            return self._run(OP_VERIFY, bcrypt.checkpw, _encode(password), _encode(password_hash))
+        except ValueError: # Malformed stored hash
+            logger.warning("Stored password hash is not a valid bcrypt hash.")
+            return False
+
+    def needs_rehash(self, password_hash):
+        return rounds_of(password_hash) != self.rounds
+
+    def verify_and_update(self, user, password):
+        """
+        Checks `password` against the user's hash and, when the cost factor has
+        changed since it was stored, replaces the hash (the caller commits).
+        Returns (verified, rehashed).
+        """
+        if not self.verify(user.password_hash, password):
+            return False, False
+        if not self.needs_rehash(user.password_hash):
+            return True, False
+        old_rounds = rounds_of(user.password_hash)
+        user.password_hash = self.hash(password)
+        logger.info(f"Rehashed password for user {user.id} from cost {old_rounds} to {self.rounds}.")
+        return True, True
+
+
+def time_rounds(rounds, samples=3, password="benchmark-password"):
+    """Median seconds one bcrypt hash takes at `rounds` on this machine (for tune-bcrypt)."""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds, BCRYPT_PREFIX))
+        timings.append(time.perf_counter() - started)
+    return sorted(timings)[len(timings) // 2]
+
+
+password_hasher = PasswordHasher()
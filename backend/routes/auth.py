@@ -1,77 +1,50 @@
 # backend/routes/auth.py
 
 # --- Imports ---
-from flask import Blueprint, request, jsonify, current_app, session, url_for, render_template
-from flask_bcrypt import Bcrypt
+from flask import Blueprint, request, jsonify, current_app, session, url_for
 from sqlalchemy.exc import IntegrityError
 from backend import db, limiter, csrf
+from backend.password_hasher import password_hasher, HashingBusyError
 from backend.models.user import User # User model now has first_name, last_name, etc.
 from backend.utils.decorators import login_required
 from backend.utils.validation import validate_password_strength_backend
 from email_validator import validate_email, EmailNotValidError
 from itsdangerous import URLSafeTimedSerializer, SignatureExpired, BadTimeSignature
 from flask_wtf.csrf import generate_csrf
-import smtplib
-from email.message import EmailMessage
-from email import policy
+from backend.services.email_service import queue_password_reset_email
 
-# --- Blueprint and Bcrypt Setup ---
+# --- Blueprint Setup ---
 auth_bp = Blueprint("auth", __name__, url_prefix="/api/auth")
-bcrypt = Bcrypt()
 csrf.exempt(auth_bp)
 
+@auth_bp.errorhandler(HashingBusyError)
+def hashing_busy_handler(e):
+    """Every bcrypt slot is taken (e.g. a burst of logins): ask the client to retry shortly."""
+    response = jsonify({"error": "The server is busy, please try again in a moment.", "type": "HASHING_BUSY"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
 # --- Helper Functions ---
 def send_password_reset_email_manual(user):
+    """
+    Queues the password reset email; SMTP delivery happens on the background job
+    runner (see backend/services/email_service.py), so the request never waits on
+    the mail server. Returns False only if the job could not be recorded.
+    """
     try:
-        s = current_app.password_reset_serializer
-        if not s:
-             current_app.logger.error("Password reset serializer not found on app instance.")
-             return False
-
-        token = s.dumps(user.email, salt='password-reset-salt')
-        frontend_base_url = current_app.config.get('FRONTEND_BASE_URL', 'http://localhost:8080')
-        reset_url = f"{frontend_base_url}/reset-password/{token}"
-
-        subject = "Reset Your Password"
-        sender_email = current_app.config.get('MAIL_USERNAME')
-        sender_password = current_app.config.get('MAIL_PASSWORD')
-        recipient_email = user.email
-        smtp_server = current_app.config.get('MAIL_SERVER')
-        smtp_port = current_app.config.get('MAIL_PORT')
-
-        if not all([sender_email, sender_password, smtp_server, smtp_port]):
-            current_app.logger.error("Manual email sending failed: Missing mail configuration.")
-            return False
-
-        # Use user.first_name for personalization if available
-        text_body = render_template('email/reset_password.txt', user=user, reset_url=reset_url)
-        html_body = render_template('email/reset_password.html', user=user, reset_url=reset_url)
-
-        msg = EmailMessage(policy=policy.SMTPUTF8)
-        msg['Subject'] = subject
-        msg['From'] = sender_email
-        msg['To'] = recipient_email
-        msg.set_content(text_body, subtype='plain')
-        msg.add_alternative(html_body, subtype='html')
-
-        current_app.logger.debug(f"Attempting manual SMTP connection to {smtp_server}:{smtp_port}")
-        with smtplib.SMTP(smtp_server, smtp_port) as connection:
-            connection.starttls()
-            connection.login(sender_email, sender_password)
-            connection.send_message(msg)
-            current_app.logger.info(f"Manual password reset email successfully sent via smtplib to {recipient_email}")
+        job_id = queue_password_reset_email(user)
+        current_app.logger.info(f"Password reset email queued for {user.email} (job {job_id})")
         return True
-
-    except smtplib.SMTPAuthenticationError as e:
-        current_app.logger.error(f"SMTP Authentication Error during manual send to {user.email}: {e}", exc_info=False)
-        return False
     except Exception as e:
-        current_app.logger.error(f"Failed to send MANUAL password reset email to {user.email}: {e}", exc_info=True)
+        db.session.rollback()
+        current_app.logger.error(f"Failed to queue password reset email for {user.email}: {e}", exc_info=True)
         return False
 
 # --- UPDATED create_user Helper ---
 def create_user(first_name, last_name, email, password, username=None): # Added first/last name, username optional
     """Creates and saves a new user."""
+    # Hashed outside the try so HashingBusyError reaches the blueprint's 503 handler
+    hashed_password = password_hasher.hash(password)
     try:
         # Ensure email is lowercase
         email = email.lower()
@@ -81,8 +54,6 @@ def create_user(first_name, last_name, email, password, username=None): # Added
         # Handle optional username (ensure uniqueness if provided later)
         username = username.strip() if username else None
 
-        hashed_password = bcrypt.generate_password_hash(password).decode("utf-8")
-
         new_user = User(
             first_name=first_name,
             last_name=last_name,
@@ -230,8 +201,11 @@ def login():
     user = User.find_by_email(email)
 
     # --- Check Password ---
-    if user and bcrypt.check_password_hash(user.password_hash, password):
+    verified, rehashed = password_hasher.verify_and_update(user, password) if user else (False, False)
+    if verified:
         # --- Login Success ---
+        if rehashed:
+            db.session.commit() # Stored hash upgraded to the current cost factor
         session.clear()
         session['user_id'] = user.id
         session.permanent = True
@@ -326,8 +300,8 @@ def reset_password_with_token(token):
         # Avoid confirming user existence based on token validity
         return jsonify({"error": "Password reset link is invalid or user not found.", "type": "TOKEN_USER_MISMATCH"}), 400 # Changed from 404
 
+    new_hashed_password = password_hasher.hash(new_password)
     try:
-        new_hashed_password = bcrypt.generate_password_hash(new_password).decode("utf-8")
         user.password_hash = new_hashed_password
         db.session.commit()
         current_app.logger.info(f"Password successfully reset for user: {user.full_name} ({user.email})") # Use full_name
@@ -493,7 +467,7 @@ def change_password():
         return jsonify({"error": "Current password, new password, and confirmation are required."}), 400
 
     # 1. Verify Current Password
-    if not bcrypt.check_password_hash(user.password_hash, current_password):
+    if not password_hasher.verify(user.password_hash, current_password):
         current_app.logger.warning(f"Incorrect current password attempt for user ID: {user_id}")
         # Return 400 or 401 - 400 is common for validation-like failures within an authenticated context
         return jsonify({"error": "Incorrect current password.", "type": "INVALID_CURRENT_PASSWORD"}), 400
@@ -512,12 +486,12 @@ def change_password():
         }), 400
 
     # 4. (Optional but recommended) Check if new password is same as old
-    if bcrypt.check_password_hash(user.password_hash, new_password):
+    if password_hasher.verify(user.password_hash, new_password):
          return jsonify({"error": "New password cannot be the same as the current password.", "type": "PASSWORD_SAME_AS_OLD"}), 400
 
     # --- Update Password ---
+    new_hashed_password = password_hasher.hash(new_password)
     try:
-        new_hashed_password = bcrypt.generate_password_hash(new_password).decode("utf-8")
         user.password_hash = new_hashed_password
         db.session.commit()
         current_app.logger.info(f"Password changed successfully for user ID: {user_id}")
@@ -554,7 +528,7 @@ def delete_account():
         return jsonify({"error": "Password confirmation is required."}), 400
 
     # --- Verify Current Password ---
-    if not bcrypt.check_password_hash(user.password_hash, password):
+    if not password_hasher.verify(user.password_hash, password):
         current_app.logger.warning(f"Incorrect password during account deletion attempt for user ID: {user_id}")
         # Use 403 Forbidden or 400 Bad Request for incorrect password during delete confirmation
         return jsonify({"error": "Incorrect password provided.", "type": "INVALID_PASSWORD"}), 403
@@ -1,5 +1,5 @@
 from flask import Blueprint, jsonify
-from backend.utils.decorators import login_required
+from backend.utils.decorators import login_required, conditional_get
 from backend import db, limiter
 from backend.models.deck_type import DeckType
 
@@ -9,6 +9,7 @@ deck_types_bp = Blueprint('deck_types', __name__)
 @deck_types_bp.route('/deck_types', methods=['GET'])
 @limiter.limit("60 per minute")
 @login_required
+@conditional_get(per_user=False)
 def get_deck_types():
     deck_types = DeckType.query.all()
     return jsonify([{'id': dt.id, 'deck_type': dt.name} for dt in deck_types])
@@ -1,16 +1,19 @@
 # backend/routes/decks.py
 
 from flask import Blueprint, jsonify, request, session, current_app
-from sqlalchemy import select, true, func, case, or_
+from sqlalchemy import select, true
 from sqlalchemy.orm import selectinload
 import logging
 from datetime import timezone, datetime
 
 from backend import db, limiter
-from backend.models import LoggedMatch, OpponentCommanderInMatch, CommanderDeck, Commander, UserDeck, Deck, Tag, DeckType
+from backend.models import CommanderDeck, Commander, Deck, Tag, DeckStats
 from backend.services.matches.match_service import get_all_decks_stats
-from backend.utils.decorators import login_required
-from backend.services.decks.deck_service import get_mulligan_stats_for_deck, get_deck_matchup_stats
+from backend.utils.decorators import login_required, query_budget, cached_response, conditional_get
+from backend.cache import bump_user_data_version
+from backend.services.decks.deck_analytics_service import get_deck_details
+from backend.services.decks.deck_stats_service import delete_deck_stats
+from backend.services.matches.match_timeseries_service import get_deck_timeseries, parse_window, TimeSeriesError
 
 decks_bp = Blueprint("decks_api", __name__, url_prefix="/api")
 logger = logging.getLogger(__name__)
@@ -24,6 +27,7 @@ COMMANDER_DECK_TYPE_NAME = "Commander"
 @decks_bp.route("/decks", methods=["GET"])
 @limiter.limit("60 per minute")
 @login_required
+@query_budget(1)
 def get_all_decks_simple(): # Renamed to avoid confusion with user_decks
     user_id = session.get('user_id')
     # This endpoint is for populating simple dropdowns, e.g., in Log Match Modal
@@ -35,13 +39,14 @@ def get_all_decks_simple(): # Renamed to avoid confusion with user_decks
 @decks_bp.route("/decks/<int:deck_id>", methods=["GET"])
 @limiter.limit("60 per minute")
 @login_required
+@cached_response()
+@query_budget(2)
 def deck_details(deck_id):
     user_id = session.get('user_id')
     
     include_turn_stats_param = request.args.get('include_turn_stats', 'false').lower() == 'true'
     include_matchup_stats_param = request.args.get('include_matchup_stats', 'false').lower() == 'true'
     recent_matches_limit_str = request.args.get('include_recent_matches', None)
-    mulligan_stats = get_mulligan_stats_for_deck(deck_id, user_id)
     
     recent_matches_limit = None
     if recent_matches_limit_str:
@@ -52,92 +57,44 @@ def deck_details(deck_id):
         except ValueError:
             recent_matches_limit = None
 
-    deck = Deck.query.options(
-        selectinload(Deck.tags),
-        selectinload(Deck.deck_type), # Still load to get the name, though it's always Commander
-        selectinload(Deck.commander_decks).selectinload(CommanderDeck.commander)
-    ).filter_by(
-        id=deck_id, user_id=user_id, is_active=True
-    ).first()
-
-    if not deck:
+    # Constant query count regardless of which include_* flags are set
+    deck_data = get_deck_details(
+        deck_id, user_id,
+        include_turn_stats=include_turn_stats_param,
+        include_matchup_stats=include_matchup_stats_param,
+        recent_matches_limit=recent_matches_limit
+    )
+    if deck_data is None:
         return jsonify({"error": f"Active deck with id {deck_id} not found for this user."}), 404
 
-    deck_data = {
-        "id": deck.id,
-        "name": deck.name,
-        "deck_url": deck.deck_url,
-        "format_name": COMMANDER_DECK_TYPE_NAME,
-        "tags": [{"id": tag.id, "name": tag.name} for tag in deck.tags],
-        "commander_id": None, "commander_name": None,
-        "associated_commander_id": None, "associated_commander_name": None,
-        "partner_name": None, "friends_forever_name": None, "background_name": None,
-        "doctor_companion_name": None, "time_lord_doctor_name": None,
-        "mulligan_stats": mulligan_stats 
-    }
-
-    if deck.commander_decks and deck.commander_decks.commander:
-        main_commander_obj = deck.commander_decks.commander
-        deck_data["commander_id"] = main_commander_obj.id
-        deck_data["commander_name"] = main_commander_obj.name
-        if deck.commander_decks.associated_commander_id:
-            assoc_commander_obj = db.session.get(Commander, deck.commander_decks.associated_commander_id)
-            if assoc_commander_obj:
-                deck_data["associated_commander_id"] = assoc_commander_obj.id
-                deck_data["associated_commander_name"] = assoc_commander_obj.name
-                if main_commander_obj.partner and assoc_commander_obj.partner: deck_data["partner_name"] = assoc_commander_obj.name
-                elif main_commander_obj.friends_forever and assoc_commander_obj.friends_forever: deck_data["friends_forever_name"] = assoc_commander_obj.name
-                elif main_commander_obj.time_lord_doctor and assoc_commander_obj.doctor_companion: deck_data["doctor_companion_name"] = assoc_commander_obj.name
-                elif main_commander_obj.doctor_companion and assoc_commander_obj.time_lord_doctor: deck_data["time_lord_doctor_name"] = assoc_commander_obj.name
-                elif main_commander_obj.choose_a_background and assoc_commander_obj.background: deck_data["background_name"] = assoc_commander_obj.name
-    
-    overall_stats_q = db.session.query(
-        func.count(LoggedMatch.id).label("total_matches"),
-        func.sum(case((LoggedMatch.result == 0, 1), else_=0)).label("total_wins") 
-    ).filter(LoggedMatch.deck_id == deck_id, LoggedMatch.logger_user_id == user_id, LoggedMatch.is_active == true()).first()
-
-    deck_data["total_matches"] = overall_stats_q.total_matches if overall_stats_q and overall_stats_q.total_matches is not None else 0
-    deck_data["total_wins"] = overall_stats_q.total_wins if overall_stats_q and overall_stats_q.total_wins is not None else 0
-    deck_data["win_rate"] = (deck_data["total_wins"] / deck_data["total_matches"] * 100) if deck_data["total_matches"] > 0 else 0.0
-
-    if include_matchup_stats_param:
-        deck_average_wr = deck_data["win_rate"]
-        deck_data["matchup_stats"] = get_deck_matchup_stats(deck_id, deck_average_wr)
-
-    if include_turn_stats_param:
-        deck_data["turn_order_stats"] = {}
-        for i in range(1, 5):
-            stats = db.session.query(
-                func.count(LoggedMatch.id).label("matches"),
-                func.sum(case((LoggedMatch.result == 0, 1), else_=0)).label("wins")
-            ).filter(
-                LoggedMatch.deck_id == deck_id, LoggedMatch.logger_user_id == user_id,
-                LoggedMatch.player_position == i, LoggedMatch.is_active == true()
-            ).first()
-            matches_count = stats.matches if stats and stats.matches is not None else 0
-            wins_count = stats.wins if stats and stats.wins is not None else 0
-            deck_data["turn_order_stats"][str(i)] = {
-                "matches": matches_count,
-                "wins": wins_count,
-                "win_rate": (wins_count / matches_count * 100) if matches_count > 0 else 0.0
-            }
-
-    if recent_matches_limit and recent_matches_limit > 0:
-        recent_matches_query = select(LoggedMatch.id, LoggedMatch.result, LoggedMatch.timestamp, LoggedMatch.player_position).where(
-            LoggedMatch.deck_id == deck_id, LoggedMatch.logger_user_id == user_id,
-            LoggedMatch.is_active == true()
-        ).order_by(LoggedMatch.timestamp.desc()).limit(recent_matches_limit)
-        matches_results = db.session.execute(recent_matches_query).mappings().all()
-        deck_data["recent_matches"] = [dict(m) for m in matches_results]
-    else:
-        deck_data["recent_matches"] = []
-
     return jsonify(deck_data), 200
 
 
+@decks_bp.route("/decks/<int:deck_id>/timeseries", methods=["GET"])
+@limiter.limit("60 per minute")
+@login_required
+@cached_response()
+@query_budget(2)
+def deck_timeseries(deck_id):
+    """Rolling/cumulative win rate, streaks and weekly buckets for one deck (?window=N games)."""
+    user_id = session.get('user_id')
+    try:
+        window = parse_window(request.args.get('window'))
+    except TimeSeriesError as e:
+        return jsonify({"error": str(e)}), 400
+
+    series = get_deck_timeseries(deck_id, user_id, window=window)
+    if series is None:
+        return jsonify({"error": f"Active deck with id {deck_id} not found for this user."}), 404
+    return jsonify(series), 200
+
+
 @decks_bp.route("/user_decks", methods=["GET"])
 @limiter.limit("60 per minute")
 @login_required
+@conditional_get()
+@cached_response()
+@query_budget(3)
 def user_decks():
     user_id = session.get('user_id')
     tags_param = request.args.get('tags', default=None)
@@ -191,6 +148,8 @@ def user_decks():
                 "deck_type_id": deck.deck_type_id, # Should always be COMMANDER_DECK_TYPE_ID
                 "format_name": COMMANDER_DECK_TYPE_NAME, # Always Commander
                 "win_rate": deck_stats.get("win_rate", 0.0),
+                "win_rate_lower": deck_stats.get("win_rate_lower", 0.0),
+                "smoothed_win_rate": deck_stats.get("smoothed_win_rate"),
                 "total_matches": deck_stats.get("total_matches", 0),
                 "total_wins": deck_stats.get("total_wins", 0),
                 "last_match": last_match_iso,
@@ -296,6 +255,7 @@ def register_deck():
             associated_commander_id=associated_commander_id
         )
         db.session.add(commander_deck_entry)
+        db.session.add(DeckStats(deck_id=new_deck.id, user_id=user_id)) # Empty rollup row, updated by log_match
         
         tag_ids = data.get("tags", [])
         if isinstance(tag_ids, list):
@@ -306,6 +266,7 @@ def register_deck():
                         new_deck.tags.append(tag)
         
         db.session.commit()
+        bump_user_data_version(user_id)
 
         response_deck_data = {
             "id": new_deck.id,
@@ -355,11 +316,10 @@ def update_deck(deck_id):
 
     try:
         db.session.commit()
-        # Re-fetch details using the updated deck_details function to ensure consistency
-        # This will return a tuple: (jsonify_object, status_code)
-        response_tuple = deck_details(deck_id) 
-        if response_tuple[1] == 200:
-            updated_deck_data = response_tuple[0].get_json() # Extract JSON from jsonify object
+        bump_user_data_version(user_id)
+        # Re-fetch details through the service (the deck_details view is response-cached)
+        updated_deck_data = get_deck_details(deck_id, user_id)
+        if updated_deck_data is not None:
             return jsonify({"message": "Deck updated successfully", "deck": updated_deck_data}), 200
         else: # Fallback if re-fetching details fails for some reason
             logger.error(f"Failed to re-fetch full deck details after update for deck {deck_id}")
@@ -390,7 +350,9 @@ def delete_deck(deck_id):
         # deck.deleted_at = datetime.now(timezone.utc)
         # db.session.add(deck)
         deck.soft_delete() # Use the model's method
+        delete_deck_stats(deck.id)
         db.session.commit()
+        bump_user_data_version(user_id)
         logger.info(f"Deck {deck_id} soft deleted successfully by user {user_id}")
         return jsonify({"message": f"Deck {deck_id} deleted successfully"}), 200
     except Exception as e:
@@ -422,6 +384,7 @@ def add_tag_to_deck(deck_id):
     try:
         deck.tags.append(tag_to_add)
         db.session.commit()
+        bump_user_data_version(current_user_id)
         return jsonify({"message": "Tag associated successfully"}), 201
     except Exception as e:
         db.session.rollback()
@@ -1,31 +1,59 @@
 # backend/routes/match_history.py
 
 from flask import jsonify, Blueprint, request, session
-from backend.utils.decorators import login_required
+from backend.utils.decorators import login_required, query_budget, conditional_get
 from backend import limiter
 import logging
-from backend.services.matches.match_history_service import get_matches_by_user
+from backend.services.matches.match_history_service import get_matches_by_user, get_matches_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 matches_history_bp = Blueprint("matches_history", __name__, url_prefix="/api")
 logger = logging.getLogger(__name__)
 
+def _match_to_dict(user_match, deck, user_deck_command_zone, opponent_command_zones):
+    return {
+        "id": user_match.id,
+        "result": user_match.result,
+        "date": user_match.timestamp.isoformat() if user_match.timestamp else None,
+        "deck": {
+            "id": deck.id if deck else None,
+            "name": deck.name if deck else "Unknown Deck",
+            "command_zone": user_deck_command_zone or []
+        },
+        "opponent_command_zones": opponent_command_zones or [],
+        "tags": [{"id": tag.id, "name": tag.name} for tag in user_match.tags],
+        "player_position": user_match.player_position,
+        "player_mulligans": user_match.player_mulligans,
+        "pod_notes": user_match.pod_notes
+    }
+
 @matches_history_bp.route("/matches_history", methods=["GET"])
 @limiter.limit("60 per minute")
 @login_required
+@conditional_get()
+@query_budget(8)
 def matches_history():
+    """
+    Match history for the logged-in user.
+    Cursor mode (any `cursor` or `page_size` param; pass an empty cursor for the first page)
+    returns {"matches": [...], "next_cursor": ...}. Without them the legacy
+    limit/offset mode returns a plain list of at most `limit` matches
+    (DEFAULT_PAGE_SIZE when omitted, capped at MAX_PAGE_SIZE).
+    """
     user_id = session.get('user_id')
     deck_id = request.args.get('deck_id', type=int, default=None)
     tags_param = request.args.get('tags', default=None)
     limit = request.args.get('limit', type=int, default=None)
     offset = request.args.get('offset', type=int, default=None)
+    cursor = request.args.get('cursor', default=None)
+    page_size = request.args.get('page_size', type=int, default=None)
+    use_cursor = cursor is not None or page_size is not None
 
-    if limit is not None and limit <= 0:
-         limit = None
-    if offset is not None and offset < 0:
-         offset = 0
-
-    if limit is None:
-        offset = None
+    # Never load a whole history in one response; without a limit this is the newest page
+    if limit is None or limit <= 0:
+        limit = DEFAULT_PAGE_SIZE
+    limit = min(limit, MAX_PAGE_SIZE)
+    if offset is None or offset < 0:
+        offset = 0
 
     tag_ids = None
     if tags_param:
@@ -38,6 +66,29 @@ def matches_history():
         except Exception:
              tag_ids = None
 
+    if use_cursor:
+        try:
+            user_matches, next_cursor = get_matches_page(
+                user_id,
+                deck_id,
+                tag_ids=tag_ids,
+                cursor=cursor,
+                page_size=page_size
+            )
+        except ValueError:
+            return jsonify({"error": "Invalid 'cursor' parameter."}), 400
+        except Exception as e:
+            logger.error(f"Error fetching match history page for user {user_id}: {e}", exc_info=True)
+            return jsonify({"error": "Failed to fetch match history"}), 500
+
+        return jsonify({
+            "matches": [
+                _match_to_dict(user_match, deck, user_deck_command_zone, opponent_command_zones)
+                for user_match, deck, deck_type, user_deck_command_zone, opponent_command_zones in user_matches
+            ],
+            "next_cursor": next_cursor
+        }), 200
+
     try:
         # The service now returns opponent_command_zones with the new structure
         user_matches = get_matches_by_user(
@@ -53,21 +104,7 @@ def matches_history():
 
         matches_list = []
         for user_match, deck, deck_type, user_deck_command_zone, opponent_command_zones in user_matches:
-             matches_list.append({
-                 "id": user_match.id,
-                 "result": user_match.result,
-                 "date": user_match.timestamp.isoformat() if user_match.timestamp else None,
-                 "deck": {
-                     "id": deck.id if deck else None,
-                     "name": deck.name if deck else "Unknown Deck",
-                     "command_zone": user_deck_command_zone or []
-                 },
-                 "opponent_command_zones": opponent_command_zones or [],
-                 "tags": [{"id": tag.id, "name": tag.name} for tag in user_match.tags],
-                 "player_position": user_match.player_position,
-                 "player_mulligans": user_match.player_mulligans,
-                 "pod_notes": user_match.pod_notes
-             })
+             matches_list.append(_match_to_dict(user_match, deck, user_deck_command_zone, opponent_command_zones))
 
         return jsonify(matches_list), 200
 
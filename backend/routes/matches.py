@@ -1,14 +1,21 @@
 # backend/routes/matches.py
 
-from flask import jsonify, Blueprint, request, session, current_app
-from backend.utils.decorators import login_required
+from flask import jsonify, Blueprint, request, session, current_app, Response, stream_with_context
+from backend.utils.decorators import login_required, query_budget
+from backend.cache import bump_user_data_version
 from backend import db, limiter
-from backend.models import LoggedMatch, Tag, Deck, Commander
+from backend.models import LoggedMatch, Tag, Commander
 from backend.models.opponent_commander_in_match import OpponentCommanderInMatch 
 from backend.models.logged_match import match_tags
-from sqlalchemy.orm import selectinload, joinedload
-from sqlalchemy import select, delete
+from backend.services.decks.deck_stats_service import record_match, remove_match
+from backend.services.matches.match_export_service import stream_match_export, EXPORT_FORMATS
+from backend.services.matches.opponent_signature_service import record_opponent_signatures, signature_rows
+from backend.services.matches.rating_service import load_deck_with_ratings, record_match_rating, queue_rating_replay
+from backend.services.matches.match_import_service import parse_import_payload, import_matches, MatchImportError
+from sqlalchemy.orm import selectinload
+from sqlalchemy import select, delete, insert, or_
 import logging
+from collections import defaultdict
 from datetime import timezone, datetime
 
 matches_bp = Blueprint("matches", __name__, url_prefix="/api")
@@ -33,11 +40,54 @@ def format_timestamp(dt):
     aware_dt = dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
     return aware_dt.isoformat()
 
+def load_commanders_by_id(commander_ids):
+    """Loads all requested commanders with one IN query. Returns {id: Commander}."""
+    if not commander_ids:
+        return {}
+    commanders = db.session.scalars(select(Commander).where(Commander.id.in_(set(commander_ids)))).all()
+    return {commander.id: commander for commander in commanders}
+
+def resolve_match_tags(user_id, tag_names_or_ids):
+    """
+    Resolves a list of tag ids and/or names to the user's Tag objects with one query,
+    creating missing named tags (inserted in bulk on the next flush).
+    Unknown ids are ignored. Keeps the payload order without duplicates.
+    """
+    if not tag_names_or_ids or not isinstance(tag_names_or_ids, list):
+        return []
+    tag_ids = [value for value in tag_names_or_ids if isinstance(value, int) and not isinstance(value, bool)]
+    tag_names = [value.strip() for value in tag_names_or_ids if isinstance(value, str) and value.strip()]
+    if not tag_ids and not tag_names:
+        return []
+
+    existing = db.session.scalars(
+        select(Tag).where(Tag.user_id == user_id, or_(Tag.id.in_(tag_ids), Tag.name.in_(tag_names)))
+    ).all()
+    tags_by_id = {tag.id: tag for tag in existing}
+    tags_by_name = {tag.name: tag for tag in existing}
+
+    resolved = []
+    for value in tag_names_or_ids:
+        tag = None
+        if isinstance(value, int) and not isinstance(value, bool):
+            tag = tags_by_id.get(value)
+        elif isinstance(value, str) and value.strip():
+            tag_name = value.strip()
+            tag = tags_by_name.get(tag_name)
+            if not tag:
+                tag = Tag(user_id=user_id, name=tag_name)
+                db.session.add(tag)
+                tags_by_name[tag_name] = tag
+        if tag and tag not in resolved:
+            resolved.append(tag)
+    return resolved
+
 # --- API Endpoints ---
 
 @matches_bp.route("/log_match", methods=["POST"])
 @limiter.limit("60 per minute")
 @login_required
+@query_budget(13) # Worst case: first match of a deck, with new tags and a mix of new and rated opponents
 def log_match():
     user_id = session.get('user_id')
     data = request.get_json()
@@ -95,8 +145,6 @@ def log_match():
 
                     if role not in VALID_COMMANDER_ROLES:
                         return jsonify({"error": f"Invalid role '{role}' for commander at seat {seat}."}), 400
-                    if not db.session.get(Commander, cmd_id):
-                        return jsonify({"error": f"Commander ID {cmd_id} for opponent at seat {seat} (role: {role}) not found."}), 400
                     
                     parsed_opponent_commanders.append({'seat_number': seat, 'commander_id': cmd_id, 'role': role})
 
@@ -111,7 +159,18 @@ def log_match():
     if not (1 <= player_position <= 4):
         return jsonify({"error": "Invalid player position."}), 400
 
-    deck = Deck.query.filter_by(id=deck_id, user_id=user_id, is_active=True).first()
+    # All opponent commanders are validated with a single IN query
+    commanders_by_id = load_commanders_by_id([opp['commander_id'] for opp in parsed_opponent_commanders])
+    for opp in parsed_opponent_commanders:
+        if opp['commander_id'] not in commanders_by_id:
+            return jsonify({"error": f"Commander ID {opp['commander_id']} for opponent at seat {opp['seat_number']} (role: {opp['role']}) not found."}), 400
+
+    opponent_names_by_seat = defaultdict(list)
+    for opp in parsed_opponent_commanders:
+        opponent_names_by_seat[opp['seat_number']].append(commanders_by_id[opp['commander_id']].name)
+    # The ownership check also reads the ratings this match will move
+    signature_hashes = [row['signature_hash'] for row in signature_rows(None, user_id, opponent_names_by_seat)]
+    deck, stored_ratings = load_deck_with_ratings(user_id, deck_id, signature_hashes)
     if not deck:
         return jsonify({"error": "Active deck not found or not owned by user."}), 404
 
@@ -126,67 +185,50 @@ def log_match():
             pod_notes=pod_notes
         )
         db.session.add(new_match)
-        db.session.flush() 
-
-        for opp_cmd_data in parsed_opponent_commanders:
-            ocim_entry = OpponentCommanderInMatch(
-                logged_match_id=new_match.id,
-                seat_number=opp_cmd_data['seat_number'],
-                commander_id=opp_cmd_data['commander_id'],
-                role=opp_cmd_data['role']
-            )
-            db.session.add(ocim_entry)
-
-        if tag_names_or_ids and isinstance(tag_names_or_ids, list):
-            tags_to_associate = []
-            for name_or_id in tag_names_or_ids:
-                tag = None
-                if isinstance(name_or_id, int):
-                    tag = Tag.query.filter_by(id=name_or_id, user_id=user_id).first()
-                elif isinstance(name_or_id, str) and name_or_id.strip():
-                    tag_name = name_or_id.strip()
-                    tag = Tag.query.filter_by(user_id=user_id, name=tag_name).first()
-                    if not tag:
-                        tag = Tag(user_id=user_id, name=tag_name)
-                        db.session.add(tag)
-                if tag:
-                    tags_to_associate.append(tag)
-            if tags_to_associate:
-                new_match.tags.extend(tags_to_associate)
+        match_tags_to_link = resolve_match_tags(user_id, tag_names_or_ids)
+        db.session.flush() # Inserts the match (and any new tags) to get their ids
 
-        db.session.commit()
-        logger.info(f"Match logged successfully (ID: {new_match.id}) for user {user_id}, deck {deck_id}")
+        # Child rows go in as one executemany per table
+        opponent_rows = [{'logged_match_id': new_match.id, **opp_cmd_data} for opp_cmd_data in parsed_opponent_commanders]
+        if opponent_rows:
+            db.session.execute(insert(OpponentCommanderInMatch), opponent_rows)
+        signature_values = record_opponent_signatures(new_match, opponent_names_by_seat)
 
-        final_match_data = LoggedMatch.query.options(
-            joinedload(LoggedMatch.opponent_commanders).joinedload(OpponentCommanderInMatch.commander),
-            selectinload(LoggedMatch.tags)
-        ).get(new_match.id)
+        if match_tags_to_link:
+            db.session.execute(insert(match_tags), [{'match_id': new_match.id, 'tag_id': tag.id} for tag in match_tags_to_link])
 
+        record_match(new_match) # Same transaction as the match insert
+        record_match_rating(new_match, signature_values, stored_ratings)
 
+        # Built from the objects already in memory (commit expires them)
         response_match_data = {
-            "id": final_match_data.id,
-            "timestamp": format_timestamp(final_match_data.timestamp),
-            "result": final_match_data.result,
-            "result_text": RESULT_MAP_TEXT.get(final_match_data.result, "Unknown"),
-            "deck_id": final_match_data.deck_id,
-            "logger_user_id": final_match_data.logger_user_id,
-            "player_position": final_match_data.player_position,
-            "player_mulligans": final_match_data.player_mulligans,
-            "pod_notes": final_match_data.pod_notes,
-            "is_active": final_match_data.is_active,
-            "tags": [{"id": t.id, "name": t.name} for t in final_match_data.tags],
+            "id": new_match.id,
+            "timestamp": format_timestamp(new_match.timestamp),
+            "result": new_match.result,
+            "result_text": RESULT_MAP_TEXT.get(new_match.result, "Unknown"),
+            "deck_id": new_match.deck_id,
+            "logger_user_id": new_match.logger_user_id,
+            "player_position": new_match.player_position,
+            "player_mulligans": new_match.player_mulligans,
+            "pod_notes": new_match.pod_notes,
+            "is_active": new_match.is_active,
+            "tags": [{"id": t.id, "name": t.name} for t in match_tags_to_link],
             "opponent_commanders_by_seat": {}
         }
         
-        for oc in final_match_data.opponent_commanders:
-            seat_key = str(oc.seat_number)
+        for opp_cmd_data in parsed_opponent_commanders:
+            seat_key = str(opp_cmd_data['seat_number'])
             if seat_key not in response_match_data["opponent_commanders_by_seat"]:
                 response_match_data["opponent_commanders_by_seat"][seat_key] = []
             response_match_data["opponent_commanders_by_seat"][seat_key].append({
-                "id": oc.commander_id,
-                "name": oc.commander.name if oc.commander else "Unknown Commander",
-                "role": oc.role
+                "id": opp_cmd_data['commander_id'],
+                "name": commanders_by_id[opp_cmd_data['commander_id']].name,
+                "role": opp_cmd_data['role']
             })
+
+        db.session.commit()
+        bump_user_data_version(user_id)
+        logger.info(f"Match logged successfully (ID: {response_match_data['id']}) for user {user_id}, deck {deck_id}")
         
         return jsonify({
             "message": "Match logged successfully",
@@ -199,6 +241,57 @@ def log_match():
         return jsonify({"error": "Database error", "details": error_detail}), 500
 
 
+@matches_bp.route("/matches/bulk", methods=["POST"])
+@limiter.limit("5 per minute")
+@login_required
+def bulk_import_matches():
+    """
+    Imports many matches at once from a JSON body ({"matches": [...]} or a list),
+    a text/csv body, or an uploaded 'file' (.csv or .json).
+    Returns a per-row error report; valid rows are imported even if others fail.
+    """
+    user_id = session.get('user_id')
+    try:
+        uploaded = request.files.get('file')
+        if uploaded:
+            import_format = 'csv' if uploaded.filename.lower().endswith('.csv') else 'json'
+            rows = parse_import_payload(uploaded.read(), import_format)
+        elif request.mimetype == 'text/csv':
+            rows = parse_import_payload(request.get_data(), 'csv')
+        else:
+            data = request.get_json(silent=True)
+            if data is None:
+                return jsonify({"error": "Invalid request body. JSON, CSV or a file upload expected."}), 400
+            rows = parse_import_payload(data, 'json')
+        report = import_matches(user_id, rows)
+    except MatchImportError as e:
+        return jsonify({"error": str(e)}), 400
+    if report["imported"]:
+        bump_user_data_version(user_id)
+
+    status = 201 if report["imported"] else 400
+    return jsonify(report), status
+
+
+@matches_bp.route("/matches/export", methods=["GET"])
+@limiter.limit("5 per minute")
+@login_required
+def export_matches():
+    user_id = session.get('user_id')
+    export_format = request.args.get('format', 'ndjson').lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Invalid format. Use one of: {', '.join(EXPORT_FORMATS)}."}), 400
+
+    mimetype = "application/x-ndjson" if export_format == "ndjson" else "text/csv"
+    filename = f"matches-{datetime.now(timezone.utc):%Y%m%d}.{export_format}"
+    # stream_with_context keeps the request (and its DB session) alive while rows are streamed
+    return Response(
+        stream_with_context(stream_match_export(user_id, export_format)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @matches_bp.route('/matches/<int:match_id>/tags', methods=['POST'])
 @limiter.limit("60 per minute")
 @login_required
@@ -229,6 +322,7 @@ def add_tag_to_match(match_id):
     try:
         match.tags.append(tag_to_add)
         db.session.commit()
+        bump_user_data_version(current_user_id)
         logger.info(f"Tag {tag_id} added to match {match_id} by user {current_user_id}")
         return jsonify({"message": "Tag associated successfully"}), 201
     except Exception as e:
@@ -268,6 +362,7 @@ def remove_tag_from_match(match_id, tag_id):
         )
         db.session.execute(delete_stmt)
         db.session.commit()
+        bump_user_data_version(current_user_id)
         logger.info(f"Tag {tag_id} removed from match {match_id} by user {current_user_id}")
         return '', 204
     except Exception as e:
@@ -295,7 +390,11 @@ def delete_match(match_id):
 
     try:
         match_to_soft_delete.soft_delete()
-        db.session.commit()
+        remove_match(match_to_soft_delete)
+        # Ratings depend on order, so they cannot be decremented; the replay runs as a job.
+        # Enqueueing commits the soft delete together with the job row.
+        queue_rating_replay(current_user_id)
+        bump_user_data_version(current_user_id)
         logger.info(f"Match {match_id} soft deleted successfully by user {current_user_id}.")
         return '', 204
     except Exception as e:
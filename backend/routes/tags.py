@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request, session
 from sqlalchemy.orm import selectinload
-from backend.utils.decorators import login_required
+from backend.utils.decorators import login_required, query_budget, conditional_get
+from backend.cache import bump_user_data_version
 from backend import db, limiter
 from backend.models.tag import Tag
 from backend.models.deck import Deck
@@ -29,6 +30,8 @@ def normalize_tag_name(name: str) -> str:
 @tags_bp.route('/tags', methods=['GET'])
 @limiter.limit("60 per minute")
 @login_required
+@conditional_get()
+@query_budget(1)
 def get_user_tags():
     current_user_id = session.get('user_id')
     user_tags = Tag.query.filter_by(user_id=current_user_id).order_by(Tag.name).all()
@@ -67,6 +70,7 @@ def create_user_tag():
     try:
         db.session.add(new_tag)
         db.session.commit()
+        bump_user_data_version(current_user_id)
         return jsonify({'id': new_tag.id, 'name': new_tag.name}), 201
     except IntegrityError as e:
         db.session.rollback()
@@ -103,6 +107,7 @@ def add_tag_to_deck(deck_id):
     try:
         deck.tags.append(tag_to_add)
         db.session.commit()
+        bump_user_data_version(current_user_id)
         return jsonify({"message": "Tag associated successfully"}), 201
     except Exception as e:
         db.session.rollback()
@@ -124,6 +129,7 @@ def remove_tag_from_deck(deck_id, tag_id):
     try:
         deck.tags.remove(tag_to_remove)
         db.session.commit()
+        bump_user_data_version(current_user_id)
         return '', 204 # Standard for successful DELETE with no content
     except Exception as e:
         db.session.rollback()
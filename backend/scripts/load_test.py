@@ -0,0 +1,116 @@
+# backend/scripts/load_test.py
+#
+# Closed-loop load test for a running server: logs in once (so the login rate
+# limit is not hit), then every client requests the read-heavy API endpoints
+# back to back with that session for the given duration.
+# Compare server profiles by pointing it at each one in turn, e.g.
+#
+#   gunicorn --workers 1 --bind :8080 app:app        # the old single-worker setup
+#   python -m backend.scripts.load_test --email player@example.com --clients 16 --duration 30
+#   gunicorn app:app                                 # gunicorn.conf.py profile
+#   python -m backend.scripts.load_test --email player@example.com --clients 16 --duration 30
+#
+# Log in with an account that has data, e.g. one made by `flask seed-synthetic`.
+import argparse
+import statistics
+import threading
+import time
+
+import requests
+
+DEFAULT_PATHS = [
+    "/api/user_decks",
+    "/api/performance-summary",
+    "/api/matches_history?limit=50&offset=0",
+    "/api/performance/timeseries",
+]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize(latencies, errors, elapsed):
+    """Throughput and latency (ms) for one run; `latencies` are seconds per successful request."""
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / elapsed, 1) if elapsed > 0 else 0.0,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 1) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 1),
+    }
+
+
+def login(base_url, email, password):
+    """Session cookies for the account (raises on a failed login)."""
+    response = requests.post(f"{base_url}/api/auth/login", json={"email": email, "password": password}, timeout=30)
+    if response.status_code != 200:
+        raise SystemExit(f"Login failed with {response.status_code}: {response.text[:200]}")
+    return response.cookies
+
+
+def _client(base_url, cookies, paths, deadline, latencies, errors, lock):
+    http = requests.Session()
+    http.cookies.update(cookies)
+    local_latencies, local_errors, n = [], [], 0
+    while time.perf_counter() < deadline:
+        path = paths[n % len(paths)]
+        n += 1
+        started = time.perf_counter()
+        try:
+            response = http.get(f"{base_url}{path}", timeout=30)
+        except requests.RequestException as e:
+            local_errors.append(f"{path} {type(e).__name__}")
+            continue
+        if response.status_code == 200:
+            local_latencies.append(time.perf_counter() - started)
+        else:
+            local_errors.append(f"{path} {response.status_code}")
+    with lock:
+        latencies.extend(local_latencies)
+        errors.extend(local_errors)
+
+
+def run(base_url, email, password, clients, duration, paths=None):
+    base_url = base_url.rstrip("/")
+    paths = paths or DEFAULT_PATHS
+    cookies = login(base_url, email, password)
+    latencies, errors, lock = [], [], threading.Lock()
+    started = time.perf_counter()
+    deadline = started + duration
+    threads = [
+        threading.Thread(target=_client, args=(base_url, cookies, paths, deadline, latencies, errors, lock))
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, len(errors), time.perf_counter() - started), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Closed-loop load test against a running TCG Tracker server.")
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--email", required=True, help="Account to log in as (e.g. a player made by seed-synthetic).")
+    parser.add_argument("--password", default="synthetic-password")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent clients.")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run.")
+    parser.add_argument("--path", action="append", dest="paths", help="Endpoint to request (repeatable).")
+    args = parser.parse_args()
+
+    result, errors = run(args.base_url, args.email, args.password, args.clients, args.duration, args.paths)
+    print(f"{args.clients} clients for {args.duration:.0f}s against {args.base_url}")
+    print(f"  {result['requests']} requests, {result['errors']} errors, {result['rps']} req/s")
+    print(f"  latency mean {result['mean_ms']} ms, p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms")
+    for error in sorted(set(errors))[:10]:
+        print(f"  error: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,9 @@ import psycopg2
 import time
 import os
 from urllib.parse import urlparse
+from backend.services.commanders.commander_ingest_service import card_to_row, content_hash, HASHED_COLUMNS
+
+COLUMNS = ["scryfall_id"] + HASHED_COLUMNS + ["content_hash"]
 
 db_url = os.environ.get('DATABASE_URL')
 if not db_url:
@@ -23,7 +26,9 @@ try:
     base_url = 'https://api.scryfall.com/cards/search?q=is:commander+not:digital'
     next_page = base_url
     count_processed = 0
-    count_inserted_updated = 0
+    count_inserted = 0
+    count_updated = 0
+    count_unchanged = 0
 
     print("Empezando a obtener y procesar comandantes desde Scryfall...")
     while next_page:
@@ -42,48 +47,33 @@ try:
 
         print(f"Procesando {len(cards_in_page)} cartas...")
         for card in cards_in_page:
-            scryfall_id = card.get("id", "")
-            name = card.get("name", "")
-            flavor_name = card.get("flavor_name", None)
-            mana_cost = card.get("mana_cost", "")
-            cmc = card.get("cmc", 0.0)
-            type_line = card.get("type_line", "")
-            oracle_text = card.get("oracle_text", "")
-            power = card.get("power", None)
-            toughness = card.get("toughness", None)
-            loyalty = card.get("loyalty", None)
-            colors = ",".join(card.get("colors", []))
-            color_identity = ",".join(card.get("color_identity", []))
-            set_code = card.get("set", "")
-            image_url = card.get("image_uris", {}).get("normal", None)
-            art_crop = card.get("image_uris", {}).get("art_crop", None)
+            if not card.get("id"):
+                continue
+            row = card_to_row(card)
+            row["content_hash"] = content_hash(row)
 
-            sql = """
-                INSERT INTO commanders (
-                    scryfall_id, name, flavor_name, mana_cost, cmc, type_line, oracle_text,
-                    power, toughness, loyalty, colors, color_identity, set_code, image_url,
-                    art_crop, updated_at
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+            # Unchanged cards (same content_hash) are not rewritten and keep their updated_at
+            sql = f"""
+                INSERT INTO commanders ({", ".join(COLUMNS)}, updated_at)
+                VALUES ({", ".join(["%s"] * len(COLUMNS))}, CURRENT_TIMESTAMP)
                 ON CONFLICT(scryfall_id) DO UPDATE SET
-                    name=excluded.name, flavor_name=excluded.flavor_name, mana_cost=excluded.mana_cost,
-                    type_line=excluded.type_line, oracle_text=excluded.oracle_text,
-                    power=excluded.power, toughness=excluded.toughness, loyalty=excluded.loyalty,
-                    colors=excluded.colors, color_identity=excluded.color_identity,
-                    set_code=excluded.set_code, image_url=excluded.image_url,
-                    art_crop=excluded.art_crop, updated_at=CURRENT_TIMESTAMP;
+                    {", ".join(f"{column}=excluded.{column}" for column in COLUMNS[1:])},
+                    updated_at=CURRENT_TIMESTAMP
+                WHERE commanders.content_hash IS DISTINCT FROM excluded.content_hash
+                RETURNING (xmax = 0) AS inserted;
             """
-            params = (
-                scryfall_id, name, flavor_name, mana_cost, cmc, type_line, oracle_text,
-                power, toughness, loyalty, colors, color_identity, set_code, image_url, art_crop
-            )
-            cursor.execute(sql, params)
+            cursor.execute(sql, [row[column] for column in COLUMNS])
             count_processed += 1
-            if cursor.rowcount > 0:
-                 count_inserted_updated += 1
+            result = cursor.fetchone()
+            if result is None:
+                count_unchanged += 1
+            elif result[0]:
+                count_inserted += 1
+            else:
+                count_updated += 1
 
         conn.commit()
-        print(f"Progreso guardado. {count_inserted_updated} registros insertados/actualizados hasta ahora.")
+        print(f"Progreso guardado. Insertados: {count_inserted}, actualizados: {count_updated}, sin cambios: {count_unchanged}.")
 
         next_page = data.get("next_page", None)
         if next_page:
@@ -91,7 +81,7 @@ try:
             time.sleep(0.1)
 
     print(f"Proceso Scryfall completado. Total de cartas procesadas: {count_processed}.")
-    print(f"Total de comandantes insertados/actualizados: {count_inserted_updated}.")
+    print(f"Comandantes insertados: {count_inserted}, actualizados: {count_updated}, sin cambios: {count_unchanged}.")
 
 except psycopg2.Error as e:
     print(f"Error de PostgreSQL: {e}")
@@ -0,0 +1,3 @@
+from .commander_catalog_service import *
+from .commander_flag_service import *
+from .commander_ingest_service import *
\ No newline at end of file
@@ -0,0 +1,167 @@
+# backend/services/commanders/commander_catalog_service.py
+
+from flask import current_app
+from sqlalchemy import select, func
+from backend import db
+from backend.models.commanders import Commander
+from collections import defaultdict
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_SECONDS = 30
+DEFAULT_SEARCH_LIMIT = 20
+NGRAM_SIZE = 3
+
+# Search `type` filter -> Commander flag the results must have.
+# Searching for a choose_a_background commander's pair returns Backgrounds.
+PAIRING_FILTERS = {
+    "partner": "partner",
+    "friends_forever": "friends_forever",
+    "background": "background",
+    "choose_a_background": "background",
+    "doctor_companion": "doctor_companion",
+    "time_lord_doctor": "time_lord_doctor",
+}
+PAIRING_FLAGS = sorted(set(PAIRING_FILTERS.values()))
+
+# --- Snapshot ---
+
+def _normalize(text):
+    return text.casefold()
+
+def _ngrams(text, size):
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+def _iter_bits(bits):
+    """Positions of the set bits of an int, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class CommanderCatalog:
+    """
+    Immutable in-memory snapshot of the commanders table for autocomplete.
+    Entries are sorted by name; every index maps a key to an int bitset over entry
+    positions, so filters combine with `&` and set bits come out in name order.
+    Names are indexed by all 1-, 2- and 3-grams, so a query is narrowed by the
+    intersection of its (up to) trigrams and then verified as a substring.
+    """
+
+    def __init__(self, rows, version):
+        self.version = version
+        self.entries = []
+        self.names = []
+        self.ngram_index = defaultdict(int)
+        self.flag_bits = dict.fromkeys(PAIRING_FLAGS, 0)
+
+        for position, row in enumerate(sorted(rows, key=lambda r: (_normalize(r.name), r.id))):
+            bit = 1 << position
+            name = _normalize(row.name)
+            self.entries.append({"id": row.id, "name": row.name, "image_url": row.art_crop or row.image_url})
+            self.names.append(name)
+            for size in range(1, NGRAM_SIZE + 1):
+                for gram in _ngrams(name, size):
+                    self.ngram_index[gram] |= bit
+            for flag in PAIRING_FLAGS:
+                if getattr(row, flag):
+                    self.flag_bits[flag] |= bit
+        self.ngram_index = dict(self.ngram_index)
+        self.all_bits = (1 << len(self.entries)) - 1
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _candidates(self, query):
+        size = min(len(query), NGRAM_SIZE)
+        bits = self.all_bits
+        for gram in _ngrams(query, size):
+            bits &= self.ngram_index.get(gram, 0)
+            if not bits:
+                break
+        return bits
+
+    def search(self, query, relation_type=None, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Case-insensitive substring search. Names starting with the query rank first,
+        then names with a word starting with it, then other matches; ties by name.
+        """
+        query = _normalize(query.strip())
+        if not query:
+            return []
+        bits = self._candidates(query)
+        flag = PAIRING_FILTERS.get((relation_type or "").lower())
+        if flag:
+            bits &= self.flag_bits[flag]
+
+        buckets = ([], [], [])
+        word_prefix = " " + query
+        for position in _iter_bits(bits):
+            name = self.names[position]
+            if name.startswith(query):
+                buckets[0].append(position)
+                if len(buckets[0]) >= limit:
+                    break
+            elif word_prefix in name:
+                buckets[1].append(position)
+            elif query in name:
+                buckets[2].append(position)
+        ranked = (buckets[0] + buckets[1] + buckets[2])[:limit]
+        return [self.entries[position] for position in ranked]
+
+# --- Process-Local Cache ---
+
+_lock = threading.Lock()
+_catalog = None
+_checked_at = 0.0
+
+def _catalog_version():
+    """(max(updated_at), row count) — changes whenever update-commanders touches the table."""
+    max_updated, count = db.session.execute(
+        select(func.max(Commander.updated_at), func.count(Commander.id))
+    ).one()
+    return (str(max_updated), count)
+
+def _load_catalog(version):
+    rows = db.session.execute(select(
+        Commander.id, Commander.name, Commander.image_url, Commander.art_crop,
+        *[getattr(Commander, flag) for flag in PAIRING_FLAGS]
+    )).all()
+    catalog = CommanderCatalog(rows, version)
+    logger.info(f"Commander catalog loaded: {len(catalog)} commanders.")
+    return catalog
+
+def get_commander_catalog():
+    """
+    Returns the process-local catalog snapshot. The version query runs at most once
+    per COMMANDER_CATALOG_CHECK_SECONDS; the full table is reloaded only when the
+    version changed.
+    """
+    global _catalog, _checked_at
+    check_seconds = current_app.config.get("COMMANDER_CATALOG_CHECK_SECONDS", DEFAULT_CHECK_SECONDS)
+    catalog = _catalog
+    if catalog is not None and time.monotonic() - _checked_at < check_seconds:
+        return catalog
+
+    with _lock:
+        if _catalog is not None and time.monotonic() - _checked_at < check_seconds:
+            return _catalog
+        version = _catalog_version()
+        if _catalog is None or _catalog.version != version:
+            _catalog = _load_catalog(version)
+        _checked_at = time.monotonic()
+        return _catalog
+
+def invalidate_commander_catalog():
+    """Drops this process's snapshot (other workers notice through the version check)."""
+    global _catalog, _checked_at
+    with _lock:
+        _catalog = None
+        _checked_at = 0.0
+
+def search_commanders(query, relation_type=None, limit=DEFAULT_SEARCH_LIMIT):
+    return get_commander_catalog().search(query, relation_type, limit)
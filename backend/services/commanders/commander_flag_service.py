@@ -0,0 +1,70 @@
+# backend/services/commanders/commander_flag_service.py
+
+from sqlalchemy import select, update, bindparam, func
+from backend import db
+from backend.models.commanders import Commander
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# flag -> (Commander field the rule reads, compiled pattern)
+FLAG_RULES = {
+    "partner": ("oracle_text", re.compile(r"\bPartner\b")),
+    "friends_forever": ("oracle_text", re.compile(r"\bfriends forever\b", re.IGNORECASE)),
+    "choose_a_background": ("oracle_text", re.compile(r"\bchoose a background\b", re.IGNORECASE)),
+    "doctor_companion": ("oracle_text", re.compile(r"\bdoctor['’]s companion\b", re.IGNORECASE)),
+    "background": ("type_line", re.compile(r"^Legendary Enchantment\b.*—.*\bBackground\b")),
+    "time_lord_doctor": ("type_line", re.compile(r"\bTime Lord Doctor\b", re.IGNORECASE)),
+}
+FLAG_NAMES = list(FLAG_RULES)
+
+def classify_flags(type_line, oracle_text):
+    """Pairing flags for one card, from its type line and oracle text."""
+    fields = {"type_line": type_line or "", "oracle_text": oracle_text or ""}
+    return {flag: bool(pattern.search(fields[field])) for flag, (field, pattern) in FLAG_RULES.items()}
+
+def reclassify_commander_flags(commander_ids=None):
+    """
+    Recomputes every pairing flag in one in-memory pass over the commanders
+    (optionally only `commander_ids`) and writes the rows whose flags changed,
+    setting and clearing flags, with one executemany UPDATE. Changed rows get a new
+    content_hash and updated_at. Does not commit.
+    Returns {"checked", "changed", "set": {flag: n}, "cleared": {flag: n}}.
+    """
+    # Imported here: the ingester imports classify_flags from this module
+    from backend.services.commanders.commander_ingest_service import content_hash, HASHED_COLUMNS
+
+    stmt = select(Commander.id, *[getattr(Commander, column) for column in HASHED_COLUMNS])
+    if commander_ids is not None:
+        stmt = stmt.where(Commander.id.in_(commander_ids))
+
+    report = {"checked": 0, "changed": 0, "set": dict.fromkeys(FLAG_NAMES, 0), "cleared": dict.fromkeys(FLAG_NAMES, 0)}
+    changed_rows = []
+    for row in db.session.execute(stmt).mappings():
+        report["checked"] += 1
+        flags = classify_flags(row["type_line"], row["oracle_text"])
+        diff = {flag: value for flag, value in flags.items() if bool(row[flag]) != value}
+        if not diff:
+            continue
+        for flag, value in diff.items():
+            report["set" if value else "cleared"][flag] += 1
+        changed_rows.append({
+            "_id": row["id"],
+            "_content_hash": content_hash({**row, **flags}),
+            **{f"_{flag}": value for flag, value in flags.items()},
+        })
+
+    if changed_rows:
+        table = Commander.__table__
+        db.session.execute(
+            update(table).where(table.c.id == bindparam("_id")).values(
+                content_hash=bindparam("_content_hash"),
+                updated_at=func.current_timestamp(),
+                **{flag: bindparam(f"_{flag}") for flag in FLAG_NAMES}
+            ),
+            changed_rows
+        )
+    report["changed"] = len(changed_rows)
+    logger.info(f"Commander flags reclassified: {report['checked']} checked, {report['changed']} changed.")
+    return report
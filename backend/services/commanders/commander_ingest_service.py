@@ -0,0 +1,245 @@
+# backend/services/commanders/commander_ingest_service.py
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects import postgresql, sqlite
+from backend import db
+from backend.models.commanders import Commander
+from backend.services.commanders.commander_flag_service import classify_flags
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 1 << 16
+UPSERT_BATCH_SIZE = 500
+COMMANDER_LEGALITIES = ("legal", "restricted")
+
+# Columns written by the ingester (everything except id/updated_at and the key)
+CARD_COLUMNS = [
+    "name", "flavor_name", "mana_cost", "cmc", "type_line", "oracle_text", "power", "toughness",
+    "loyalty", "colors", "color_identity", "set_code", "image_url", "art_crop",
+]
+FLAG_COLUMNS = ["partner", "background", "choose_a_background", "friends_forever", "doctor_companion", "time_lord_doctor"]
+
+
+class BulkDataError(ValueError):
+    """The bulk-data file is not a JSON array of card objects."""
+
+# --- Streaming Parser ---
+
+def iter_json_array(fp, chunk_size=READ_CHUNK_SIZE):
+    """
+    Yields the elements of a top-level JSON array from a text file one at a time,
+    holding at most one element plus one read chunk in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    eof = False
+
+    while True:
+        # Skip whitespace and separators before the next element
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            buffer, position = fp.read(chunk_size), 0
+            eof = not buffer
+        if position >= len(buffer):
+            raise BulkDataError("Unexpected end of file." if started else "File is empty.")
+
+        char = buffer[position]
+        if not started:
+            if char != "[":
+                raise BulkDataError("Bulk data must be a JSON array.")
+            started = True
+            position += 1
+            continue
+        if char == "]":
+            return
+        if char == ",":
+            position += 1
+            continue
+
+        while True:
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+                break
+            except json.JSONDecodeError:
+                chunk = fp.read(chunk_size)
+                if not chunk:
+                    raise BulkDataError(f"Malformed JSON near offset {position}.")
+                buffer, position = buffer[position:] + chunk, 0
+        yield element
+        buffer, position = buffer[end:], 0
+
+# --- Card Mapping ---
+
+def _faces_text(card, key):
+    if card.get(key) is not None:
+        return card.get(key)
+    faces = [face.get(key) for face in card.get("card_faces") or [] if face.get(key)]
+    return "\n//\n".join(faces) if faces else None
+
+def is_commander_card(card):
+    """Paper cards legal in Commander that can lead a deck (or be a Background)."""
+    if card.get("digital") or card.get("legalities", {}).get("commander") not in COMMANDER_LEGALITIES:
+        return False
+    type_line = (card.get("type_line") or "").split("//")[0]
+    oracle_text = _faces_text(card, "oracle_text") or ""
+    return (
+        ("Legendary" in type_line and "Creature" in type_line)
+        or "Background" in type_line
+        or "can be your commander" in oracle_text
+    )
+
+def card_to_row(card):
+    """Maps a Scryfall card object to a commanders row dict (flags included)."""
+    image_uris = card.get("image_uris") or next(
+        (face["image_uris"] for face in card.get("card_faces") or [] if face.get("image_uris")), {}
+    )
+    type_line = card.get("type_line", "")
+    oracle_text = _faces_text(card, "oracle_text") or ""
+    row = {
+        "scryfall_id": card["id"],
+        "name": card.get("name", ""),
+        "flavor_name": card.get("flavor_name"),
+        "mana_cost": _faces_text(card, "mana_cost") or "",
+        "cmc": card.get("cmc"),
+        "type_line": type_line,
+        "oracle_text": oracle_text,
+        "power": _faces_text(card, "power"),
+        "toughness": _faces_text(card, "toughness"),
+        "loyalty": _faces_text(card, "loyalty"),
+        "colors": ",".join(card.get("colors") or []),
+        "color_identity": ",".join(card.get("color_identity") or []),
+        "set_code": card.get("set", ""),
+        "image_url": image_uris.get("normal"),
+        "art_crop": image_uris.get("art_crop"),
+    }
+    row.update(classify_flags(type_line, oracle_text))
+    return row
+
+# --- Content Hash ---
+
+HASHED_COLUMNS = CARD_COLUMNS + FLAG_COLUMNS
+
+def content_hash(row):
+    """
+    SHA-1 of every persisted Scryfall field (flags included), used to skip cards
+    that did not change since the last refresh.
+    """
+    values = []
+    for column in HASHED_COLUMNS:
+        value = row.get(column)
+        if column in FLAG_COLUMNS:
+            value = bool(value)
+        elif column == "cmc" and value is not None:
+            value = float(value)
+        values.append(value)
+    return hashlib.sha1(json.dumps(values, separators=(",", ":"), ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def load_content_hashes():
+    """{scryfall_id: content_hash} for every stored commander (one query)."""
+    return dict(db.session.execute(select(Commander.scryfall_id, Commander.content_hash)).all())
+
+def load_commander_names():
+    """{commander id: name} for every stored commander (one query)."""
+    return dict(db.session.execute(select(Commander.id, Commander.name)).all())
+
+def renamed_commander_ids(names_before):
+    """Ids of commanders whose name differs from `names_before` (a load_commander_names() snapshot)."""
+    return sorted(
+        commander_id for commander_id, name in load_commander_names().items()
+        if commander_id in names_before and names_before[commander_id] != name
+    )
+
+# --- Upsert ---
+
+def _upsert_statement():
+    dialect = db.engine.dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(Commander)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(Commander)
+    else:
+        raise RuntimeError(f"Bulk commander upsert is not supported on '{dialect}'.")
+    updated = {column: stmt.excluded[column] for column in HASHED_COLUMNS + ["content_hash"]}
+    updated["updated_at"] = func.current_timestamp()
+    return stmt.on_conflict_do_update(
+        index_elements=[Commander.scryfall_id], set_=updated,
+        # Rows that another run already brought up to date keep their updated_at
+        where=Commander.content_hash.is_distinct_from(stmt.excluded.content_hash)
+    )
+
+def upsert_commander_rows(rows):
+    """Inserts or updates a batch of commander rows with one executemany. Does not commit."""
+    if rows:
+        db.session.execute(_upsert_statement(), rows)
+
+def sync_commander_rows(rows, known_hashes):
+    """
+    Writes only the rows whose content hash differs from `known_hashes`
+    ({scryfall_id: hash}, updated in place). Does not commit.
+    Returns {"added", "changed", "unchanged"} for this batch.
+    """
+    counts = {"added": 0, "changed": 0, "unchanged": 0}
+    pending = []
+    for row in rows:
+        row = {**row, "content_hash": content_hash(row)}
+        scryfall_id = row["scryfall_id"]
+        if scryfall_id not in known_hashes:
+            counts["added"] += 1
+        elif known_hashes[scryfall_id] != row["content_hash"]:
+            counts["changed"] += 1
+        else:
+            counts["unchanged"] += 1
+            continue
+        known_hashes[scryfall_id] = row["content_hash"]
+        pending.append(row)
+    upsert_commander_rows(pending)
+    return counts
+
+def ingest_bulk_file(path, batch_size=UPSERT_BATCH_SIZE):
+    """
+    Streams a Scryfall bulk-data file (e.g. oracle_cards.json), keeps commander-legal
+    cards and upserts the new or changed ones in batches, committing after each batch.
+    Duplicate printings of the same oracle card keep only the first one seen.
+    Returns {"read", "added", "changed", "unchanged", "skipped"}.
+    """
+    report = {"read": 0, "added": 0, "changed": 0, "unchanged": 0, "skipped": 0}
+    known_hashes = load_content_hashes()
+    seen_oracle_ids = set()
+    batch = []
+
+    def flush():
+        for key, value in sync_commander_rows(batch, known_hashes).items():
+            report[key] += value
+        db.session.commit()
+        batch.clear()
+
+    with open(path, encoding="utf-8") as fp:
+        for card in iter_json_array(fp):
+            report["read"] += 1
+            if not isinstance(card, dict) or not card.get("id") or not is_commander_card(card):
+                report["skipped"] += 1
+                continue
+            oracle_id = card.get("oracle_id")
+            if oracle_id:
+                if oracle_id in seen_oracle_ids:
+                    report["skipped"] += 1
+                    continue
+                seen_oracle_ids.add(oracle_id)
+            batch.append(card_to_row(card))
+            if len(batch) >= batch_size:
+                flush()
+    flush()
+
+    logger.info(
+        f"Bulk commander ingest from {path}: read {report['read']}, added {report['added']}, "
+        f"changed {report['changed']}, unchanged {report['unchanged']}."
+    )
+    return report
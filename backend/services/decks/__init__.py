@@ -1,2 +1,3 @@
 from .get_user_decks_service import *
-from .get_commander_attributes_service import *
\ No newline at end of file
+from .get_commander_attributes_service import *
+from .deck_stats_service import *
@@ -0,0 +1,217 @@
+# backend/services/decks/deck_analytics_service.py
+
+from sqlalchemy import func, case, select, literal, cast, null, union_all, true, Integer, String, Text
+from sqlalchemy.orm import aliased
+from backend import db
+from backend.models import LoggedMatch, Deck, DeckStats, Commander, CommanderDeck, Tag, OpponentSeatSignature, Rating
+from backend.models.deck_stats import SEAT_NUMBERS
+from backend.models.tag import deck_tags
+from backend.services.matches.rating_service import rating_payload
+from backend.utils.rate_stats import rate_estimates, estimate_fields, pooled_rate
+from backend.services.decks.deck_service import (
+    MIN_ENCOUNTERS_FOR_MATCHUP, partition_matchups, format_mulligan_stats
+)
+from collections import namedtuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+COMMANDER_DECK_TYPE_NAME = "Commander"
+RESULT_WIN_ID = 0
+
+# Row kinds produced by the single-pass analytics statement
+KIND_MULLIGAN = "mulligan"
+KIND_MATCHUP = "matchup"
+KIND_RECENT = "recent"
+
+MulliganRow = namedtuple("MulliganRow", "player_mulligans game_count win_count")
+MatchupRow = namedtuple("MatchupRow", "opponent_signature games wins")
+
+# Pairing mechanic -> (main commander flag, associated commander flag, response key)
+PAIRING_RULES = (
+    ("partner", "partner", "partner_name"),
+    ("friends_forever", "friends_forever", "friends_forever_name"),
+    ("time_lord_doctor", "doctor_companion", "doctor_companion_name"),
+    ("doctor_companion", "time_lord_doctor", "time_lord_doctor_name"),
+    ("choose_a_background", "background", "background_name"),
+)
+PAIRING_FLAGS = ("partner", "friends_forever", "time_lord_doctor", "doctor_companion", "choose_a_background", "background")
+
+
+# --- Statement Builders ---
+
+def _deck_header_stmt(deck_id, user_id):
+    """
+    Deck, its command zone (both commanders), rollup stats, rating and tags in one statement.
+    Produces one row per tag (or a single row for an untagged deck).
+    """
+    main_cmd = aliased(Commander, name="main_cmd")
+    assoc_cmd = aliased(Commander, name="assoc_cmd")
+    seat_columns = [getattr(DeckStats, f"seat_{seat}_{kind}") for seat in SEAT_NUMBERS for kind in ("matches", "wins")]
+    return (
+        select(
+            Deck.id, Deck.name, Deck.deck_url,
+            DeckStats.total_matches, DeckStats.total_wins, *seat_columns,
+            Rating.rating, Rating.deviation, Rating.games.label("rated_games"),
+            main_cmd.id.label("main_id"), main_cmd.name.label("main_name"),
+            *[getattr(main_cmd, flag).label(f"main_{flag}") for flag in PAIRING_FLAGS],
+            assoc_cmd.id.label("assoc_id"), assoc_cmd.name.label("assoc_name"),
+            *[getattr(assoc_cmd, flag).label(f"assoc_{flag}") for flag in PAIRING_FLAGS],
+            Tag.id.label("tag_id"), Tag.name.label("tag_name")
+        )
+        .select_from(Deck)
+        .outerjoin(DeckStats, DeckStats.deck_id == Deck.id)
+        .outerjoin(Rating, (Rating.deck_id == Deck.id) & (Rating.user_id == Deck.user_id))
+        .outerjoin(CommanderDeck, CommanderDeck.deck_id == Deck.id)
+        .outerjoin(main_cmd, main_cmd.id == CommanderDeck.commander_id)
+        .outerjoin(assoc_cmd, assoc_cmd.id == CommanderDeck.associated_commander_id)
+        .outerjoin(deck_tags, deck_tags.c.deck_id == Deck.id)
+        .outerjoin(Tag, Tag.id == deck_tags.c.tag_id)
+        .where(Deck.id == deck_id, Deck.user_id == user_id, Deck.is_active == true())
+        .order_by(Tag.id)
+    )
+
+
+def _row(kind, *, bucket=None, signature=None, games=None, wins=None,
+         match_id=None, result=None, timestamp=None, player_position=None):
+    """Uniform column layout shared by every branch of the analytics UNION ALL."""
+    def typed(value, type_):
+        return cast(null(), type_) if value is None else value
+    return [
+        literal(kind, String).label("kind"),
+        typed(bucket, Integer).label("bucket"),
+        typed(signature, Text).label("signature"),
+        typed(games, Integer).label("games"),
+        typed(wins, Integer).label("wins"),
+        typed(match_id, Integer).label("match_id"),
+        typed(result, Integer).label("result"),
+        typed(timestamp, LoggedMatch.timestamp.type).label("timestamp"),
+        typed(player_position, Integer).label("player_position"),
+    ]
+
+
+def _match_analytics_stmt(deck_id, user_id, include_matchups, recent_limit):
+    """
+    Mulligan buckets, opponent matchups and recent matches for one deck as a single
+    UNION ALL statement (a portable stand-in for GROUPING SETS, which SQLite lacks).
+    Overall and per-seat totals come from the deck_stats rollup instead.
+    """
+    deck_matches = (
+        LoggedMatch.deck_id == deck_id,
+        LoggedMatch.logger_user_id == user_id,
+        LoggedMatch.is_active == true()
+    )
+    wins = func.sum(case((LoggedMatch.result == RESULT_WIN_ID, 1), else_=0))
+
+    branches = [
+        select(*_row(KIND_MULLIGAN, bucket=LoggedMatch.player_mulligans,
+                     games=func.count(LoggedMatch.id), wins=wins))
+        .where(*deck_matches, LoggedMatch.player_mulligans.isnot(None))
+        .group_by(LoggedMatch.player_mulligans)
+    ]
+
+    if include_matchups:
+        branches.append(
+            select(*_row(KIND_MATCHUP, signature=OpponentSeatSignature.signature,
+                         games=func.count(), wins=wins))
+            .select_from(LoggedMatch)
+            .join(OpponentSeatSignature, LoggedMatch.id == OpponentSeatSignature.logged_match_id)
+            .where(*deck_matches)
+            .group_by(OpponentSeatSignature.signature_hash, OpponentSeatSignature.signature)
+            .having(func.count() >= MIN_ENCOUNTERS_FOR_MATCHUP)
+        )
+
+    if recent_limit:
+        recent = (
+            select(LoggedMatch.id, LoggedMatch.result, LoggedMatch.timestamp, LoggedMatch.player_position)
+            .where(*deck_matches)
+            .order_by(LoggedMatch.timestamp.desc(), LoggedMatch.id.desc())
+            .limit(recent_limit)
+            .subquery("recent_matches")
+        )
+        branches.append(
+            select(*_row(KIND_RECENT, match_id=recent.c.id, result=recent.c.result,
+                         timestamp=recent.c.timestamp, player_position=recent.c.player_position))
+        )
+
+    return union_all(*branches)
+
+
+# --- Service Function ---
+
+def get_deck_details(deck_id, user_id, include_turn_stats=False, include_matchup_stats=False, recent_matches_limit=None):
+    """
+    Builds the /api/decks/<id> payload with a constant number of queries:
+    one for the deck header and one single-pass analytics statement.
+    Returns None if the deck is not an active deck owned by the user.
+    """
+    header_rows = db.session.execute(_deck_header_stmt(deck_id, user_id)).all()
+    if not header_rows:
+        return None
+    header = header_rows[0]
+
+    deck_data = {
+        "id": header.id,
+        "name": header.name,
+        "deck_url": header.deck_url,
+        "format_name": COMMANDER_DECK_TYPE_NAME,
+        "tags": [{"id": row.tag_id, "name": row.tag_name} for row in header_rows if row.tag_id is not None],
+        "commander_id": None, "commander_name": None,
+        "associated_commander_id": None, "associated_commander_name": None,
+        "partner_name": None, "friends_forever_name": None, "background_name": None,
+        "doctor_companion_name": None, "time_lord_doctor_name": None,
+    }
+
+    if header.main_id is not None:
+        deck_data["commander_id"] = header.main_id
+        deck_data["commander_name"] = header.main_name
+        if header.assoc_id is not None:
+            deck_data["associated_commander_id"] = header.assoc_id
+            deck_data["associated_commander_name"] = header.assoc_name
+            for main_flag, assoc_flag, response_key in PAIRING_RULES:
+                if getattr(header, f"main_{main_flag}") and getattr(header, f"assoc_{assoc_flag}"):
+                    deck_data[response_key] = header.assoc_name
+                    break
+
+    total_matches = header.total_matches or 0
+    total_wins = header.total_wins or 0
+    deck_data["total_matches"] = total_matches
+    deck_data["total_wins"] = total_wins
+    deck_data["win_rate"] = (total_wins / total_matches * 100) if total_matches > 0 else 0.0
+    deck_data["rating"] = rating_payload(header.rating, header.deviation, header.rated_games)
+
+    mulligan_rows, matchup_rows, recent_rows = [], [], []
+    analytics_stmt = _match_analytics_stmt(deck_id, user_id, include_matchup_stats, recent_matches_limit)
+    for row in db.session.execute(analytics_stmt):
+        if row.kind == KIND_MULLIGAN:
+            mulligan_rows.append(MulliganRow(row.bucket, row.games, row.wins))
+        elif row.kind == KIND_MATCHUP:
+            matchup_rows.append(MatchupRow(row.signature, row.games, row.wins))
+        else:
+            recent_rows.append(row)
+
+    deck_data["mulligan_stats"] = format_mulligan_stats(sorted(mulligan_rows, key=lambda r: r.player_mulligans))
+
+    if include_matchup_stats:
+        deck_data["matchup_stats"] = partition_matchups(matchup_rows, deck_data["win_rate"])
+
+    if include_turn_stats:
+        seat_matches = [getattr(header, f"seat_{seat}_matches") or 0 for seat in SEAT_NUMBERS]
+        seat_wins = [getattr(header, f"seat_{seat}_wins") or 0 for seat in SEAT_NUMBERS]
+        estimates = rate_estimates(seat_wins, seat_matches, prior_rate=pooled_rate(seat_wins, seat_matches))
+        deck_data["turn_order_stats"] = {}
+        for seat, matches_count, wins_count, estimate in zip(SEAT_NUMBERS, seat_matches, seat_wins, estimates):
+            deck_data["turn_order_stats"][str(seat)] = {
+                "matches": matches_count,
+                "wins": wins_count,
+                "win_rate": (wins_count / matches_count * 100) if matches_count > 0 else 0.0,
+                **estimate_fields(estimate)
+            }
+
+    recent_rows.sort(key=lambda r: (r.timestamp, r.match_id), reverse=True)
+    deck_data["recent_matches"] = [
+        {"id": r.match_id, "result": r.result, "timestamp": r.timestamp, "player_position": r.player_position}
+        for r in recent_rows
+    ]
+
+    return deck_data
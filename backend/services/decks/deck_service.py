@@ -1,120 +1,68 @@
 # backend/services/decks/deck_service.py
 
-from sqlalchemy import func, case, literal, Integer, select, Text, text
-from backend.models import LoggedMatch, Deck, Commander, OpponentCommanderInMatch
-from backend import db
+from backend.utils.rate_stats import rate_estimates, estimate_fields, pooled_rate
 
 MIN_ENCOUNTERS_FOR_MATCHUP = 3
 
-def get_deck_matchup_stats(deck_id: int, deck_average_wr: float):
-    """
-    Calculates win rates against specific opponent command zones.
-    
-    This definitive version uses a raw SQL subquery for creating the opponent
-    signatures. This is necessary to bypass a persistent SQLAlchemy compiler
-    issue. The raw SQL is known to be correct and performant.
-    """
-
-    # Step 1: Define the raw SQL and describe its output columns to SQLAlchemy.
-    # This is the correct pattern for creating a selectable from raw text.
-    opponent_signatures_subquery = text("""
-        SELECT
-            ocim.logged_match_id,
-            string_agg(c.name, ' / ' ORDER BY c.name ASC) AS opponent_signature
-        FROM opponent_commanders_in_match ocim
-        JOIN commanders c ON ocim.commander_id = c.id
-        GROUP BY ocim.logged_match_id, ocim.seat_number
-    """).columns(
-        logged_match_id=Integer,
-        opponent_signature=Text
-    ).subquery("opponent_signatures")
+# --- Shared Helpers ---
 
-    # Step 2: Join the main SQLAlchemy query to this raw SQL subquery.
-    # The rest of the query can still be built using the ORM.
-    matchup_stats_query = db.session.query(
-        opponent_signatures_subquery.c.opponent_signature,
-        func.count().label('games'),
-        func.sum(case((LoggedMatch.result == 0, 1), else_=0)).label('wins')
-    ).select_from(LoggedMatch).join(
-        opponent_signatures_subquery,
-        LoggedMatch.id == opponent_signatures_subquery.c.logged_match_id
-    ).filter(
-        LoggedMatch.deck_id == deck_id,
-        LoggedMatch.is_active == True
-    ).group_by(
-        opponent_signatures_subquery.c.opponent_signature
-    ).having(
-        func.count() >= MIN_ENCOUNTERS_FOR_MATCHUP
-    ).all()
+def mulligan_label(mulligans: int) -> str:
+    """Display label for a mulligan count (-1 is the free mulligan)."""
+    if mulligans == -1:
+        return 'Free (to 7)'
+    if mulligans == 0:
+        return 'Keep First 7'
+    return f'To {7 - mulligans} ({mulligans})'
 
-    # Process and Partition the results (this logic is correct and remains unchanged)
+def partition_matchups(rows, deck_average_wr: float):
+    """
+    Splits (opponent_signature, games, wins) rows into the top-5 nemesis and favorable
+    matchups. Rates are smoothed towards the deck's average, so a matchup stays on
+    the side its raw rate puts it. Ranking uses the Wilson interval: favorable by
+    its lower bound, nemesis by its upper bound, so a 1-2 record does not outrank
+    a 40-60 one.
+    """
+    rows = list(rows)
+    estimates = rate_estimates(
+        [row.wins for row in rows], [row.games for row in rows], prior_rate=deck_average_wr / 100
+    )
     nemesis_candidates, favorable_candidates = [], []
-    for row in matchup_stats_query:
+    for row, estimate in zip(rows, estimates):
         win_rate = (row.wins / row.games * 100) if row.games > 0 else 0
         matchup = {
             "name": row.opponent_signature, "wins": row.wins, "losses": row.games - row.wins,
-            "win_rate": round(win_rate, 1)
+            "win_rate": round(win_rate, 1), **estimate_fields(estimate)
         }
         if win_rate < deck_average_wr:
             nemesis_candidates.append(matchup)
         elif win_rate > deck_average_wr:
             favorable_candidates.append(matchup)
 
-    nemesis_matchups = sorted(nemesis_candidates, key=lambda x: x['win_rate'])[:5]
-    favorable_matchups = sorted(favorable_candidates, key=lambda x: x['win_rate'], reverse=True)[:5]
+    nemesis_matchups = sorted(nemesis_candidates, key=lambda x: (x['win_rate_upper'], x['win_rate']))[:5]
+    favorable_matchups = sorted(favorable_candidates, key=lambda x: (-x['win_rate_lower'], -x['win_rate']))[:5]
 
     return {"nemesis": nemesis_matchups, "favorable": favorable_matchups}
 
-def get_mulligan_stats_for_deck(deck_id: int, user_id: int):
+def format_mulligan_stats(rows):
     """
-    Calculates win rate statistics grouped by the number of mulligans for a specific deck.
+    Turns (player_mulligans, game_count, win_count) rows into the API's list of
+    dictionaries, with each bucket's interval and its rate smoothed towards the
+    deck's overall rate.
     """
-    # First, ensure the deck belongs to the user
-    deck = Deck.query.filter_by(id=deck_id, user_id=user_id).first()
-    if not deck:
-        return None # Or raise an exception
-
-    # Define the labels for each mulligan value
-    mulligan_label = case(
-        (LoggedMatch.player_mulligans == -1, 'Free (to 7)'),
-        (LoggedMatch.player_mulligans == 0, 'Keep First 7'),
-        # For other values, create a dynamic label like "To 6 (1)"
-        else_=func.concat('To ', 7 - LoggedMatch.player_mulligans, ' (', LoggedMatch.player_mulligans, ')')
-    )
-
-    # The main query
-    mulligan_stats_query = db.session.query(
-        LoggedMatch.player_mulligans,
-        mulligan_label.label('label'),
-        func.count(LoggedMatch.id).label('game_count'),
-        # Sum up wins (where result is 0)
-        func.sum(case((LoggedMatch.result == 0, 1), else_=0)).label('win_count')
-    ).filter(
-        LoggedMatch.deck_id == deck_id,
-        LoggedMatch.is_active == True,
-        LoggedMatch.player_mulligans.isnot(None) # Only include matches where mulligans were logged
-    ).group_by(
-        LoggedMatch.player_mulligans
-    ).order_by(
-        # Order logically: Free, Keep 7, then ascending mulligans
-        case(
-            (LoggedMatch.player_mulligans == -1, -1),
-            (LoggedMatch.player_mulligans == 0, 0),
-            else_=LoggedMatch.player_mulligans
-        )
-    )
-
-    results = mulligan_stats_query.all()
+    rows = list(rows)
+    wins = [row.win_count for row in rows]
+    games = [row.game_count for row in rows]
+    estimates = rate_estimates(wins, games, prior_rate=pooled_rate(wins, games))
 
-    # Process results into a clean list of dictionaries
     stats = []
-    for row in results:
+    for row, estimate in zip(rows, estimates):
         win_rate = (row.win_count / row.game_count * 100) if row.game_count > 0 else 0
         stats.append({
-            'label': row.label,
+            'label': mulligan_label(row.player_mulligans),
             'game_count': row.game_count,
             'win_count': row.win_count,
-            'win_rate': round(win_rate, 1)
+            'win_rate': round(win_rate, 1),
+            **estimate_fields(estimate)
         })
 
-    return stats
\ No newline at end of file
+    return stats
@@ -0,0 +1,198 @@
+# backend/services/decks/deck_stats_service.py
+
+from sqlalchemy import func, case, select, update, delete, insert, literal, and_, or_, true
+from backend import db
+from backend.models import LoggedMatch, Deck, DeckStats
+from backend.models.deck_stats import SEAT_NUMBERS
+from backend.models.logged_match import LoggedMatchResult
+from datetime import timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+RESULT_WIN_ID = LoggedMatchResult.WIN.value
+RESULT_DRAW_ID = LoggedMatchResult.DRAW.value
+
+COUNTER_COLUMNS = ["total_matches", "total_wins", "total_draws"] + [
+    f"seat_{seat}_{kind}" for seat in SEAT_NUMBERS for kind in ("matches", "wins")
+]
+STAT_COLUMNS = COUNTER_COLUMNS + ["last_match"]
+
+
+# --- Incremental Maintenance ---
+
+def _counter_deltas(match, sign):
+    """Builds `column = column +/- 1` expressions for every counter a match contributes to."""
+    is_win = match.result == RESULT_WIN_ID
+    deltas = {"total_matches": DeckStats.total_matches + sign}
+    if is_win:
+        deltas["total_wins"] = DeckStats.total_wins + sign
+    elif match.result == RESULT_DRAW_ID:
+        deltas["total_draws"] = DeckStats.total_draws + sign
+
+    if match.player_position in SEAT_NUMBERS:
+        seat_matches = f"seat_{match.player_position}_matches"
+        deltas[seat_matches] = getattr(DeckStats, seat_matches) + sign
+        if is_win:
+            seat_wins = f"seat_{match.player_position}_wins"
+            deltas[seat_wins] = getattr(DeckStats, seat_wins) + sign
+    return deltas
+
+
+def record_match(match):
+    """
+    Adds a newly logged, active match to its deck's rollup row.
+    Runs inside the caller's transaction; the caller commits.
+    """
+    values = _counter_deltas(match, 1)
+    match_ts = literal(match.timestamp, DeckStats.last_match.type)
+    values["last_match"] = case(
+        (or_(DeckStats.last_match.is_(None), DeckStats.last_match < match_ts), match_ts),
+        else_=DeckStats.last_match
+    )
+    result = db.session.execute(
+        update(DeckStats).where(DeckStats.deck_id == match.deck_id).values(**values)
+    )
+    if result.rowcount == 0:
+        # No rollup row yet (first match, or deck created before the table existed),
+        # so it is built from the history without the DELETE a refresh needs.
+        db.session.flush()
+        _insert_rows(_aggregate_stmt().where(Deck.id == match.deck_id))
+
+
+def remove_match(match):
+    """
+    Removes a soft-deleted match from its deck's rollup row.
+    Runs inside the caller's transaction; the caller commits.
+    """
+    db.session.flush() # last_match is recomputed from the remaining active matches
+    values = _counter_deltas(match, -1)
+    values["last_match"] = (
+        select(func.max(LoggedMatch.timestamp))
+        .where(
+            LoggedMatch.deck_id == match.deck_id,
+            LoggedMatch.logger_user_id == DeckStats.user_id,
+            LoggedMatch.is_active == true()
+        )
+        .scalar_subquery()
+    )
+    result = db.session.execute(
+        update(DeckStats).where(DeckStats.deck_id == match.deck_id).values(**values)
+    )
+    if result.rowcount == 0:
+        refresh_deck_stats(match.deck_id)
+
+
+def delete_deck_stats(deck_id):
+    """Drops the rollup row of a soft-deleted deck. Runs inside the caller's transaction."""
+    db.session.execute(delete(DeckStats).where(DeckStats.deck_id == deck_id))
+
+
+# --- Full Recomputation ---
+
+def _aggregate_stmt():
+    """Aggregates active matches per active deck, matching the DeckStats column layout."""
+    lm = LoggedMatch.__table__
+    is_win = lm.c.result == RESULT_WIN_ID
+    columns = [
+        Deck.id.label("deck_id"),
+        Deck.user_id.label("user_id"),
+        func.count(lm.c.id).label("total_matches"),
+        func.sum(case((is_win, 1), else_=0)).label("total_wins"),
+        func.sum(case((lm.c.result == RESULT_DRAW_ID, 1), else_=0)).label("total_draws"),
+    ]
+    for seat in SEAT_NUMBERS:
+        at_seat = lm.c.player_position == seat
+        columns.append(func.sum(case((at_seat, 1), else_=0)).label(f"seat_{seat}_matches"))
+        columns.append(func.sum(case((and_(at_seat, is_win), 1), else_=0)).label(f"seat_{seat}_wins"))
+    columns.append(func.max(lm.c.timestamp).label("last_match"))
+
+    return (
+        select(*columns)
+        .select_from(Deck)
+        .outerjoin(lm, and_(
+            lm.c.deck_id == Deck.id,
+            lm.c.logger_user_id == Deck.user_id, # Only matches logged by the deck's owner
+            lm.c.is_active == true()
+        ))
+        .where(Deck.is_active == true())
+        .group_by(Deck.id, Deck.user_id)
+    )
+
+
+def _insert_rows(aggregate_stmt):
+    db.session.execute(
+        insert(DeckStats).from_select(["deck_id", "user_id"] + STAT_COLUMNS, aggregate_stmt)
+    )
+
+
+def _replace_rows(aggregate_stmt, scope_filter):
+    db.session.execute(delete(DeckStats).where(scope_filter))
+    _insert_rows(aggregate_stmt)
+
+
+def refresh_deck_stats(deck_id):
+    """Recomputes one deck's rollup row from its match history."""
+    _replace_rows(_aggregate_stmt().where(Deck.id == deck_id), DeckStats.deck_id == deck_id)
+
+
+def refresh_deck_stats_bulk(deck_ids):
+    """Recomputes the rollup rows of several decks with one aggregate (e.g. after a bulk import)."""
+    deck_ids = list(deck_ids)
+    if deck_ids:
+        _replace_rows(_aggregate_stmt().where(Deck.id.in_(deck_ids)), DeckStats.deck_id.in_(deck_ids))
+
+
+def rebuild_deck_stats(user_id=None):
+    """
+    Recomputes rollup rows for every active deck (optionally only one user's).
+    Returns the number of decks rebuilt. The caller commits.
+    """
+    stmt = _aggregate_stmt()
+    scope_filter = true()
+    if user_id is not None:
+        stmt = stmt.where(Deck.user_id == user_id)
+        scope_filter = DeckStats.user_id == user_id
+    _replace_rows(stmt, scope_filter)
+    return db.session.scalar(select(func.count()).select_from(DeckStats).where(scope_filter))
+
+
+def verify_deck_stats(user_id=None):
+    """
+    Compares stored rollup rows with a fresh aggregate.
+    Returns a list of {"deck_id", "field", "expected", "actual"} mismatches.
+    """
+    stmt = _aggregate_stmt()
+    stored_stmt = select(DeckStats)
+    if user_id is not None:
+        stmt = stmt.where(Deck.user_id == user_id)
+        stored_stmt = stored_stmt.where(DeckStats.user_id == user_id)
+
+    expected_rows = {row.deck_id: row for row in db.session.execute(stmt)}
+    stored_rows = {row.deck_id: row for row in db.session.scalars(stored_stmt)}
+
+    mismatches = []
+    for deck_id, expected in expected_rows.items():
+        stored = stored_rows.get(deck_id)
+        if stored is None:
+            if expected.total_matches:
+                mismatches.append({"deck_id": deck_id, "field": "row", "expected": "present", "actual": "missing"})
+            continue
+        for field in STAT_COLUMNS:
+            expected_value, actual_value = getattr(expected, field), getattr(stored, field)
+            if field == "last_match":
+                expected_value, actual_value = _naive_utc(expected_value), _naive_utc(actual_value)
+            elif expected_value is None:
+                expected_value = 0
+            if expected_value != actual_value:
+                mismatches.append({"deck_id": deck_id, "field": field, "expected": expected_value, "actual": actual_value})
+
+    for deck_id in stored_rows.keys() - expected_rows.keys():
+        mismatches.append({"deck_id": deck_id, "field": "row", "expected": "absent", "actual": "present"})
+    return mismatches
+
+
+def _naive_utc(dt):
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,120 @@
+# backend/services/email_service.py
+
+from flask import current_app, render_template
+from email.message import EmailMessage
+from email import policy
+from backend import db
+from backend.jobs import jobs, PermanentJobError
+from backend.models import User
+import smtplib
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_RESET_JOB = "password_reset_email"
+# Errors after which a fresh connection is worth one immediate retry
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class MailSender:
+    """
+    Sends EmailMessages over one SMTP connection per worker thread (smtplib
+    connections are not thread-safe), reused across jobs so STARTTLS and LOGIN
+    are paid once per connection instead of once per email. A connection the
+    server has dropped is replaced and the send retried once.
+    `connection_factory` is swapped for a fake SMTP class in tests.
+    """
+
+    def __init__(self, connection_factory=None):
+        self.connection_factory = connection_factory
+        self._local = threading.local()
+
+    def _settings(self):
+        config = current_app.config
+        settings = {
+            "server": config.get("MAIL_SERVER"), "port": config.get("MAIL_PORT"),
+            "username": config.get("MAIL_USERNAME"), "password": config.get("MAIL_PASSWORD"),
+            "use_ssl": config.get("MAIL_USE_SSL", False), "use_tls": config.get("MAIL_USE_TLS", True),
+            "timeout": config.get("MAIL_TIMEOUT", 30),
+        }
+        if not all([settings["server"], settings["port"], settings["username"], settings["password"]]):
+            raise PermanentJobError("Missing mail configuration.")
+        return settings
+
+    def _connect(self, settings):
+        factory = self.connection_factory or (smtplib.SMTP_SSL if settings["use_ssl"] else smtplib.SMTP)
+        logger.debug(f"Opening SMTP connection to {settings['server']}:{settings['port']}")
+        connection = factory(settings["server"], settings["port"], timeout=settings["timeout"])
+        if settings["use_tls"] and not settings["use_ssl"]:
+            connection.starttls()
+        connection.login(settings["username"], settings["password"])
+        return connection
+
+    def send(self, message):
+        settings = self._settings()
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            try:
+                connection.send_message(message)
+                return
+            except RECONNECT_ERRORS as e:
+                logger.info(f"Reopening dropped SMTP connection: {e}")
+                self.close()
+        self._local.connection = self._connect(settings)
+        try:
+            self._local.connection.send_message(message)
+        except RECONNECT_ERRORS:
+            self.close()
+            raise
+
+    def close(self):
+        """Closes this thread's connection, if any."""
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection.quit()
+            except Exception:
+                pass
+
+
+mail_sender = MailSender()
+
+
+# --- Password Reset ---
+
+def build_password_reset_message(user):
+    token = current_app.password_reset_serializer.dumps(user.email, salt='password-reset-salt')
+    frontend_base_url = current_app.config.get('FRONTEND_BASE_URL', 'http://localhost:8080')
+    reset_url = f"{frontend_base_url}/reset-password/{token}"
+
+    # Use user.first_name for personalization if available
+    text_body = render_template('email/reset_password.txt', user=user, reset_url=reset_url)
+    html_body = render_template('email/reset_password.html', user=user, reset_url=reset_url)
+
+    msg = EmailMessage(policy=policy.SMTPUTF8)
+    msg['Subject'] = "Reset Your Password"
+    msg['From'] = current_app.config.get('MAIL_DEFAULT_SENDER') or current_app.config.get('MAIL_USERNAME')
+    msg['To'] = user.email
+    msg.set_content(text_body, subtype='plain')
+    msg.add_alternative(html_body, subtype='html')
+    return msg
+
+
+@jobs.handler(PASSWORD_RESET_JOB)
+def send_password_reset_email(payload):
+    """Job handler: renders and sends the reset link. The token is minted at send time."""
+    user = db.session.get(User, payload["user_id"])
+    if user is None:
+        raise PermanentJobError(f"User {payload['user_id']} no longer exists.")
+    try:
+        mail_sender.send(build_password_reset_message(user))
+    except smtplib.SMTPAuthenticationError as e:
+        raise PermanentJobError(f"SMTP authentication failed: {e}") from e
+    logger.info(f"Password reset email sent to {user.email}")
+
+
+def queue_password_reset_email(user):
+    """Schedules the reset email for `user` and returns the job id (the request does not wait for SMTP)."""
+    return jobs.enqueue(PASSWORD_RESET_JOB, {"user_id": user.id})
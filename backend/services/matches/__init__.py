@@ -1,2 +1,8 @@
 from .match_service import *
-from .match_history_service import *
\ No newline at end of file
+from .match_history_service import *
+from .match_export_service import *
+from .opponent_signature_service import *
+from .match_import_service import *
+from .player_performance_service import *
+from .match_timeseries_service import *
+from .rating_service import *
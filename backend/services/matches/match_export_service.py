@@ -0,0 +1,126 @@
+# backend/services/matches/match_export_service.py
+
+from sqlalchemy import select, true
+from backend import db
+from backend.models import LoggedMatch, Deck, Tag, Commander, OpponentCommanderInMatch
+from backend.models.logged_match import match_tags
+from collections import defaultdict
+from datetime import timezone
+import csv
+import io
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_FIELDS = (
+    "id", "date", "result", "deck_id", "deck_name",
+    "player_position", "player_mulligans", "opponents", "tags", "pod_notes"
+)
+RESULT_LABELS = {0: "Win", 1: "Loss", 2: "Draw"}
+
+# --- Helpers ---
+
+def _isoformat(dt):
+    if not dt: return None
+    aware_dt = dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return aware_dt.isoformat()
+
+def _tags_by_match(match_ids):
+    rows = db.session.execute(
+        select(match_tags.c.match_id, Tag.name)
+        .join(Tag, Tag.id == match_tags.c.tag_id)
+        .where(match_tags.c.match_id.in_(match_ids))
+        .order_by(match_tags.c.match_id, Tag.name)
+    )
+    tags = defaultdict(list)
+    for match_id, name in rows:
+        tags[match_id].append(name)
+    return tags
+
+def _opponents_by_match(match_ids):
+    rows = db.session.execute(
+        select(OpponentCommanderInMatch.logged_match_id, OpponentCommanderInMatch.seat_number, Commander.name)
+        .join(Commander, Commander.id == OpponentCommanderInMatch.commander_id)
+        .where(OpponentCommanderInMatch.logged_match_id.in_(match_ids))
+        .order_by(OpponentCommanderInMatch.logged_match_id, OpponentCommanderInMatch.seat_number, Commander.name)
+    )
+    opponents = defaultdict(lambda: defaultdict(list))
+    for match_id, seat, name in rows:
+        opponents[match_id][seat].append(name)
+    return opponents
+
+# --- Row Stream ---
+
+def iter_match_export_rows(user_id, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Yields one dict per active match of the user, oldest first.
+    Match rows are streamed as Core tuples with yield_per; tags and opponents are
+    fetched per batch with one IN query each, so memory is bounded by batch_size.
+    """
+    stmt = (
+        select(
+            LoggedMatch.id, LoggedMatch.timestamp, LoggedMatch.result, LoggedMatch.deck_id, Deck.name,
+            LoggedMatch.player_position, LoggedMatch.player_mulligans, LoggedMatch.pod_notes
+        )
+        .join(Deck, Deck.id == LoggedMatch.deck_id)
+        .where(LoggedMatch.logger_user_id == user_id, LoggedMatch.is_active == true())
+        .order_by(LoggedMatch.timestamp, LoggedMatch.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = db.session.execute(stmt)
+    for batch in result.partitions():
+        match_ids = [row.id for row in batch]
+        tags = _tags_by_match(match_ids)
+        opponents = _opponents_by_match(match_ids)
+        for row in batch:
+            seats = opponents.get(row.id, {})
+            yield {
+                "id": row.id,
+                "date": _isoformat(row.timestamp),
+                "result": RESULT_LABELS.get(row.result, str(row.result)),
+                "deck_id": row.deck_id,
+                "deck_name": row.name,
+                "player_position": row.player_position,
+                "player_mulligans": row.player_mulligans,
+                "opponents": [{"seat": seat, "commanders": names} for seat, names in sorted(seats.items())],
+                "tags": tags.get(row.id, []),
+                "pod_notes": row.pod_notes,
+            }
+
+# --- Serializers ---
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+def iter_csv(rows, flush_every=EXPORT_BATCH_SIZE):
+    """CSV with a header line. Opponents are flattened as 'seat 2: A / B; seat 3: C', tags as 'a; b'."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    pending = 1
+    for row in rows:
+        flat = dict(row)
+        flat["opponents"] = "; ".join(
+            f"seat {opponent['seat']}: {' / '.join(opponent['commanders'])}" for opponent in row["opponents"]
+        )
+        flat["tags"] = "; ".join(row["tags"])
+        writer.writerow([flat[field] for field in EXPORT_FIELDS])
+        pending += 1
+        if pending >= flush_every:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+def stream_match_export(user_id, export_format):
+    """Returns a chunk generator for the requested format. Raises ValueError for unknown formats."""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{export_format}'.")
+    rows = iter_match_export_rows(user_id)
+    return iter_ndjson(rows) if export_format == "ndjson" else iter_csv(rows)
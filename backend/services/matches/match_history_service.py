@@ -3,17 +3,39 @@
 from sqlalchemy.orm import selectinload
 from backend import db
 from backend.models import LoggedMatch, Deck, DeckType, Tag, OpponentCommanderInMatch, Commander, CommanderDeck
-from sqlalchemy import desc
+from sqlalchemy import desc, tuple_
 from collections import defaultdict
+from datetime import datetime
+import base64
+import binascii
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
-def get_matches_by_user(user_id, deck_id=None, limit=None, offset=None, tag_ids=None):
-    """
-    Fetches a list of matches for a user, including detailed opponent commander info
-    and the user's own deck's commander info.
-    """
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# --- Cursor Helpers ---
+
+def encode_cursor(timestamp, match_id):
+    """Opaque cursor for the (timestamp, id) position of the last match on a page."""
+    payload = json.dumps({"ts": timestamp.isoformat(), "id": match_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor):
+    """Returns (timestamp, match_id) for a cursor. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["ts"]), int(payload["id"])
+    except (binascii.Error, UnicodeError, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor.") from e
+
+# --- Queries ---
+
+def _matches_query(user_id, deck_id=None, tag_ids=None):
+    """Active matches for a user, newest first, with everything the history view renders."""
     stmt = (
         db.session.query(LoggedMatch)
         .options(
@@ -29,7 +51,8 @@ def get_matches_by_user(user_id, deck_id=None, limit=None, offset=None, tag_ids=
         )
         .filter(LoggedMatch.logger_user_id == user_id)
         .filter(LoggedMatch.is_active == True)
-        .order_by(desc(LoggedMatch.timestamp))
+        # id breaks timestamp ties so the order is total (required for keyset pagination)
+        .order_by(desc(LoggedMatch.timestamp), desc(LoggedMatch.id))
     )
 
     if deck_id is not None:
@@ -38,12 +61,47 @@ def get_matches_by_user(user_id, deck_id=None, limit=None, offset=None, tag_ids=
     if tag_ids:
         stmt = stmt.filter(LoggedMatch.tags.any(Tag.id.in_(tag_ids)))
 
+    return stmt
+
+def get_matches_by_user(user_id, deck_id=None, limit=None, offset=None, tag_ids=None):
+    """
+    Fetches a list of matches for a user, including detailed opponent commander info
+    and the user's own deck's commander info.
+    Offset-based; kept for compatibility. Prefer get_matches_page for paging.
+    """
+    stmt = _matches_query(user_id, deck_id, tag_ids)
+
     if limit is not None and limit > 0:
         current_offset = offset if (offset is not None and offset >= 0) else 0
         stmt = stmt.limit(limit).offset(current_offset)
 
-    matches = stmt.all()
+    return _build_match_rows(stmt.all())
+
+def get_matches_page(user_id, deck_id=None, tag_ids=None, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Keyset-paginated match history. Returns (rows, next_cursor); next_cursor is None
+    on the last page. Rows have the same shape as get_matches_by_user.
+    Raises ValueError for a malformed cursor.
+    """
+    page_size = max(1, min(page_size or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+    stmt = _matches_query(user_id, deck_id, tag_ids)
+
+    if cursor:
+        cursor_timestamp, cursor_id = decode_cursor(cursor)
+        stmt = stmt.filter(tuple_(LoggedMatch.timestamp, LoggedMatch.id) < tuple_(cursor_timestamp, cursor_id))
+
+    # One extra row tells us whether another page exists without a COUNT query
+    matches = stmt.limit(page_size + 1).all()
+    next_cursor = None
+    if len(matches) > page_size:
+        matches = matches[:page_size]
+        last = matches[-1]
+        next_cursor = encode_cursor(last.timestamp, last.id)
+
+    return _build_match_rows(matches), next_cursor
 
+def _build_match_rows(matches):
+    """Turns loaded LoggedMatch objects into (match, deck, deck_type, deck_command_zone, opponent_command_zones) tuples."""
     results = []
     for match in matches:
         # --- Process Opponent Commanders ---
@@ -0,0 +1,298 @@
+# backend/services/matches/match_import_service.py
+
+from sqlalchemy import select, insert, true
+from backend import db
+from backend.models import LoggedMatch, Deck, Tag, Commander, OpponentCommanderInMatch, OpponentSeatSignature
+from backend.models.logged_match import match_tags
+from backend.services.decks.deck_stats_service import refresh_deck_stats_bulk
+from backend.services.matches.rating_service import queue_rating_replay
+from backend.services.matches.opponent_signature_service import signature_rows
+from collections import defaultdict
+from datetime import datetime, timezone
+import csv
+import io
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 500
+MAX_IMPORT_ROWS = 5000
+RESULT_VALUES = {"0": 0, "1": 1, "2": 2, "win": 0, "loss": 1, "draw": 2}
+# Role given to the second commander at a seat, by the first pairing flag it has
+ASSOCIATED_ROLE_FLAGS = ("background", "partner", "friends_forever", "doctor_companion", "time_lord_doctor")
+
+
+class MatchImportError(ValueError):
+    """A row (or the whole payload) that cannot be imported."""
+
+
+# --- Payload Parsing ---
+
+def parse_import_payload(content, import_format):
+    """
+    Turns an uploaded document into a list of row dicts.
+    JSON: a list of rows or {"matches": [...]}. CSV: a header line plus one row per match
+    (the same columns /api/matches/export produces).
+    """
+    if import_format == "json":
+        try:
+            data = json.loads(content) if isinstance(content, (str, bytes)) else content
+        except json.JSONDecodeError as e:
+            raise MatchImportError(f"Invalid JSON: {e}") from e
+        rows = data.get("matches") if isinstance(data, dict) else data
+        if not isinstance(rows, list):
+            raise MatchImportError("JSON payload must be a list of matches or {\"matches\": [...]}.")
+        return rows
+    if import_format == "csv":
+        if isinstance(content, bytes):
+            content = content.decode("utf-8-sig")
+        return list(csv.DictReader(io.StringIO(content)))
+    raise MatchImportError(f"Unsupported import format '{import_format}'.")
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+def _parse_int(value, field):
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        raise MatchImportError(f"'{field}' must be an integer.")
+
+def _parse_result(value):
+    if _blank(value):
+        raise MatchImportError("Missing 'result'.")
+    result = RESULT_VALUES.get(str(value).strip().lower())
+    if result is None:
+        raise MatchImportError(f"Invalid result '{value}'. Use win/loss/draw or 0/1/2.")
+    return result
+
+def _parse_timestamp(value):
+    if _blank(value):
+        return datetime.now(timezone.utc)
+    try:
+        timestamp = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise MatchImportError(f"Invalid date '{value}'. Use ISO 8601.")
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+
+def _parse_opponents(value):
+    """
+    Returns {seat: [commander name or scryfall id, ...]} from either
+    {"2": ["A", "B"]}, [{"seat": 2, "commanders": ["A", "B"]}] or "seat 2: A / B; seat 3: C".
+    """
+    if _blank(value):
+        return {}
+    if isinstance(value, str):
+        opponents = {}
+        for part in value.split(";"):
+            if not part.strip():
+                continue
+            seat_label, _, names = part.partition(":")
+            seat = _parse_int(seat_label.strip().lower().removeprefix("seat"), "opponents seat")
+            opponents[seat] = [name.strip() for name in names.split(" / ") if name.strip()]
+        return opponents
+    if isinstance(value, dict):
+        return {_parse_int(seat, "opponents seat"): _commander_keys(names) for seat, names in value.items()}
+    if isinstance(value, list):
+        opponents = {}
+        for entry in value:
+            if not isinstance(entry, dict):
+                raise MatchImportError("Each 'opponents' entry must be an object with 'seat' and 'commanders'.")
+            opponents[_parse_int(entry.get("seat"), "opponents seat")] = _commander_keys(entry.get("commanders") or [])
+        return opponents
+    raise MatchImportError("Invalid 'opponents' format.")
+
+def _commander_keys(names):
+    """A seat's commander names or scryfall ids (a list of strings)."""
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        raise MatchImportError("Opponent commanders must be a list of names or scryfall ids.")
+    return names
+
+def _parse_tags(value):
+    if _blank(value):
+        return []
+    if isinstance(value, str):
+        value = value.split(";")
+    if not isinstance(value, list):
+        raise MatchImportError("'tags' must be a list or a ';'-separated string.")
+    names = []
+    for tag in value:
+        if isinstance(tag, str) and tag.strip() and tag.strip() not in names:
+            names.append(tag.strip())
+    return names
+
+
+# --- In-Memory Lookups ---
+
+class ImportLookups:
+    """Decks, commanders and tags needed to resolve rows, each loaded with one query."""
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        decks = db.session.execute(
+            select(Deck.id, Deck.name).where(Deck.user_id == user_id, Deck.is_active == true())
+        ).all()
+        self.deck_ids = {deck.id for deck in decks}
+        self.decks_by_name = defaultdict(list)
+        for deck in decks:
+            self.decks_by_name[deck.name.strip().lower()].append(deck.id)
+
+        self.commanders = {}
+        self.commanders_by_key = {}
+        columns = [Commander.id, Commander.name, Commander.scryfall_id] + [getattr(Commander, flag) for flag in ASSOCIATED_ROLE_FLAGS]
+        for commander in db.session.execute(select(*columns)):
+            self.commanders[commander.id] = commander
+            self.commanders_by_key.setdefault(commander.name.lower(), commander)
+            self.commanders_by_key[commander.scryfall_id.lower()] = commander
+
+        self.tags_by_name = {
+            tag.name: tag.id for tag in db.session.execute(select(Tag.id, Tag.name).where(Tag.user_id == user_id))
+        }
+
+    def deck_id(self, row):
+        deck_id = row.get("deck_id")
+        if not _blank(deck_id):
+            deck_id = _parse_int(deck_id, "deck_id")
+            if deck_id not in self.deck_ids:
+                raise MatchImportError(f"Deck {deck_id} not found or not owned by user.")
+            return deck_id
+        deck_name = row.get("deck_name", row.get("deck"))
+        if _blank(deck_name):
+            raise MatchImportError("Missing 'deck_id' or 'deck_name'.")
+        matches = self.decks_by_name.get(str(deck_name).strip().lower(), [])
+        if not matches:
+            raise MatchImportError(f"Deck '{deck_name}' not found.")
+        if len(matches) > 1:
+            raise MatchImportError(f"Deck name '{deck_name}' is ambiguous; use deck_id.")
+        return matches[0]
+
+    def commander(self, key):
+        commander = self.commanders_by_key.get(str(key).strip().lower())
+        if commander is None:
+            raise MatchImportError(f"Commander '{key}' not found.")
+        return commander
+
+
+def _associated_role(commander):
+    for flag in ASSOCIATED_ROLE_FLAGS:
+        if getattr(commander, flag):
+            return flag
+    return "partner"
+
+
+def _parse_row(row, lookups):
+    """Validates one input row and returns the values to insert."""
+    if not isinstance(row, dict):
+        raise MatchImportError("Row must be an object.")
+    player_position = _parse_int(row.get("player_position", row.get("seat")), "player_position")
+    if not (1 <= player_position <= 4):
+        raise MatchImportError("Invalid player position.")
+
+    player_mulligans = row.get("player_mulligans", row.get("mulligans"))
+    player_mulligans = None if _blank(player_mulligans) else _parse_int(player_mulligans, "player_mulligans")
+    if player_mulligans is not None and player_mulligans < -1:
+        raise MatchImportError("Invalid value for player mulligans.")
+
+    opponents = []
+    for seat, keys in sorted(_parse_opponents(row.get("opponents")).items()):
+        if not (1 <= seat <= 4) or seat == player_position:
+            raise MatchImportError(f"Invalid opponent seat {seat}.")
+        for index, key in enumerate(keys):
+            commander = lookups.commander(key)
+            role = "primary" if index == 0 else _associated_role(commander)
+            opponents.append({"seat_number": seat, "commander_id": commander.id, "role": role})
+
+    pod_notes = row.get("pod_notes")
+    return {
+        "match": {
+            "deck_id": lookups.deck_id(row),
+            "result": _parse_result(row.get("result")),
+            "player_position": player_position,
+            "player_mulligans": player_mulligans,
+            "timestamp": _parse_timestamp(row.get("date", row.get("timestamp"))),
+            "pod_notes": None if _blank(pod_notes) else pod_notes,
+            "logger_user_id": lookups.user_id,
+            "is_active": True,
+        },
+        "opponents": opponents,
+        "tags": _parse_tags(row.get("tags")),
+    }
+
+
+# --- Chunked Insert ---
+
+def _insert_chunk(parsed_rows, lookups):
+    """Inserts one chunk of validated rows with one statement per table. Caller commits."""
+    new_tag_names = sorted({name for row in parsed_rows for name in row["tags"]} - lookups.tags_by_name.keys())
+    if new_tag_names:
+        created = db.session.execute(
+            insert(Tag).returning(Tag.id, Tag.name),
+            [{"user_id": lookups.user_id, "name": name} for name in new_tag_names]
+        )
+        lookups.tags_by_name.update({tag.name: tag.id for tag in created})
+
+    match_ids = db.session.scalars(
+        insert(LoggedMatch).returning(LoggedMatch.id, sort_by_parameter_order=True),
+        [row["match"] for row in parsed_rows]
+    ).all()
+
+    opponent_rows, signature_values, tag_rows = [], [], []
+    for match_id, row in zip(match_ids, parsed_rows):
+        names_by_seat = defaultdict(list)
+        for opponent in row["opponents"]:
+            opponent_rows.append({"logged_match_id": match_id, **opponent})
+            names_by_seat[opponent["seat_number"]].append(lookups.commanders[opponent["commander_id"]].name)
+        signature_values.extend(signature_rows(match_id, lookups.user_id, names_by_seat))
+        tag_rows.extend({"match_id": match_id, "tag_id": lookups.tags_by_name[name]} for name in row["tags"])
+
+    if opponent_rows:
+        db.session.execute(insert(OpponentCommanderInMatch), opponent_rows)
+    if signature_values:
+        db.session.execute(insert(OpponentSeatSignature), signature_values)
+    if tag_rows:
+        db.session.execute(insert(match_tags), tag_rows)
+    refresh_deck_stats_bulk({row["match"]["deck_id"] for row in parsed_rows})
+
+
+def import_matches(user_id, rows, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Validates and inserts match rows for a user, committing each chunk separately.
+    Returns {"imported", "failed", "errors": [{"row", "error"}]} where "row" is 1-based.
+    Invalid rows are reported and skipped; a chunk that fails to insert is rolled
+    back and all of its rows are reported. A replay of the user's ratings is queued
+    once at the end, since imported matches can predate existing ones.
+    """
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise MatchImportError(f"Too many rows ({len(rows)}). The limit is {MAX_IMPORT_ROWS} per import.")
+
+    lookups = ImportLookups(user_id)
+    errors, valid = [], []
+    for index, row in enumerate(rows, start=1):
+        try:
+            valid.append((index, _parse_row(row, lookups)))
+        except MatchImportError as e:
+            errors.append({"row": index, "error": str(e)})
+
+    imported = 0
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        try:
+            _insert_chunk([parsed for _, parsed in chunk], lookups)
+            db.session.commit()
+            imported += len(chunk)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Bulk import chunk failed for user {user_id}: {e}", exc_info=True)
+            # Tags created in the failed chunk were rolled back too
+            lookups.tags_by_name = {
+                tag.name: tag.id for tag in db.session.execute(select(Tag.id, Tag.name).where(Tag.user_id == user_id))
+            }
+            errors.extend({"row": index, "error": "Database error while inserting this chunk."} for index, _ in chunk)
+
+    if imported:
+        queue_rating_replay(user_id)
+
+    errors.sort(key=lambda error: error["row"])
+    logger.info(f"Bulk import for user {user_id}: {imported} imported, {len(errors)} failed.")
+    return {"imported": imported, "failed": len(errors), "errors": errors}
@@ -0,0 +1,194 @@
+# backend/services/matches/match_timeseries_service.py
+
+from sqlalchemy import select, extract, cast, true, BigInteger
+from backend import db
+from backend.models import LoggedMatch, Deck
+from datetime import datetime, timezone
+import logging
+
+try:
+    import numpy as np  # Optional dependency; the pure-Python path below is the fallback
+except ImportError:  # pragma: no cover - exercised only where NumPy is absent
+    np = None
+
+logger = logging.getLogger(__name__)
+
+RESULT_WIN_ID = 0
+RESULT_LOSS_ID = 1
+DEFAULT_WINDOW = 10
+MAX_WINDOW = 200
+SECONDS_PER_DAY = 86400
+# 1970-01-01 was a Thursday; shifting by three days makes weeks start on Monday
+EPOCH_WEEKDAY_OFFSET = 3
+
+
+class TimeSeriesError(ValueError):
+    """Invalid time series parameters (reported to the client as a 400)."""
+
+
+# --- Data Access ---
+
+def _series_stmt(user_id, deck_id=None):
+    """(epoch seconds, result) of the user's active matches, oldest first."""
+    stmt = (
+        select(cast(extract("epoch", LoggedMatch.timestamp), BigInteger).label("epoch"), LoggedMatch.result)
+        .where(LoggedMatch.logger_user_id == user_id, LoggedMatch.is_active == true())
+        .order_by(LoggedMatch.timestamp, LoggedMatch.id)
+    )
+    if deck_id is not None:
+        stmt = stmt.where(LoggedMatch.deck_id == deck_id)
+    return stmt
+
+
+def _fetch_columns(stmt):
+    """Both columns as parallel tuples."""
+    # Core execution skips the ORM's per-row processing, most of the fetch cost on long histories
+    rows = db.session.connection().execute(stmt).all()
+    if not rows:
+        return (), ()
+    epochs, results = zip(*rows)
+    return epochs, results
+
+
+def parse_window(value):
+    """The rolling window from a query string value (None -> DEFAULT_WINDOW)."""
+    if value is None or value == "":
+        return DEFAULT_WINDOW
+    try:
+        window = int(value)
+    except (TypeError, ValueError):
+        raise TimeSeriesError("'window' must be an integer.")
+    if not 1 <= window <= MAX_WINDOW:
+        raise TimeSeriesError(f"'window' must be between 1 and {MAX_WINDOW}.")
+    return window
+
+
+# --- Computation ---
+
+def _week_start(epoch):
+    days = epoch // SECONDS_PER_DAY
+    monday = days - (days + EPOCH_WEEKDAY_OFFSET) % 7
+    return datetime.fromtimestamp(monday * SECONDS_PER_DAY, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _compute_numpy(epochs, results, window):
+    epochs = np.asarray(epochs, dtype=np.int64)
+    results = np.asarray(results, dtype=np.int8)
+    wins = (results == RESULT_WIN_ID).astype(np.int64)
+    games = np.arange(1, len(wins) + 1)
+
+    # Prefix sums give every window total as a difference of two entries
+    cumulative = np.concatenate(([0], np.cumsum(wins)))
+    window_start = np.maximum(games - window, 0)
+    rolling = (cumulative[games] - cumulative[window_start]) / (games - window_start) * 100
+
+    # Run-length encode the outcomes; draws break both kinds of streak
+    boundaries = np.flatnonzero(np.diff(results)) + 1
+    starts = np.concatenate(([0], boundaries))
+    lengths = np.diff(np.concatenate((starts, [len(results)])))
+    run_outcomes = results[starts]
+
+    # Weeks as Monday-anchored day numbers; rows are ordered, so weeks are contiguous
+    days = epochs // SECONDS_PER_DAY
+    mondays = days - (days + EPOCH_WEEKDAY_OFFSET) % 7
+    week_starts = np.concatenate(([0], np.flatnonzero(np.diff(mondays)) + 1))
+    week_games = np.diff(np.concatenate((week_starts, [len(mondays)])))
+    week_wins = np.add.reduceat(wins, week_starts)
+    week_labels = np.datetime_as_string(mondays[week_starts].astype("datetime64[D]"), unit="D")
+
+    def longest(outcome):
+        matching = lengths[run_outcomes == outcome]
+        return int(matching.max()) if matching.size else 0
+
+    return {
+        "timestamps": np.datetime_as_string(epochs.astype("datetime64[s]"), unit="s", timezone="UTC").tolist(),
+        "results": results.tolist(),
+        "rolling_win_rate": np.round(rolling, 1).tolist(),
+        "cumulative_win_rate": np.round(cumulative[1:] / games * 100, 1).tolist(),
+        "longest_win_streak": longest(RESULT_WIN_ID),
+        "longest_loss_streak": longest(RESULT_LOSS_ID),
+        "current_streak": {"result": int(run_outcomes[-1]), "length": int(lengths[-1])},
+        "weekly": [
+            {"week": label, "matches": int(count), "wins": int(won), "win_rate": round(int(won) / int(count) * 100, 1)}
+            for label, count, won in zip(week_labels.tolist(), week_games, week_wins)
+        ],
+    }
+
+
+def _compute_python(epochs, results, window):
+    rolling, cumulative, weekly = [], [], []
+    wins_so_far = wins_in_window = 0
+    longest = {RESULT_WIN_ID: 0, RESULT_LOSS_ID: 0}
+    run_result, run_length = None, 0
+
+    for index, (epoch, result) in enumerate(zip(epochs, results)):
+        win = 1 if result == RESULT_WIN_ID else 0
+        wins_so_far += win
+        cumulative.append(round(wins_so_far / (index + 1) * 100, 1))
+        wins_in_window += win
+        if index >= window and results[index - window] == RESULT_WIN_ID:
+            wins_in_window -= 1
+        rolling.append(round(wins_in_window / min(index + 1, window) * 100, 1))
+
+        run_length = run_length + 1 if result == run_result else 1
+        run_result = result
+        if result in longest:
+            longest[result] = max(longest[result], run_length)
+
+        week = _week_start(epoch)
+        if not weekly or weekly[-1]["week"] != week:
+            weekly.append({"week": week, "matches": 0, "wins": 0})
+        weekly[-1]["matches"] += 1
+        weekly[-1]["wins"] += win
+
+    for bucket in weekly:
+        bucket["win_rate"] = round(bucket["wins"] / bucket["matches"] * 100, 1)
+
+    return {
+        "timestamps": [
+            datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ") for epoch in epochs
+        ],
+        "results": list(results),
+        "rolling_win_rate": rolling,
+        "cumulative_win_rate": cumulative,
+        "longest_win_streak": longest[RESULT_WIN_ID],
+        "longest_loss_streak": longest[RESULT_LOSS_ID],
+        "current_streak": {"result": run_result, "length": run_length},
+        "weekly": weekly,
+    }
+
+
+def compute_timeseries(epochs, results, window=DEFAULT_WINDOW, use_numpy=None):
+    """
+    Form-over-time series from parallel, time-ordered (epoch seconds, result) columns:
+    rolling `window`-game and cumulative win rates per match (windows are partial
+    until `window` games exist), longest win/loss streaks, the current streak and
+    UTC weekly buckets starting on Monday. Vectorized with NumPy when available.
+    """
+    if not epochs:
+        return {
+            "window": window, "total_matches": 0, "timestamps": [], "results": [],
+            "rolling_win_rate": [], "cumulative_win_rate": [], "longest_win_streak": 0,
+            "longest_loss_streak": 0, "current_streak": None, "weekly": []
+        }
+    if use_numpy is None:
+        use_numpy = np is not None
+    series = _compute_numpy(epochs, results, window) if use_numpy else _compute_python(epochs, results, window)
+    return {"window": window, "total_matches": len(epochs), **series}
+
+
+# --- Service Functions ---
+
+def get_deck_timeseries(deck_id, user_id, window=DEFAULT_WINDOW):
+    """Time series for one of the user's active decks, or None if it is not theirs."""
+    owned = db.session.scalar(
+        select(Deck.id).where(Deck.id == deck_id, Deck.user_id == user_id, Deck.is_active == true())
+    )
+    if owned is None:
+        return None
+    return compute_timeseries(*_fetch_columns(_series_stmt(user_id, deck_id)), window=window)
+
+
+def get_player_timeseries(user_id, window=DEFAULT_WINDOW):
+    """Time series across all of the user's active matches."""
+    return compute_timeseries(*_fetch_columns(_series_stmt(user_id)), window=window)
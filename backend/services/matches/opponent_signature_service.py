@@ -0,0 +1,108 @@
+# backend/services/matches/opponent_signature_service.py
+
+from sqlalchemy import select, delete, insert
+from backend import db
+from backend.models import LoggedMatch, Commander, OpponentCommanderInMatch, OpponentSeatSignature
+from collections import defaultdict
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_SEPARATOR = " / "
+REBUILD_BATCH_SIZE = 1000
+
+# --- Signature Helpers ---
+
+def build_signature(commander_names):
+    """Canonical seat signature: commander names sorted and joined with ' / '."""
+    return SIGNATURE_SEPARATOR.join(sorted(commander_names))
+
+def signature_hash(signature):
+    """Stable 16-hex-digit digest of a signature (independent of process and dialect)."""
+    return hashlib.sha1(signature.encode("utf-8")).hexdigest()[:16]
+
+def signature_rows(logged_match_id, logger_user_id, names_by_seat):
+    """opponent_seat_signatures row dicts for one match (seats without names are skipped)."""
+    values = []
+    for seat, names in sorted(names_by_seat.items()):
+        if not names:
+            continue
+        signature = build_signature(names)
+        values.append({
+            "logged_match_id": logged_match_id,
+            "logger_user_id": logger_user_id,
+            "seat_number": seat,
+            "signature": signature,
+            "signature_hash": signature_hash(signature),
+        })
+    return values
+
+# --- Write Path ---
+
+def record_opponent_signatures(match, names_by_seat):
+    """
+    Inserts one OpponentSeatSignature per opponent seat of a flushed match in a
+    single executemany statement.
+    `names_by_seat` maps seat number -> list of commander names at that seat.
+    Returns the row dicts written. Does not commit; runs in the caller's transaction.
+    """
+    values = signature_rows(match.id, match.logger_user_id, names_by_seat)
+    if values:
+        db.session.execute(insert(OpponentSeatSignature), values)
+    return values
+
+# --- Rebuild ---
+
+def users_who_logged_commanders(commander_ids):
+    """Ids of the users with a logged match against any of these commanders."""
+    if not commander_ids:
+        return []
+    return db.session.scalars(
+        select(LoggedMatch.logger_user_id).distinct()
+        .join(OpponentCommanderInMatch, OpponentCommanderInMatch.logged_match_id == LoggedMatch.id)
+        .where(OpponentCommanderInMatch.commander_id.in_(list(commander_ids)))
+        .order_by(LoggedMatch.logger_user_id)
+    ).all()
+
+def rebuild_opponent_signatures(user_id=None):
+    """
+    Recomputes signatures from opponent_commanders_in_match (e.g. after commander
+    names change). Scoped to one user when user_id is given. Returns rows written.
+    Does not commit.
+    """
+    delete_stmt = delete(OpponentSeatSignature)
+    source = (
+        select(
+            OpponentCommanderInMatch.logged_match_id, LoggedMatch.logger_user_id,
+            OpponentCommanderInMatch.seat_number, Commander.name
+        )
+        .join(LoggedMatch, LoggedMatch.id == OpponentCommanderInMatch.logged_match_id)
+        .join(Commander, Commander.id == OpponentCommanderInMatch.commander_id)
+        .order_by(OpponentCommanderInMatch.logged_match_id)
+    )
+    if user_id is not None:
+        delete_stmt = delete_stmt.where(OpponentSeatSignature.logger_user_id == user_id)
+        source = source.where(LoggedMatch.logger_user_id == user_id)
+    db.session.execute(delete_stmt)
+
+    written, pending = 0, []
+    current_match, current_user, names_by_seat = None, None, defaultdict(list)
+    for match_id, logger_user_id, seat, name in db.session.execute(source.execution_options(yield_per=REBUILD_BATCH_SIZE)):
+        if match_id != current_match:
+            if current_match is not None:
+                pending.extend(signature_rows(current_match, current_user, names_by_seat))
+            current_match, current_user, names_by_seat = match_id, logger_user_id, defaultdict(list)
+            if len(pending) >= REBUILD_BATCH_SIZE:
+                db.session.execute(insert(OpponentSeatSignature), pending)
+                written += len(pending)
+                pending = []
+        names_by_seat[seat].append(name)
+    if current_match is not None:
+        pending.extend(signature_rows(current_match, current_user, names_by_seat))
+    if pending:
+        db.session.execute(insert(OpponentSeatSignature), pending)
+        written += len(pending)
+
+    logger.info(f"Rebuilt {written} opponent seat signatures ({'user ' + str(user_id) if user_id else 'all users'}).")
+    return written
@@ -0,0 +1,238 @@
+# backend/services/matches/player_performance_service.py
+
+from sqlalchemy import select, func, case, literal, cast, null, union_all, tuple_, true, Integer, String, Text
+from backend import db
+from backend.models import LoggedMatch, Deck, OpponentSeatSignature
+from backend.models.deck_stats import SEAT_NUMBERS
+from backend.utils.rate_stats import rate_estimates, estimate_fields, pooled_rate
+from collections import defaultdict
+import logging
+
+logger = logging.getLogger(__name__)
+
+RESULT_WIN_ID = 0
+MIN_MATCHES_FOR_WINNINGEST = 5
+METAGAME_LIMIT = 10
+
+# Row kinds produced by the summary statements
+KIND_TOTAL = "total"
+KIND_SEAT = "seat"
+KIND_DECK = "deck"
+KIND_MONTH = "month"
+KIND_CELL = "cell"
+KIND_METAGAME = "metagame"
+
+
+# --- Statement Builders ---
+
+def _row(kind, *, seat=None, deck_id=None, label=None, month=None, games=None, wins=None):
+    """Uniform column layout shared by every branch of the summary UNION ALL."""
+    def typed(value, type_):
+        return cast(null(), type_) if value is None else value
+    return [
+        literal(kind, String).label("kind"),
+        typed(seat, Integer).label("seat"),
+        typed(deck_id, Integer).label("deck_id"),
+        typed(label, Text).label("label"),
+        typed(month, Text).label("month"),
+        typed(games, Integer).label("games"),
+        typed(wins, Integer).label("wins"),
+    ]
+
+
+def _metagame_branch(user_id, matches, *match_filters):
+    """
+    The user's most-faced opponent signatures, ranked with a window function over
+    the grouped counts. `matches` is the active-matches CTE, or the table narrowed
+    by `match_filters`.
+    """
+    ranked = (
+        select(
+            OpponentSeatSignature.signature,
+            func.count().label("games"),
+            func.row_number().over(order_by=(func.count().desc(), OpponentSeatSignature.signature)).label("rank")
+        )
+        .join(matches, matches.c.id == OpponentSeatSignature.logged_match_id)
+        .where(OpponentSeatSignature.logger_user_id == user_id, *match_filters)
+        .group_by(OpponentSeatSignature.signature_hash, OpponentSeatSignature.signature)
+        .subquery("ranked_signatures")
+    )
+    return select(*_row(KIND_METAGAME, label=ranked.c.signature, games=ranked.c.games)).where(ranked.c.rank <= METAGAME_LIMIT)
+
+
+def _grouped_summary_stmt(user_id):
+    """
+    One scan of the user's active matches (a CTE) aggregated by GROUPING SETS into
+    totals, seats, decks and UTC months, plus the metagame ranking over the same CTE.
+    PostgreSQL only.
+    """
+    month = func.to_char(func.date_trunc("month", func.timezone("UTC", LoggedMatch.timestamp)), "YYYY-MM")
+    active = (
+        select(
+            LoggedMatch.id, LoggedMatch.deck_id, Deck.name.label("deck_name"),
+            LoggedMatch.result, LoggedMatch.player_position, month.label("month")
+        )
+        .join(Deck, Deck.id == LoggedMatch.deck_id)
+        .where(LoggedMatch.logger_user_id == user_id, LoggedMatch.is_active == true())
+        .cte("active_matches")
+    )
+    kind = case(
+        (func.grouping(active.c.player_position) == 0, KIND_SEAT),
+        (func.grouping(active.c.deck_id) == 0, KIND_DECK),
+        (func.grouping(active.c.month) == 0, KIND_MONTH),
+        else_=KIND_TOTAL
+    )
+    grouped = (
+        select(
+            kind.label("kind"),
+            active.c.player_position.label("seat"),
+            active.c.deck_id.label("deck_id"),
+            active.c.deck_name.label("label"),
+            active.c.month.label("month"),
+            func.count().label("games"),
+            func.sum(case((active.c.result == RESULT_WIN_ID, 1), else_=0)).label("wins"),
+        )
+        .group_by(func.grouping_sets(
+            tuple_(),
+            tuple_(active.c.player_position),
+            tuple_(active.c.deck_id, active.c.deck_name),
+            tuple_(active.c.month)
+        ))
+    )
+    return union_all(grouped, _metagame_branch(user_id, active))
+
+
+def _cell_summary_stmt(user_id):
+    """
+    Fallback for databases without GROUPING SETS (SQLite): one scan grouped by the
+    finest cell (deck, seat, UTC month) for Python to fold into the coarser
+    aggregates, plus the metagame ranking, in one statement.
+    """
+    # SQLite stores the timestamps as naive UTC strings
+    month = func.strftime("%Y-%m", LoggedMatch.timestamp)
+    cells = (
+        select(
+            LoggedMatch.deck_id, LoggedMatch.player_position, month.label("month"),
+            func.count().label("games"), func.sum(case((LoggedMatch.result == RESULT_WIN_ID, 1), else_=0)).label("wins")
+        )
+        .where(LoggedMatch.logger_user_id == user_id, LoggedMatch.is_active == true())
+        .group_by(LoggedMatch.deck_id, LoggedMatch.player_position, month)
+        .subquery("cells")
+    )
+    # Deck names are joined to the grouped cells, not to every match
+    named_cells = select(*_row(
+        KIND_CELL, seat=cells.c.player_position, deck_id=cells.c.deck_id, label=Deck.name,
+        month=cells.c.month, games=cells.c.games, wins=cells.c.wins
+    )).join(Deck, Deck.id == cells.c.deck_id)
+    return union_all(named_cells, _metagame_branch(user_id, LoggedMatch.__table__, LoggedMatch.is_active == true()))
+
+
+# --- Aggregation ---
+
+class _Counter:
+    __slots__ = ("label", "games", "wins")
+
+    def __init__(self, label=None):
+        self.label = label
+        self.games = 0
+        self.wins = 0
+
+    def add(self, games, wins):
+        self.games += games or 0
+        self.wins += wins or 0
+
+
+def _win_rate(wins, games):
+    return wins / games * 100 if games > 0 else 0
+
+
+def _collect(rows):
+    """Folds summary rows of either statement into counters and the metagame list."""
+    total = _Counter()
+    seats = defaultdict(_Counter)
+    decks = {}
+    months = defaultdict(_Counter)
+    metagame = []
+
+    for row in rows:
+        if row.kind == KIND_CELL:
+            total.add(row.games, row.wins)
+            seats[row.seat].add(row.games, row.wins)
+            decks.setdefault(row.deck_id, _Counter(row.label)).add(row.games, row.wins)
+            months[row.month].add(row.games, row.wins)
+        elif row.kind == KIND_TOTAL:
+            total.add(row.games, row.wins)
+        elif row.kind == KIND_SEAT:
+            seats[row.seat].add(row.games, row.wins)
+        elif row.kind == KIND_DECK:
+            decks.setdefault(row.deck_id, _Counter(row.label)).add(row.games, row.wins)
+        elif row.kind == KIND_MONTH:
+            months[row.month].add(row.games, row.wins)
+        elif row.kind == KIND_METAGAME:
+            metagame.append((row.label, row.games))
+    return total, seats, decks, months, metagame
+
+
+def _build_summary(total, seats, decks, months, metagame):
+    if total.games == 0:
+        return {
+            "has_data": False, "overall_win_rate": 0, "total_matches": 0,
+            "winningest_deck": "N/A", "most_played_deck": "N/A",
+            "turn_order_stats": {}, "personal_metagame": [], "monthly_trend": []
+        }
+
+    seat_counters = [seats.get(seat, _Counter()) for seat in SEAT_NUMBERS]
+    seat_wins = [counter.wins for counter in seat_counters]
+    seat_games = [counter.games for counter in seat_counters]
+    seat_estimates = rate_estimates(seat_wins, seat_games, prior_rate=pooled_rate(seat_wins, seat_games))
+    turn_order_stats = {
+        str(seat): {
+            "matches": counter.games, "wins": counter.wins, "win_rate": round(_win_rate(counter.wins, counter.games), 1),
+            **estimate_fields(estimate)
+        }
+        for seat, counter, estimate in zip(SEAT_NUMBERS, seat_counters, seat_estimates)
+    }
+
+    # Ties go to the older deck (lower id) so the headline does not flicker between requests.
+    # The winningest deck is the one with the best Wilson lower bound, not the best raw rate.
+    most_played = min(decks.items(), key=lambda item: (-item[1].games, item[0]), default=None)
+    eligible = [(deck_id, counter) for deck_id, counter in decks.items() if counter.games >= MIN_MATCHES_FOR_WINNINGEST]
+    eligible_estimates = rate_estimates([counter.wins for _, counter in eligible], [counter.games for _, counter in eligible])
+    winningest = min(
+        zip(eligible, eligible_estimates), key=lambda item: (-item[1].lower, item[0][0]), default=(None, None)
+    )[0]
+
+    return {
+        "has_data": True,
+        "overall_win_rate": round(_win_rate(total.wins, total.games), 1),
+        "total_matches": total.games,
+        "winningest_deck": (
+            f"{winningest[1].label} ({_win_rate(winningest[1].wins, winningest[1].games):.1f}%)" if winningest else "N/A"
+        ),
+        "most_played_deck": f"{most_played[1].label} ({most_played[1].games} plays)" if most_played else "N/A",
+        "turn_order_stats": turn_order_stats,
+        "personal_metagame": [
+            {"name": name, "count": count} for name, count in sorted(metagame, key=lambda item: (-item[1], item[0]))
+        ],
+        "monthly_trend": [
+            {"month": month, "matches": counter.games, "wins": counter.wins,
+             "win_rate": round(_win_rate(counter.wins, counter.games), 1)}
+            for month, counter in sorted(months.items())
+        ],
+    }
+
+
+# --- Service Function ---
+
+def get_player_performance_summary(user_id):
+    """
+    The /api/performance-summary payload (overall, turn order, most played and
+    winningest deck, personal metagame, monthly trend) from a single statement:
+    GROUPING SETS over one CTE scan on PostgreSQL, per-cell groups folded in
+    Python elsewhere.
+    """
+    if db.engine.dialect.name == "postgresql":
+        stmt = _grouped_summary_stmt(user_id)
+    else:
+        stmt = _cell_summary_stmt(user_id)
+    return _build_summary(*_collect(db.session.execute(stmt)))
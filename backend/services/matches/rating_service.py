@@ -0,0 +1,296 @@
+# backend/services/matches/rating_service.py
+
+from sqlalchemy import select, insert, update, delete, union_all, or_, true
+from backend import db
+from backend.cache import bump_user_data_version
+from backend.jobs import jobs
+from backend.models import LoggedMatch, Deck, Rating, OpponentSeatSignature, User
+from backend.models.deck_stats import SEAT_NUMBERS
+from backend.models.logged_match import LoggedMatchResult
+from collections import namedtuple, defaultdict
+import logging
+
+logger = logging.getLogger(__name__)
+
+RESULT_WIN_ID = LoggedMatchResult.WIN.value
+RESULT_DRAW_ID = LoggedMatchResult.DRAW.value
+
+INITIAL_RATING = 1500.0
+INITIAL_DEVIATION = 350.0
+MIN_DEVIATION = 60.0
+DEVIATION_DECAY = 0.9 # Per rated pod, until MIN_DEVIATION
+MAX_STEP = 64.0 # Step size at INITIAL_DEVIATION; it scales with the deviation
+PROVISIONAL_DEVIATION = 150.0
+POD_SIZE = len(SEAT_NUMBERS)
+TOP_OPPONENTS_LIMIT = 10
+REPLAY_BATCH_SIZE = 1000
+REPLAY_RATINGS_JOB = "replay_ratings"
+
+RatingState = namedtuple("RatingState", "rating deviation games")
+NEW_RATING = RatingState(INITIAL_RATING, INITIAL_DEVIATION, 0)
+
+
+# --- Rating Math ---
+
+def _strength(rating):
+    return 10 ** (rating / 400)
+
+
+def pod_surprises(deck, opponents, result):
+    """
+    Actual minus expected score for the deck and each opponent seat of one pod.
+    Expectations follow the multiplayer (Luce) form of Elo: a seat's chance to win
+    is its strength over the pod's total, so an average deck expects 1/POD_SIZE.
+    Seats without a logged opponent count as unrated, average players. On a loss
+    the win is credited to the other seats in proportion to their strength; a draw
+    splits it evenly.
+    """
+    field = max(POD_SIZE - 1 - len(opponents), 0)
+    strengths = [_strength(deck.rating)] + [_strength(opponent.rating) for opponent in opponents]
+    total = sum(strengths) + field * _strength(INITIAL_RATING)
+
+    if result == RESULT_WIN_ID:
+        scores = [1.0] + [0.0] * len(opponents)
+    elif result == RESULT_DRAW_ID:
+        scores = [1.0 / (1 + len(opponents) + field)] * len(strengths)
+    else:
+        others = total - strengths[0]
+        scores = [0.0] + [strength / others for strength in strengths[1:]]
+    return [score - strength / total for score, strength in zip(scores, strengths)]
+
+
+def _step(state, surprise):
+    """Moves a rating by its surprise, scaled by how uncertain it still is."""
+    return RatingState(
+        state.rating + MAX_STEP * state.deviation / INITIAL_DEVIATION * surprise,
+        max(MIN_DEVIATION, state.deviation * DEVIATION_DECAY),
+        state.games + 1
+    )
+
+
+def apply_pod(states, deck_key, opponent_keys, result):
+    """
+    Rates one pod in place. `states` maps subject keys to RatingState (missing keys
+    start at NEW_RATING). An opponent command zone seen at two seats of the same pod
+    gets one update with both seats' surprises.
+    """
+    seats = [deck_key, *opponent_keys]
+    current = [states.get(key, NEW_RATING) for key in seats]
+    surprises = defaultdict(float)
+    for key, surprise in zip(seats, pod_surprises(current[0], current[1:], result)):
+        surprises[key] += surprise
+    for key, surprise in surprises.items():
+        states[key] = _step(states.get(key, NEW_RATING), surprise)
+
+
+def _deck_key(deck_id):
+    return ("deck", deck_id)
+
+
+def _opponent_key(signature_hash):
+    return ("opponent", signature_hash)
+
+
+# --- Locking ---
+
+def rating_lock(user_id=None):
+    """
+    SELECT ... FOR NO KEY UPDATE of the user's row (every user's without user_id).
+    Ratings are read and written back as absolute values, so every writer (a logged
+    match, a replay) takes this lock first and one user's rating writes run one
+    after another. SQLite has no row locks and already serializes writers.
+    """
+    stmt = select(User.id).with_for_update(key_share=True)
+    return stmt if user_id is None else stmt.where(User.id == user_id)
+
+
+# --- Incremental Maintenance ---
+
+def load_deck_with_ratings(user_id, deck_id, signature_hashes):
+    """
+    The user's active deck, locked like rating_lock (the ownership check takes the
+    lock), then the stored ratings of that deck and of the given opponent signature
+    hashes. The ratings are read by a second statement, after the lock is granted,
+    so rows the previous lock holder wrote or replaced are seen.
+    Returns (deck, rating rows), or (None, []) if the deck is not the user's or inactive.
+    """
+    deck = db.session.scalars(
+        select(Deck)
+        .join(User, User.id == Deck.user_id)
+        .where(Deck.id == deck_id, Deck.user_id == user_id, Deck.is_active == true())
+        .with_for_update(of=User, key_share=True)
+    ).first()
+    if deck is None:
+        return None, []
+    stored = db.session.execute(
+        select(Rating.id, Rating.deck_id, Rating.signature_hash, Rating.rating, Rating.deviation, Rating.games)
+        .where(
+            Rating.user_id == user_id,
+            or_(Rating.deck_id == deck_id, Rating.signature_hash.in_(list(signature_hashes)))
+        )
+    ).all()
+    return deck, stored
+
+
+def record_match_rating(match, signature_values, stored):
+    """
+    Applies a newly logged, active match to its deck's and opponents' ratings with
+    at most one UPDATE and one INSERT executemany (O(pod size)).
+    `signature_values` are the opponent_seat_signatures rows written for the match and
+    `stored` the rating rows read by load_deck_with_ratings.
+    Runs inside the caller's transaction; the caller commits.
+    """
+    signatures = {row["signature_hash"]: row["signature"] for row in signature_values}
+    ids, states = {}, {}
+    for row in stored:
+        key = _deck_key(row.deck_id) if row.deck_id is not None else _opponent_key(row.signature_hash)
+        ids[key] = row.id
+        states[key] = RatingState(row.rating, row.deviation, row.games)
+
+    deck_key = _deck_key(match.deck_id)
+    opponent_keys = [_opponent_key(row["signature_hash"]) for row in signature_values]
+    apply_pod(states, deck_key, opponent_keys, match.result)
+
+    updates, inserts = [], []
+    for key in dict.fromkeys([deck_key, *opponent_keys]):
+        state = states[key]
+        values = {"rating": state.rating, "deviation": state.deviation, "games": state.games}
+        if key in ids:
+            updates.append({"id": ids[key], **values})
+        else:
+            inserts.append({**_subject_columns(key, signatures), "user_id": match.logger_user_id, **values})
+    if updates:
+        db.session.execute(update(Rating), updates)
+    if inserts:
+        # render_nulls keeps deck and opponent rows in one batch (NULL subject columns differ per kind)
+        db.session.execute(insert(Rating).execution_options(render_nulls=True), inserts)
+
+
+def _subject_columns(key, signatures):
+    kind, value = key
+    if kind == "deck":
+        return {"deck_id": value, "signature_hash": None, "signature": None}
+    return {"deck_id": None, "signature_hash": value, "signature": signatures[value]}
+
+
+# --- Replay ---
+
+def replay_ratings(user_id=None):
+    """
+    Recomputes every rating from the active match history, oldest match first.
+    Needed whenever history changes other than by appending (deleted or imported
+    matches, rebuilt signatures). Scoped to one user when user_id is given.
+    Holds rating_lock for the user (or all users) until the caller commits.
+    Returns the number of rating rows written. Does not commit.
+    """
+    db.session.execute(rating_lock(user_id)).all()
+    delete_stmt = delete(Rating)
+    source = (
+        select(
+            LoggedMatch.id, LoggedMatch.logger_user_id, LoggedMatch.deck_id, LoggedMatch.result,
+            OpponentSeatSignature.signature_hash, OpponentSeatSignature.signature
+        )
+        .outerjoin(OpponentSeatSignature, OpponentSeatSignature.logged_match_id == LoggedMatch.id)
+        .where(LoggedMatch.is_active == true())
+        .order_by(LoggedMatch.logger_user_id, LoggedMatch.timestamp, LoggedMatch.id, OpponentSeatSignature.seat_number)
+    )
+    if user_id is not None:
+        delete_stmt = delete_stmt.where(Rating.user_id == user_id)
+        source = source.where(LoggedMatch.logger_user_id == user_id)
+    db.session.execute(delete_stmt)
+
+    written, current_user, states, signatures = 0, None, {}, {}
+    rows = db.session.execute(source.execution_options(yield_per=REPLAY_BATCH_SIZE))
+    for pod_user_id, deck_id, result, seats in _history_pods(rows):
+        if pod_user_id != current_user:
+            written += _insert_states(current_user, states, signatures)
+            current_user, states, signatures = pod_user_id, {}, {}
+        signatures.update(seats)
+        apply_pod(states, _deck_key(deck_id), [_opponent_key(hash_) for hash_, _ in seats], result)
+    written += _insert_states(current_user, states, signatures)
+
+    logger.info(f"Replayed {written} ratings ({'user ' + str(user_id) if user_id else 'all users'}).")
+    return written
+
+
+@jobs.handler(REPLAY_RATINGS_JOB)
+def replay_user_ratings(payload):
+    """Job handler: replays one user's ratings after their history changed other than by appending."""
+    replay_ratings(payload["user_id"])
+    db.session.commit()
+    bump_user_data_version(payload["user_id"])
+
+
+def queue_rating_replay(user_id):
+    """
+    Schedules a replay of the user's ratings (O(history), so kept off the request path).
+    Commits the current session together with the job row. Returns the job id.
+    """
+    return jobs.enqueue(REPLAY_RATINGS_JOB, {"user_id": user_id})
+
+
+def _history_pods(rows):
+    """Groups ordered (match, signature) rows into (user_id, deck_id, result, [(hash, signature)]) per match."""
+    current, seats = None, []
+    for match_id, user_id, deck_id, result, hash_, signature in rows:
+        if current is not None and match_id != current[0]:
+            yield (*current[1:], seats)
+            seats = []
+        current = (match_id, user_id, deck_id, result)
+        if hash_ is not None:
+            seats.append((hash_, signature))
+    if current is not None:
+        yield (*current[1:], seats)
+
+
+def _insert_states(user_id, states, signatures):
+    rows = [
+        {**_subject_columns(key, signatures), "user_id": user_id,
+         "rating": state.rating, "deviation": state.deviation, "games": state.games}
+        for key, state in states.items()
+    ]
+    for start in range(0, len(rows), REPLAY_BATCH_SIZE):
+        db.session.execute(insert(Rating), rows[start:start + REPLAY_BATCH_SIZE])
+    return len(rows)
+
+
+# --- Read Helpers ---
+
+def rating_payload(rating, deviation, games):
+    """API shape of a stored rating (None for an unrated subject)."""
+    if rating is None:
+        return None
+    return {
+        "rating": round(rating), "deviation": round(deviation), "games": games,
+        "provisional": deviation > PROVISIONAL_DEVIATION
+    }
+
+
+def get_player_ratings(user_id):
+    """
+    The user's active decks and their TOP_OPPONENTS_LIMIT toughest opponent command
+    zones, strongest first, from one statement.
+    """
+    columns = (Rating.id, Rating.deck_id, Rating.rating, Rating.deviation, Rating.games)
+    deck_ratings = (
+        select(*columns, Deck.name.label("name"))
+        .join(Deck, Deck.id == Rating.deck_id)
+        .where(Rating.user_id == user_id, Deck.is_active == true())
+    )
+    toughest = (
+        select(*columns, Rating.signature.label("name"))
+        .where(Rating.user_id == user_id, Rating.signature_hash.isnot(None))
+        .order_by(Rating.rating.desc(), Rating.id)
+        .limit(TOP_OPPONENTS_LIMIT)
+        .subquery("toughest_opponents")
+    )
+    rows = db.session.execute(union_all(deck_ratings, select(toughest))).all()
+
+    decks, opponents = [], []
+    for row in sorted(rows, key=lambda row: (-row.rating, row.id)):
+        payload = {"name": row.name, **rating_payload(row.rating, row.deviation, row.games)}
+        if row.deck_id is not None:
+            decks.append({"deck_id": row.deck_id, **payload})
+        else:
+            opponents.append(payload)
+    return {"decks": decks, "opponents": opponents}
@@ -0,0 +1,264 @@
+# backend/services/synthetic_data_service.py
+
+from sqlalchemy import select, insert, delete
+from backend import db, bcrypt
+from backend.models import (
+    User, Deck, CommanderDeck, Tag, LoggedMatch, Commander, OpponentCommanderInMatch, OpponentSeatSignature, DeckStats, UserDeck,
+    Rating
+)
+from backend.models.logged_match import match_tags
+from backend.models.tag import deck_tags
+from backend.services.decks.deck_stats_service import refresh_deck_stats_bulk
+from backend.services.matches.opponent_signature_service import signature_rows
+from backend.services.matches.rating_service import replay_ratings
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+import logging
+import random
+import secrets
+
+logger = logging.getLogger(__name__)
+
+COMMANDER_DECK_TYPE_ID = 7
+SYNTHETIC_EMAIL_DOMAIN = "synthetic.example.com"
+DEFAULT_PASSWORD = "synthetic-password"
+DEFAULT_DECKS_PER_USER = 6
+DEFAULT_DAYS = 365
+INSERT_CHUNK_SIZE = 1000
+META_SIZE = 150
+
+TAG_NAMES = ["game night", "league", "cedh", "store", "online", "casual", "tournament", "precon"]
+# Share of decks/opponents that run two commanders, and of matches/decks later deleted
+PAIRED_DECK_RATE = 0.25
+MATCH_TAG_RATE = 0.35
+MATCH_DELETE_RATE = 0.03
+DECK_DELETE_RATE = 0.12
+DRAW_RATE = 0.02
+MULLIGAN_WEIGHTS = {0: 55, 1: 28, 2: 12, 3: 5}
+# Win-probability shift by seat (going first is an advantage)
+SEAT_EDGE = {1: 0.04, 2: 0.01, 3: -0.01, 4: -0.03}
+# Pairing flag of a primary commander -> flag its associated commander must have, and the role it gets
+PAIRINGS = [("partner", "partner"), ("friends_forever", "friends_forever"), ("choose_a_background", "background"),
+            ("doctor_companion", "time_lord_doctor")]
+
+
+class SyntheticDataError(ValueError):
+    """The database lacks what the generator needs (e.g. no commanders)."""
+
+# --- Commander Pool ---
+
+class CommanderPool:
+    """Commanders grouped for building legal command zones, loaded with one query."""
+
+    def __init__(self, rng):
+        flags = sorted({flag for pair in PAIRINGS for flag in pair})
+        rows = db.session.execute(select(Commander.id, Commander.name, *[getattr(Commander, flag) for flag in flags])).all()
+        if not rows:
+            raise SyntheticDataError("No commanders found. Run 'flask update-commanders' first.")
+        self.rng = rng
+        self.names = {row.id: row.name for row in rows}
+        self.by_flag = {flag: [row.id for row in rows if getattr(row, flag)] for flag in flags}
+        self.solo = [row.id for row in rows if not any(getattr(row, flag) for flag in flags)] or [row.id for row in rows]
+
+    def command_zone(self):
+        """[(commander_id, role)] for one deck: a solo commander or a legal pair."""
+        if self.rng.random() < PAIRED_DECK_RATE:
+            options = [(lead, partner) for lead, partner in PAIRINGS if self.by_flag[lead] and self.by_flag[partner]]
+            if options:
+                lead_flag, partner_flag = self.rng.choice(options)
+                lead = self.rng.choice(self.by_flag[lead_flag])
+                partners = [commander_id for commander_id in self.by_flag[partner_flag] if commander_id != lead]
+                if partners:
+                    return [(lead, "primary"), (self.rng.choice(partners), partner_flag)]
+        return [(self.rng.choice(self.solo), "primary")]
+
+    def meta(self, size=META_SIZE):
+        """
+        Opponent command zones with Zipf-like popularity, so signatures repeat the way
+        a real playgroup's do. Returns (zones, cumulative weights) for rng.choices.
+        """
+        zones = [self.command_zone() for _ in range(size)]
+        cumulative, total = [], 0.0
+        for rank in range(size):
+            total += 1.0 / (rank + 1)
+            cumulative.append(total)
+        return zones, cumulative
+
+# --- Row Builders ---
+
+def _user_rows(count, run_id, password_hash):
+    return [{
+        "first_name": "Synthetic",
+        "last_name": f"Player {n}",
+        "email": f"player-{run_id}-{n}@{SYNTHETIC_EMAIL_DOMAIN}",
+        "username": f"synthetic_{run_id}_{n}",
+        "password_hash": password_hash,
+    } for n in range(1, count + 1)]
+
+def _match_rows(rng, user_id, decks, count, days):
+    """Match dicts in timestamp order, with opponents, tags and soft deletes decided up front."""
+    now = datetime.now(timezone.utc)
+    start = now - timedelta(days=days)
+    step = (now - start) / max(count, 1)
+    deck_weights = [deck["weight"] for deck in decks]
+
+    rows = []
+    for n in range(count):
+        deck = rng.choices(decks, weights=deck_weights)[0]
+        timestamp = start + step * n + timedelta(seconds=rng.uniform(0, step.total_seconds() / 2))
+        player_position = rng.randint(1, 4)
+        roll = rng.random()
+        if roll < DRAW_RATE:
+            result = 2
+        else:
+            result = 0 if roll < DRAW_RATE + deck["skill"] + SEAT_EDGE[player_position] else 1
+        deleted = rng.random() < MATCH_DELETE_RATE
+        rows.append({
+            "match": {
+                "deck_id": deck["id"],
+                "result": result,
+                "player_position": player_position,
+                "player_mulligans": None if rng.random() < 0.1 else rng.choices(list(MULLIGAN_WEIGHTS), weights=list(MULLIGAN_WEIGHTS.values()))[0],
+                "timestamp": timestamp,
+                "pod_notes": None,
+                "logger_user_id": user_id,
+                "is_active": not deleted,
+                "deleted_at": timestamp + timedelta(days=1) if deleted else None,
+            },
+            "seats": [seat for seat in range(1, 5) if seat != player_position],
+            "tagged": rng.random() < MATCH_TAG_RATE,
+        })
+    return rows
+
+# --- Inserts ---
+
+def _insert_decks(rng, user_id, pool, count, tag_ids):
+    deck_rows, zones = [], []
+    for n in range(count):
+        zone = pool.command_zone()
+        zones.append(zone)
+        deleted = n > 0 and rng.random() < DECK_DELETE_RATE
+        deck_rows.append({
+            "user_id": user_id,
+            "name": " & ".join(pool.names[commander_id] for commander_id, _ in zone)[:100],
+            "deck_type_id": COMMANDER_DECK_TYPE_ID,
+            "is_active": not deleted,
+            "deleted_at": datetime.now(timezone.utc) if deleted else None,
+        })
+    deck_ids = db.session.scalars(insert(Deck).returning(Deck.id, sort_by_parameter_order=True), deck_rows).all()
+
+    db.session.execute(insert(CommanderDeck), [{
+        "deck_id": deck_id,
+        "commander_id": zone[0][0],
+        "associated_commander_id": zone[1][0] if len(zone) > 1 else None,
+    } for deck_id, zone in zip(deck_ids, zones)])
+    if tag_ids:
+        db.session.execute(insert(deck_tags), [
+            {"deck_id": deck_id, "tag_id": tag_id} for deck_id in deck_ids for tag_id in rng.sample(tag_ids, k=rng.randint(0, 2))
+        ])
+
+    # Retired decks were played less; a favourite deck gets most of the games
+    return [{
+        "id": deck_id,
+        "weight": (0.2 if not row["is_active"] else 1.0) * rng.paretovariate(1.5),
+        "skill": min(max(rng.gauss(0.25, 0.08), 0.05), 0.6),
+    } for deck_id, row in zip(deck_ids, deck_rows)], sum(not row["is_active"] for row in deck_rows)
+
+def _insert_match_chunk(rng, user_id, rows, pool, meta, tag_ids):
+    """Inserts one chunk of matches with one statement per table. Caller commits."""
+    match_ids = db.session.scalars(
+        insert(LoggedMatch).returning(LoggedMatch.id, sort_by_parameter_order=True),
+        [row["match"] for row in rows]
+    ).all()
+
+    zones, cumulative = meta
+    opponent_rows, signature_values, tag_rows = [], [], []
+    for match_id, row in zip(match_ids, rows):
+        names_by_seat = defaultdict(list)
+        for seat, zone in zip(row["seats"], rng.choices(zones, cum_weights=cumulative, k=len(row["seats"]))):
+            for commander_id, role in zone:
+                opponent_rows.append({"logged_match_id": match_id, "seat_number": seat, "commander_id": commander_id, "role": role})
+                names_by_seat[seat].append(pool.names[commander_id])
+        signature_values.extend(signature_rows(match_id, user_id, names_by_seat))
+        if row["tagged"] and tag_ids:
+            tag_rows.append({"match_id": match_id, "tag_id": rng.choice(tag_ids)})
+
+    db.session.execute(insert(OpponentCommanderInMatch), opponent_rows)
+    db.session.execute(insert(OpponentSeatSignature), signature_values)
+    if tag_rows:
+        db.session.execute(insert(match_tags), tag_rows)
+
+# --- Public API ---
+
+def seed_synthetic_data(users, matches_per_user, decks_per_user=DEFAULT_DECKS_PER_USER, seed=None,
+                        password=DEFAULT_PASSWORD, days=DEFAULT_DAYS, chunk_size=INSERT_CHUNK_SIZE):
+    """
+    Creates `users` synthetic accounts, each with decks (solo and paired commanders,
+    some retired), tags and `matches_per_user` matches in 4-player pods spread over
+    the last `days` days, including soft-deleted matches. Everything is written with
+    executemany inserts and committed per chunk; deck_stats and ratings are rebuilt
+    per user.
+    Uses the stored commanders; `seed` makes the generated data reproducible.
+    Returns {"user_ids", "decks", "deleted_decks", "tags", "matches", "deleted_matches"}.
+    """
+    rng = random.Random(seed)
+    pool = CommanderPool(rng)
+    meta = pool.meta()
+    run_id = secrets.token_hex(3)
+    # One hash for every account; bcrypt per user would dominate the run
+    password_hash = bcrypt.generate_password_hash(password).decode("utf-8")
+
+    user_ids = db.session.scalars(
+        insert(User).returning(User.id, sort_by_parameter_order=True), _user_rows(users, run_id, password_hash)
+    ).all()
+    db.session.commit()
+
+    report = {"user_ids": list(user_ids), "decks": 0, "deleted_decks": 0, "tags": 0, "matches": 0, "deleted_matches": 0}
+    for user_id in user_ids:
+        tag_ids = db.session.scalars(
+            insert(Tag).returning(Tag.id, sort_by_parameter_order=True),
+            [{"user_id": user_id, "name": name} for name in rng.sample(TAG_NAMES, k=rng.randint(2, len(TAG_NAMES)))]
+        ).all()
+        decks, deleted_decks = _insert_decks(rng, user_id, pool, decks_per_user, tag_ids)
+        db.session.commit()
+
+        rows = _match_rows(rng, user_id, decks, matches_per_user, days)
+        for start in range(0, len(rows), chunk_size):
+            _insert_match_chunk(rng, user_id, rows[start:start + chunk_size], pool, meta, tag_ids)
+            db.session.commit()
+        refresh_deck_stats_bulk([deck["id"] for deck in decks])
+        replay_ratings(user_id)
+        db.session.commit()
+
+        report["decks"] += len(decks)
+        report["deleted_decks"] += deleted_decks
+        report["tags"] += len(tag_ids)
+        report["matches"] += len(rows)
+        report["deleted_matches"] += sum(not row["match"]["is_active"] for row in rows)
+
+    logger.info(f"Synthetic data seeded: {users} users, {report['decks']} decks, {report['matches']} matches.")
+    return report
+
+def purge_synthetic_data():
+    """
+    Hard-deletes every synthetic account (email on SYNTHETIC_EMAIL_DOMAIN) and all
+    of its rows. Does not commit. Returns the number of users removed.
+    """
+    user_ids = select(User.id).where(User.email.like(f"%@{SYNTHETIC_EMAIL_DOMAIN}")).scalar_subquery()
+    match_ids = select(LoggedMatch.id).where(LoggedMatch.logger_user_id.in_(user_ids))
+    deck_ids = select(Deck.id).where(Deck.user_id.in_(user_ids))
+    tag_ids = select(Tag.id).where(Tag.user_id.in_(user_ids))
+    db.session.execute(delete(match_tags).where(match_tags.c.match_id.in_(match_ids)))
+    db.session.execute(delete(deck_tags).where(deck_tags.c.deck_id.in_(deck_ids) | deck_tags.c.tag_id.in_(tag_ids)))
+    db.session.execute(delete(OpponentCommanderInMatch).where(OpponentCommanderInMatch.logged_match_id.in_(match_ids)))
+    db.session.execute(delete(OpponentSeatSignature).where(OpponentSeatSignature.logger_user_id.in_(user_ids)))
+    db.session.execute(delete(DeckStats).where(DeckStats.user_id.in_(user_ids)))
+    db.session.execute(delete(Rating).where(Rating.user_id.in_(user_ids)))
+    db.session.execute(delete(LoggedMatch).where(LoggedMatch.logger_user_id.in_(user_ids)))
+    db.session.execute(delete(CommanderDeck).where(CommanderDeck.deck_id.in_(deck_ids)))
+    db.session.execute(delete(UserDeck).where(UserDeck.user_id.in_(user_ids)))
+    db.session.execute(delete(Deck).where(Deck.user_id.in_(user_ids)))
+    db.session.execute(delete(Tag).where(Tag.user_id.in_(user_ids)))
+    removed = db.session.execute(delete(User).where(User.email.like(f"%@{SYNTHETIC_EMAIL_DOMAIN}"))).rowcount
+    logger.info(f"Purged {removed} synthetic users.")
+    return removed
@@ -0,0 +1,184 @@
+# backend/session_store.py
+from datetime import datetime, timezone
+import logging
+
+from flask_session.base import ServerSideSession, ServerSideSessionInterface
+from flask_session.defaults import Defaults
+from flask_session.sqlalchemy import SqlAlchemySessionInterface
+from sqlalchemy import table, column, select, delete, or_, Integer, DateTime
+
+from .cache import LocalCacheBackend
+from .database import db
+
+logger = logging.getLogger(__name__)
+
+BACKEND_SQLALCHEMY = "sqlalchemy"
+BACKEND_REDIS = "redis"
+BACKEND_LOCAL = "local"
+DEFAULT_READ_CACHE_SECONDS = 5
+DEFAULT_REFRESH_INTERVAL_SECONDS = 60
+READ_CACHE_MAX_ENTRIES = 10000
+LOCAL_STORE_MAX_ENTRIES = 100000
+PURGE_BATCH_SIZE = 1000
+
+
+# --- Read-Through Cache ---
+
+class SessionReadCacheMixin:
+    """
+    Per-process read-through cache for a server-side session interface. A
+    session read within `read_cache_ttl` seconds of the last read or write in
+    this process is served from memory instead of the store. Writes and deletes
+    made here update the cache at once. Another worker can serve a logged-out
+    session for at most the TTL, so keep it short.
+
+    Flask refreshes the stored expiry on every request (SESSION_REFRESH_EACH_REQUEST).
+    Here an unmodified session is written back at most once per
+    `refresh_interval` seconds, which keeps the sliding expiry without a write
+    on each API call.
+    """
+
+    def init_read_cache(self, read_cache_ttl, refresh_interval):
+        self.read_cache_ttl = read_cache_ttl
+        self.refresh_interval = refresh_interval
+        self._read_cache = LocalCacheBackend(READ_CACHE_MAX_ENTRIES)
+        self._refreshed = LocalCacheBackend(READ_CACHE_MAX_ENTRIES)
+
+    def _retrieve_session_data(self, store_id):
+        if self.read_cache_ttl > 0:
+            cached = self._read_cache.get(store_id)
+            if cached is not None:
+                return self.serializer.decode(cached)
+        data = super()._retrieve_session_data(store_id)
+        if data is not None and self.read_cache_ttl > 0:
+            self._read_cache.set(store_id, self.serializer.encode(data), self.read_cache_ttl)
+        return data
+
+    def _upsert_session(self, session_lifetime, session, store_id):
+        super()._upsert_session(session_lifetime, session, store_id)
+        if self.read_cache_ttl > 0:
+            self._read_cache.set(store_id, self.serializer.encode(session), self.read_cache_ttl)
+        if self.refresh_interval > 0:
+            self._refreshed.set(store_id, True, self.refresh_interval)
+
+    def _delete_session(self, store_id):
+        self._read_cache.delete(store_id)
+        self._refreshed.delete(store_id)
+        super()._delete_session(store_id)
+
+    def should_set_storage(self, app, session):
+        if session.modified:
+            return True
+        if not app.config["SESSION_REFRESH_EACH_REQUEST"]:
+            return False
+        if self.refresh_interval <= 0:
+            return True
+        return self._refreshed.get(self._get_store_id(session.sid)) is None
+
+
+class CachedSqlAlchemySessionInterface(SessionReadCacheMixin, SqlAlchemySessionInterface):
+    pass
+
+
+# --- Local Stand-In ---
+
+class LocalSession(ServerSideSession):
+    pass
+
+
+class LocalSessionInterface(ServerSideSessionInterface):
+    """
+    Sessions in process memory with per-entry TTL, a stand-in for Redis in
+    development and tests. Not shared between workers and lost on restart.
+    """
+    session_class = LocalSession
+    ttl = True
+
+    def __init__(self, app, **kwargs):
+        self.store = LocalCacheBackend(LOCAL_STORE_MAX_ENTRIES)
+        super().__init__(app, **kwargs)
+
+    def _retrieve_session_data(self, store_id):
+        serialized_session_data = self.store.get(store_id)
+        return self.serializer.decode(serialized_session_data) if serialized_session_data is not None else None
+
+    def _delete_session(self, store_id):
+        self.store.delete(store_id)
+
+    def _upsert_session(self, session_lifetime, session, store_id):
+        self.store.set(store_id, self.serializer.encode(session), session_lifetime.total_seconds())
+
+
+# --- Setup ---
+
+def init_session_store(app):
+    """
+    Installs the session interface chosen by SESSION_BACKEND: the `sessions`
+    table (default), Redis at REDIS_URL, or process memory. The table and Redis
+    backends get the per-process read cache (SESSION_READ_CACHE_SECONDS, 0
+    disables it) and the throttled expiry refresh (SESSION_REFRESH_INTERVAL_SECONDS).
+    """
+    config = app.config
+    backend = config.get("SESSION_BACKEND", BACKEND_SQLALCHEMY)
+    common = {
+        "key_prefix": config.get("SESSION_KEY_PREFIX", Defaults.SESSION_KEY_PREFIX),
+        "use_signer": config.get("SESSION_USE_SIGNER", Defaults.SESSION_USE_SIGNER),
+        "permanent": config.get("SESSION_PERMANENT", Defaults.SESSION_PERMANENT),
+        "sid_length": config.get("SESSION_ID_LENGTH", Defaults.SESSION_ID_LENGTH),
+        "serialization_format": config.get("SESSION_SERIALIZATION_FORMAT", Defaults.SESSION_SERIALIZATION_FORMAT),
+    }
+
+    if backend == BACKEND_LOCAL:
+        app.session_interface = LocalSessionInterface(app, **common)
+        return app.session_interface
+
+    if backend == BACKEND_REDIS:
+        import redis  # Optional dependency, only needed for this backend
+        from flask_session.redis import RedisSessionInterface
+
+        class CachedRedisSessionInterface(SessionReadCacheMixin, RedisSessionInterface):
+            pass
+
+        interface = CachedRedisSessionInterface(app, client=redis.Redis.from_url(config["REDIS_URL"]), **common)
+    elif backend == BACKEND_SQLALCHEMY:
+        interface = CachedSqlAlchemySessionInterface(
+            app, client=db, table=config.get("SESSION_SQLALCHEMY_TABLE", Defaults.SESSION_SQLALCHEMY_TABLE), **common
+        )
+    else:
+        raise ValueError(f"Unknown SESSION_BACKEND '{backend}' (expected sqlalchemy, redis or local).")
+
+    interface.init_read_cache(
+        config.get("SESSION_READ_CACHE_SECONDS", DEFAULT_READ_CACHE_SECONDS),
+        config.get("SESSION_REFRESH_INTERVAL_SECONDS", DEFAULT_REFRESH_INTERVAL_SECONDS),
+    )
+    app.session_interface = interface
+    return interface
+
+
+# --- Maintenance ---
+
+def purge_expired_sessions(table_name=Defaults.SESSION_SQLALCHEMY_TABLE, batch_size=PURGE_BATCH_SIZE, now=None):
+    """
+    Deletes expired rows from the SQL sessions table, `batch_size` rows per
+    transaction so a large backlog never holds long locks. Works whatever
+    SESSION_BACKEND is active (e.g. to empty the table after moving to Redis).
+    Returns the number of rows deleted.
+    """
+    # Flask-Session stores naive UTC expiries
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    sessions = table(table_name, column("id", Integer), column("expiry", DateTime))
+    expired_ids = (
+        select(sessions.c.id)
+        .where(or_(sessions.c.expiry.is_(None), sessions.c.expiry <= now))
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    deleted = 0
+    while True:
+        batch = db.session.execute(delete(sessions).where(sessions.c.id.in_(expired_ids))).rowcount
+        db.session.commit()
+        deleted += batch
+        if batch < batch_size:
+            break
+    logger.info(f"Purged {deleted} expired sessions from '{table_name}'.")
+    return deleted
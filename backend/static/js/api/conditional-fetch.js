@@ -0,0 +1,62 @@
+import { authFetch } from '../auth/auth.js';
+
+// Last ETag and body per URL, kept for the browser session
+const STORAGE_PREFIX = 'etag-cache:';
+
+function readEntry(url) {
+    try {
+        const raw = sessionStorage.getItem(STORAGE_PREFIX + url);
+        return raw ? JSON.parse(raw) : null;
+    } catch (e) {
+        return null;
+    }
+}
+
+function writeEntry(url, entry) {
+    try {
+        sessionStorage.setItem(STORAGE_PREFIX + url, JSON.stringify(entry));
+    } catch (e) { /* Storage full or unavailable: just skip caching */ }
+}
+
+/**
+ * GET through authFetch with If-None-Match. A 304 is turned back into a 200
+ * Response carrying the stored body, so callers use it like any other response.
+ * Non-GET requests are passed straight to authFetch.
+ */
+export async function conditionalFetch(url, options = {}) {
+    const method = options.method ? options.method.toUpperCase() : 'GET';
+    if (method !== 'GET') {
+        return authFetch(url, options);
+    }
+
+    const cached = readEntry(url);
+    options.headers = options.headers || {};
+    if (cached) {
+        options.headers['If-None-Match'] = cached.etag;
+    }
+    options.cache = 'no-store';
+
+    const response = await authFetch(url, options);
+    if (!response) return response;
+
+    if (response.status === 304 && cached) {
+        return new Response(cached.body, {
+            status: 200,
+            headers: { 'Content-Type': 'application/json', 'ETag': cached.etag }
+        });
+    }
+
+    const etag = response.headers.get('ETag');
+    if (response.ok && etag) {
+        writeEntry(url, { etag, body: await response.clone().text() });
+    }
+    return response;
+}
+
+export function clearConditionalCache() {
+    try {
+        Object.keys(sessionStorage)
+            .filter(key => key.startsWith(STORAGE_PREFIX))
+            .forEach(key => sessionStorage.removeItem(key));
+    } catch (e) { /* Storage unavailable */ }
+}
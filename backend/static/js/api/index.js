@@ -1 +1,2 @@
 export * from "./commanders.js";
+export * from "./conditional-fetch.js";
\ No newline at end of file
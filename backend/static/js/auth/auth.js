@@ -1,5 +1,7 @@
 // backend/static/js/auth/auth.js
 
+import { clearConditionalCache } from '../api/conditional-fetch.js';
+
 // --- CSRF Token Handling ---
 
 let csrfToken = null;
@@ -100,6 +102,7 @@ export async function handleLogout() {
         console.error('Error during logout fetch:', error);
     } finally {
         localStorage.removeItem('username');
+        clearConditionalCache();
         console.log("Redirecting to /login");
         window.location.href = '/login';
     }
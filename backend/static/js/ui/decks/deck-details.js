@@ -69,6 +69,10 @@ function renderDeckInfoStats(deckData) {
     if (!deckInfoStatsCardElement || !deckData) return;
     const winRate = parseFloat(deckData.win_rate ?? 0);
     const totalMatches = parseInt(deckData.total_matches ?? 0, 10);
+    const rating = deckData.rating;
+    const ratingHtml = rating
+        ? `<span class="mx-1.5 text-gray-300 dark:text-gray-600">|</span><span class="text-sm" title="Rating ± ${rating.deviation}${rating.provisional ? ' (provisional)' : ''}">${rating.rating}${rating.provisional ? '?' : ''} Elo</span>`
+        : '';
     let winrateColorClass = 'text-gray-700 dark:text-gray-200';
     if (totalMatches > 0) {
         if (winRate >= 55) winrateColorClass = 'text-green-500 dark:text-green-400';
@@ -88,7 +92,7 @@ function renderDeckInfoStats(deckData) {
     if (deckData.associated_commander_name) {
         commanderHtml += `<div class="py-2.5 sm:py-3 grid grid-cols-3 gap-4 px-4 sm:px-5 ${commanderHtml ? 'bg-gray-50/70 dark:bg-gray-700/40' : ''}"><dt class="text-xs font-medium text-gray-500 dark:text-gray-400">${assocLabel}</dt><dd class="mt-0 text-xs text-gray-900 dark:text-gray-100 col-span-2">${deckData.associated_commander_name}</dd></div>`;
     }
-    deckInfoStatsCardElement.innerHTML = `<div class="border-t border-gray-200 dark:border-gray-700 first:border-t-0"><dl class="divide-y divide-gray-200 dark:divide-gray-700">${commanderHtml}<div class="py-3 sm:py-4 grid grid-cols-3 gap-4 px-4 sm:px-5 ${commanderHtml ? 'bg-gray-50/70 dark:bg-gray-700/40' : ''}"><dt class="text-sm font-semibold text-gray-600 dark:text-gray-300 self-center">Performance</dt><dd class="mt-0 text-gray-900 dark:text-gray-100 col-span-2 self-center text-right sm:text-left"><span class="${winrateColorClass} text-xl font-bold">${winRate.toFixed(1)}%</span><span class="ml-1 text-xs text-gray-500 dark:text-gray-400">WR</span><span class="mx-1.5 text-gray-300 dark:text-gray-600">|</span><span class="text-sm">${totalMatches} M / ${deckData.total_wins ?? 0} W</span></dd></div></dl></div>`;
+    deckInfoStatsCardElement.innerHTML = `<div class="border-t border-gray-200 dark:border-gray-700 first:border-t-0"><dl class="divide-y divide-gray-200 dark:divide-gray-700">${commanderHtml}<div class="py-3 sm:py-4 grid grid-cols-3 gap-4 px-4 sm:px-5 ${commanderHtml ? 'bg-gray-50/70 dark:bg-gray-700/40' : ''}"><dt class="text-sm font-semibold text-gray-600 dark:text-gray-300 self-center">Performance</dt><dd class="mt-0 text-gray-900 dark:text-gray-100 col-span-2 self-center text-right sm:text-left"><span class="${winrateColorClass} text-xl font-bold">${winRate.toFixed(1)}%</span><span class="ml-1 text-xs text-gray-500 dark:text-gray-400">WR</span><span class="mx-1.5 text-gray-300 dark:text-gray-600">|</span><span class="text-sm">${totalMatches} M / ${deckData.total_wins ?? 0} W</span>${ratingHtml}</dd></div></dl></div>`;
     deckInfoStatsCardElement.classList.remove('hidden');
 }
 
@@ -236,7 +240,7 @@ function renderMatchupStats(matchupData) {
     if (!matchupAnalysisCardElement) return;
     const createMatchupItem = (matchup, type) => {
         const winRateColor = type === 'nemesis' ? 'text-red-500 dark:text-red-400' : 'text-green-500 dark:text-green-400';
-        return `<div class="grid grid-cols-3 gap-4 items-center py-2 border-b border-gray-700/50 last:border-b-0"><div class="col-span-2"><p class="text-sm font-medium text-white" title="${matchup.name}">${matchup.name}</p><p class="text-xs text-gray-400">${matchup.wins}W – ${matchup.losses}L</p></div><div class="text-right"><p class="text-base font-semibold ${winRateColor}">${matchup.win_rate}%</p></div></div>`;
+        return `<div class="grid grid-cols-3 gap-4 items-center py-2 border-b border-gray-700/50 last:border-b-0"><div class="col-span-2"><p class="text-sm font-medium text-white" title="${matchup.name}">${matchup.name}</p><p class="text-xs text-gray-400">${matchup.wins}W – ${matchup.losses}L</p></div><div class="text-right"><p class="text-base font-semibold ${winRateColor}" title="95% range: ${matchup.win_rate_lower}–${matchup.win_rate_upper}%">${matchup.win_rate}%</p></div></div>`;
     };
     const placeholder = matchupAnalysisCardElement.querySelector('#matchup-analysis-placeholder');
     const container = matchupAnalysisCardElement.querySelector('#matchup-analysis-container');
@@ -1,6 +1,7 @@
 // backend/static/js/ui/decks/deck-list-manager.js
 
 import { authFetch } from '../../auth/auth.js';
+import { conditionalFetch } from '../../api/conditional-fetch.js';
 import { sortAndRenderDecks } from './sort-decks.js'; 
 import { renderEmptyDecksMessage } from './deckCardComponent.js';
 // Corrected import name: handleRemoveDeckTagClick
@@ -84,7 +85,7 @@ async function updateDeckListView() {
     decksContainer.innerHTML = '<div class="col-span-full p-6 text-center text-gray-500 dark:text-gray-400"><svg class="animate-spin h-8 w-8 text-violet-500 dark:text-violet-400 mx-auto mb-3" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24"><circle class="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" stroke-width="4"></circle><path class="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8V0C5.373 0 0 5.373 0 12h4zm2 5.291A7.962 7.962 0 014 12H0c0 3.042 1.135 5.824 3 7.938l3-2.647z"></path></svg>Loading decks...</div>';
 
     try {
-        const response = await authFetch(apiUrl);
+        const response = await conditionalFetch(apiUrl);
         if (!response) throw new Error("Authentication or network error occurred.");
         if (!response.ok) {
             const errorData = await response.json().catch(() => ({ error: `HTTP error ${response.status}` }));
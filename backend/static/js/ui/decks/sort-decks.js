@@ -58,8 +58,10 @@ export function sortAndRenderDecks(decksToSort, sortOption, containerElement, re
             sortedDecks.sort((a, b) => (a.name ?? '').localeCompare(b.name ?? ''));
             break;
         case "winrate":
-            // Ensure win_rate is treated as a number
-            sortedDecks.sort((a, b) => (parseFloat(b.win_rate) || 0) - (parseFloat(a.win_rate) || 0));
+            // Rank by the Wilson lower bound so a 2-0 deck does not outrank a proven one
+            sortedDecks.sort((a, b) =>
+                (parseFloat(b.win_rate_lower ?? b.win_rate) || 0) - (parseFloat(a.win_rate_lower ?? a.win_rate) || 0)
+                || (parseFloat(b.win_rate) || 0) - (parseFloat(a.win_rate) || 0));
             break;
         case "creation_date": // Assuming your backend provides 'creation_date' or 'created_at'
             sortedDecks.sort((a, b) => {
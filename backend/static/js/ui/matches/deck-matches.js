@@ -1,5 +1,6 @@
 import { formatMatchResult } from "../../utils.js"; // Ensure this path is correct
 import { authFetch } from '../../auth/auth.js';
+import { conditionalFetch } from '../../api/conditional-fetch.js';
 
 // This module now exports a function to be called explicitly.
 
@@ -27,7 +28,7 @@ export async function loadDeckMatchesIntoContainer(deckId, targetContainerId, li
 
     try {
         const apiUrl = `/api/matches_history?deck_id=${deckId}&limit=${limit}&offset=0`;
-        const response = await authFetch(apiUrl);
+        const response = await conditionalFetch(apiUrl);
 
         if (!response) {
             // authFetch likely handled error/redirect or threw its own error
@@ -1,5 +1,6 @@
 import { TagInputManager } from '../tagInput.js';
 import { authFetch } from '../../auth/auth.js';
+import { conditionalFetch } from '../../api/conditional-fetch.js';
 import { searchCommanders, getCommanderAttributes } from '../../api/deck-api.js'; 
 
 let modalElement = null;
@@ -41,7 +42,7 @@ async function populateDeckSelect() {
     const originalFirstOptionHTML = deckSelectElement.options.length > 0 && deckSelectElement.options[0].disabled ? deckSelectElement.options[0].outerHTML : '<option disabled selected value="">Select Deck</option>';
     deckSelectElement.innerHTML = '<option disabled selected value="">Loading decks...</option>';
     try {
-        const response = await authFetch("/api/user_decks");
+        const response = await conditionalFetch("/api/user_decks");
         if (!response || !response.ok) {
              const errorData = response ? await response.json().catch(() => ({})) : {};
              throw new Error(errorData.error || `Failed to fetch decks (${response?.status})`);
@@ -1,12 +1,68 @@
 // backend/static/js/ui/matches/match-list-manager.js
 
 import { authFetch } from '../../auth/auth.js';
+import { conditionalFetch } from '../../api/conditional-fetch.js';
 import { formatMatchResult } from '../../utils.js';
 import { openQuickAddTagModal, closeQuickAddTagModal } from '../tag-utils.js';
 import { initializeMatchActionMenus } from './match-actions.js';
 
+// Matches per /api/matches_history cursor page (the server's default page size)
+const MATCHES_PAGE_SIZE = 50;
+
 // --- Core Functions ---
 
+/**
+ * Fetches one page of the match history in cursor mode. `params` holds the
+ * filters (deck_id, tags); an empty cursor asks for the newest page.
+ * Resolves to { matches, next_cursor }, with next_cursor null on the last page.
+ */
+async function fetchMatchesPage(params = {}, cursor = '') {
+    const query = new URLSearchParams(params);
+    query.set('page_size', MATCHES_PAGE_SIZE);
+    query.set('cursor', cursor || '');
+
+    const response = await conditionalFetch(`/api/matches_history?${query.toString()}`);
+    if (!response) throw new Error("Authentication or network error.");
+    if (!response.ok) {
+        let errorMsg = `Error loading match history: ${response.status}`;
+        try { const errorData = await response.json(); errorMsg = errorData.error || errorMsg; } catch (e) { /* Ignore */ }
+        throw new Error(errorMsg);
+    }
+
+    const page = await response.json();
+    if (!page || !Array.isArray(page.matches)) throw new Error("Invalid data format from server.");
+    return page;
+}
+
+/**
+ * Shows a "Load more" button at the end of a match grid while older matches
+ * remain. Clicking it fetches the next page and appends its cards.
+ */
+function renderLoadMoreMatches(containerElement, params, nextCursor) {
+    containerElement.querySelector('.load-more-matches')?.remove();
+    if (!nextCursor) return;
+
+    const wrapper = document.createElement('div');
+    wrapper.className = 'load-more-matches md:col-span-2 flex justify-center pt-2';
+    wrapper.innerHTML = `<button type="button" class="px-4 py-2 text-sm font-medium text-violet-700 dark:text-violet-200 border border-violet-300 dark:border-violet-600 rounded-md hover:bg-violet-50 dark:hover:bg-violet-700/30 focus:outline-none focus:ring-2 focus:ring-violet-500 disabled:opacity-50">Load more matches</button>`;
+    const button = wrapper.querySelector('button');
+    button.addEventListener('click', async () => {
+        button.disabled = true;
+        button.textContent = 'Loading...';
+        try {
+            const page = await fetchMatchesPage(params, nextCursor);
+            wrapper.remove();
+            displayMatches(page.matches, containerElement, null, true);
+            renderLoadMoreMatches(containerElement, params, page.next_cursor);
+        } catch (error) {
+            console.error("Failed to load more matches:", error);
+            button.disabled = false;
+            button.textContent = 'Load more matches';
+        }
+    });
+    containerElement.appendChild(wrapper);
+}
+
 function getSelectedMatchTagIds() {
     const optionsContainer = document.getElementById("match-tag-filter-options");
     if (!optionsContainer) return [];
@@ -62,14 +118,19 @@ async function handleRemoveMatchTagClick(event) {
     }
 }
 
-function displayMatches(matches, containerElement, noMatchesElement) {
+function displayMatches(matches, containerElement, noMatchesElement, append = false) {
     if (!containerElement) {
         console.error("Match display container not found.");
         return;
     }
 
-    containerElement.innerHTML = ""; // Clear previous
     const hasMatches = matches && Array.isArray(matches) && matches.length > 0;
+    if (append) {
+        // Next page: add cards after the ones already shown
+        if (!hasMatches) return;
+    } else {
+        containerElement.innerHTML = ""; // Clear previous
+    }
 
     if (noMatchesElement) {
         noMatchesElement.classList.toggle('hidden', hasMatches);
@@ -252,28 +313,17 @@ async function updateMatchHistoryView() {
     noMatchesMessage.classList.add('hidden');
 
     const selectedTagIds = getSelectedMatchTagIds();
-    const params = new URLSearchParams();
+    const params = {};
     if (selectedTagIds.length > 0) {
-        params.append('tags', selectedTagIds.join(','));
+        params.tags = selectedTagIds.join(',');
     }
-    
-    const apiUrl = `/api/matches_history?${params.toString()}`;
 
     try {
-        const response = await authFetch(apiUrl);
-        if (!response) throw new Error("Authentication or network error.");
-        if (!response.ok) {
-            let errorMsg = `Error loading match history: ${response.status}`;
-            try { const errorData = await response.json(); errorMsg = errorData.error || errorMsg; } catch (e) { /* Ignore */ }
-            throw new Error(errorMsg);
-        }
-
-        const userMatches = await response.json();
-        if (!Array.isArray(userMatches)) throw new Error("Invalid data format from server.");
-
-        displayMatches(userMatches, matchesListContainer, noMatchesMessage);
+        const page = await fetchMatchesPage(params);
+        displayMatches(page.matches, matchesListContainer, noMatchesMessage);
+        renderLoadMoreMatches(matchesListContainer, params, page.next_cursor);
 
-        if (userMatches.length > 0) {
+        if (page.matches.length > 0) {
             initializeMatchActionMenus("matches-list-items", updateMatchHistoryView);
         }
 
@@ -367,4 +417,4 @@ document.addEventListener('DOMContentLoaded', () => {
     window.refreshMatchHistory = updateMatchHistoryView;
 });
 
-export { updateMatchHistoryView, displayMatches, handleRemoveMatchTagClick };
\ No newline at end of file
+export { updateMatchHistoryView, displayMatches, fetchMatchesPage, renderLoadMoreMatches, handleRemoveMatchTagClick };
\ No newline at end of file
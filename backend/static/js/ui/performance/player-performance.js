@@ -1,6 +1,7 @@
 // backend/static/js/ui/performance/player-performance.js
 
 import { authFetch } from '../../auth/auth.js';
+import { conditionalFetch } from '../../api/conditional-fetch.js';
 import { openLogMatchModal } from '../matches/log-match-modal.js';
 
 function showLoadingState(isLoading) {
@@ -114,10 +115,46 @@ function renderPersonalMetagame(metagameData) {
     }
 }
 
+function renderRatingList(listEl, ratings) {
+    listEl.innerHTML = '';
+    ratings.forEach((entry) => {
+        const item = document.createElement('div');
+        item.className = 'flex items-center justify-between text-sm';
+        item.innerHTML = `
+            <span class="font-medium text-gray-800 dark:text-gray-100 truncate pr-4" title="${entry.name}">${entry.name}</span>
+            <span class="text-gray-500 dark:text-gray-400 flex-shrink-0" title="± ${entry.deviation} over ${entry.games} games">
+                ${entry.rating}${entry.provisional ? '?' : ''}
+            </span>
+        `;
+        listEl.appendChild(item);
+    });
+}
+
+async function loadRatings() {
+    const cardEl = document.getElementById('ratings-card');
+    const decksEl = document.getElementById('deck-ratings-list');
+    const opponentsEl = document.getElementById('opponent-ratings-list');
+    if (!cardEl || !decksEl || !opponentsEl) return;
+
+    try {
+        const response = await conditionalFetch('/api/performance/ratings');
+        if (!response || !response.ok) throw new Error('Failed to load ratings.');
+        const data = await response.json();
+
+        renderRatingList(decksEl, data.decks);
+        renderRatingList(opponentsEl, data.opponents);
+        cardEl.classList.toggle('hidden', data.decks.length === 0 && data.opponents.length === 0);
+    } catch (error) {
+        // Ratings are supplementary; the rest of the page still renders
+        console.error('Error loading ratings:', error);
+        cardEl.classList.add('hidden');
+    }
+}
+
 async function loadPerformanceData() {
     showLoadingState(true);
     try {
-        const response = await authFetch('/api/performance-summary');
+        const response = await conditionalFetch('/api/performance-summary');
         if (!response) throw new Error('Network or authentication error.');
         
         const data = await response.json();
@@ -127,6 +164,7 @@ async function loadPerformanceData() {
             renderHeadlineStats(data);
             renderTurnOrderStats(data.turn_order_stats);
             renderPersonalMetagame(data.personal_metagame);
+            loadRatings();
         } else {
             showNoDataState();
         }
@@ -1,4 +1,5 @@
 import { authFetch } from '../auth/auth.js';
+import { conditionalFetch } from '../api/conditional-fetch.js';
 
 function debounce(func, wait) {
     let timeout;
@@ -22,7 +23,7 @@ const TagInputManager = (() => {
         if (hasFetchedUserTags) return userTagsCache;
         isLoadingUserTags = true;
         try {
-            const response = await authFetch("/api/tags");
+            const response = await conditionalFetch("/api/tags");
             if (!response.ok) {
                 throw new Error(`Failed to fetch tags: ${response.status}`);
             }
@@ -1,9 +1,12 @@
 import { authFetch } from '../../auth/auth.js';
+import { conditionalFetch } from '../../api/conditional-fetch.js';
 import { renderDeckCard, renderEmptyDecksMessage as renderEmptyAssociatedDecksMessage } from '../decks/deckCardComponent.js';
 // Corrected import name: handleRemoveDeckTagClick (for deck tags)
 // handleRemoveMatchTagClick is for match tags, ensure it's also correctly exported if used.
 import { 
     displayMatches as renderAssociatedMatches, 
+    fetchMatchesPage,
+    renderLoadMoreMatches,
     handleRemoveMatchTagClick // Assuming this is correctly exported from match-list-manager for match tags
 } from '../matches/match-list-manager.js';
 import { initializeMatchActionMenus } from '../matches/match-actions.js';
@@ -50,9 +53,13 @@ async function fetchAndDisplayAssociatedItems() {
     const queryParams = `?tags=${currentSelectedIdsArray.join(',')}`;
 
     try {
-        const [decksResponse, matchesResponse] = await Promise.all([
-            authFetch(`/api/user_decks${queryParams}`),
-            authFetch(`/api/matches_history${queryParams}`)
+        const matchParams = { tags: currentSelectedIdsArray.join(',') };
+        const [decksResponse, matchesPage] = await Promise.all([
+            conditionalFetch(`/api/user_decks${queryParams}`),
+            fetchMatchesPage(matchParams).catch(error => {
+                console.error("Failed to fetch matches:", error);
+                return null;
+            })
         ]);
 
         if (decksResponse.ok) {
@@ -74,20 +81,19 @@ async function fetchAndDisplayAssociatedItems() {
             decksContainer.innerHTML = '<p class="text-red-500 dark:text-red-400 text-sm p-4 md:col-span-full">Error loading decks.</p>';
         }
 
-        if (matchesResponse.ok) {
-            const matches = await matchesResponse.json();
+        if (matchesPage) {
+            const matches = matchesPage.matches;
             const noMatchesPlaceholder = document.createElement('div'); 
-            if (matches && matches.length > 0) {
+            if (matches.length > 0) {
                 matchesContainer.innerHTML = ''; 
-                // Pass fetchAndDisplayAssociatedItems as the refresh callback for tag removal on match cards
-                renderAssociatedMatches(matches, matchesContainer, noMatchesPlaceholder, fetchAndDisplayAssociatedItems); 
+                renderAssociatedMatches(matches, matchesContainer, noMatchesPlaceholder); 
+                renderLoadMoreMatches(matchesContainer, matchParams, matchesPage.next_cursor);
                 initializeMatchActionMenus('associated-matches-list', fetchAndDisplayAssociatedItems);
             } else {
                 matchesContainer.innerHTML = '<p class="text-center text-gray-700 dark:text-gray-300 mt-4 p-4 text-base border border-dashed border-gray-300 dark:border-gray-600 rounded-lg md:col-span-full">No matches found with the selected tags.</p>';
             }
             setupMatchCardTagListeners();
         } else {
-            console.error("Failed to fetch matches:", matchesResponse.status);
             matchesContainer.innerHTML = '<p class="text-red-500 dark:text-red-400 text-sm p-4 md:col-span-full">Error loading matches.</p>';
         }
 
@@ -270,7 +276,7 @@ function clearAllTagSelections() {
 async function fetchAllUserTags() {
     // ... (this function remains the same)
     try {
-        const response = await authFetch('/api/tags');
+        const response = await conditionalFetch('/api/tags');
         if (!response.ok) throw new Error(`Failed to fetch tags: ${response.status}`);
         allUserTags = await response.json();
         allUserTags.sort((a, b) => a.name.localeCompare(b.name));
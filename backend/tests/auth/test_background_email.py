@@ -0,0 +1,151 @@
+# backend/tests/auth/test_background_email.py
+
+import os
+import smtplib
+import threading
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import delete, select, update
+from backend.jobs import jobs, JobQueue, EXECUTOR_THREAD, EXECUTOR_INLINE
+from backend.models import Job
+from backend.services.email_service import mail_sender, PASSWORD_RESET_JOB
+
+# --- Fixtures ---
+
+class FakeSMTP:
+    """Records what the mail sender does instead of talking to a server."""
+    connections = []
+    refuse_next = 0
+
+    def __init__(self, host, port, timeout=None):
+        if FakeSMTP.refuse_next:
+            FakeSMTP.refuse_next -= 1
+            raise ConnectionRefusedError("mail server down")
+        self.host, self.port = host, port
+        self.calls, self.sent = [], []
+        FakeSMTP.connections.append(self)
+
+    def starttls(self):
+        self.calls.append("starttls")
+
+    def login(self, username, password):
+        self.calls.append("login")
+
+    def send_message(self, message):
+        if self.calls[-1:] == ["dropped"]:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(message)
+
+    def quit(self):
+        self.calls.append("quit")
+
+@pytest.fixture
+def fake_smtp(app, db, monkeypatch):
+    FakeSMTP.connections, FakeSMTP.refuse_next = [], 0
+    for key, value in {"MAIL_SERVER": "smtp.test", "MAIL_PORT": 587, "MAIL_USERNAME": "noreply@test",
+                       "MAIL_PASSWORD": "secret", "MAIL_DEFAULT_SENDER": "noreply@test"}.items():
+        monkeypatch.setitem(app.config, key, value)
+    monkeypatch.setattr(mail_sender, "connection_factory", FakeSMTP)
+    db.session.execute(delete(Job)) # e.g. rating replays queued by earlier match deletes
+    db.session.commit()
+    yield FakeSMTP
+    mail_sender.close()
+    db.session.rollback()
+    db.session.execute(delete(Job))
+    db.session.commit()
+
+def _forgot(client, email):
+    response = client.post("/api/auth/forgot-password", json={"email": email})
+    assert response.status_code == 200
+
+def _jobs(db):
+    db.session.expire_all()
+    return db.session.scalars(select(Job).order_by(Job.id)).all()
+
+# --- Tests ---
+
+def test_reset_emails_are_jobs_sent_over_one_connection(client, db, test_user, fake_smtp):
+    email = test_user["user_obj"].email
+    _forgot(client, email)
+    _forgot(client, email)
+
+    assert [(job.kind, job.status, job.attempts) for job in _jobs(db)] == [(PASSWORD_RESET_JOB, "done", 1)] * 2
+    assert len(fake_smtp.connections) == 1
+    connection = fake_smtp.connections[0]
+    assert connection.calls == ["starttls", "login"]
+    assert [message["To"] for message in connection.sent] == [email, email]
+    assert "/reset-password/" in connection.sent[0].get_body(("plain",)).get_content()
+
+def test_dropped_connection_is_reopened(client, db, test_user, fake_smtp):
+    email = test_user["user_obj"].email
+    _forgot(client, email)
+    fake_smtp.connections[0].calls.append("dropped") # The server closed the idle connection
+    _forgot(client, email)
+
+    assert [job.status for job in _jobs(db)] == ["done", "done"]
+    assert [len(connection.sent) for connection in fake_smtp.connections] == [1, 1]
+    assert fake_smtp.connections[0].calls[-1] == "quit"
+
+def test_unknown_email_queues_nothing(client, db, fake_smtp):
+    _forgot(client, "nobody-here@example.com")
+    assert _jobs(db) == []
+
+def test_failed_delivery_is_retried_with_backoff(client, db, test_user, fake_smtp):
+    fake_smtp.refuse_next = 1
+    _forgot(client, test_user["user_obj"].email)
+
+    job = _jobs(db)[0]
+    assert (job.status, job.attempts) == ("pending", 1)
+    assert "ConnectionRefusedError" in job.last_error
+    run_after = job.run_after if job.run_after.tzinfo else job.run_after.replace(tzinfo=timezone.utc)
+    assert run_after > datetime.now(timezone.utc)
+    assert jobs.run_due() == 0 # Backoff has not elapsed
+
+    db.session.execute(update(Job).values(run_after=datetime.now(timezone.utc) - timedelta(seconds=1)))
+    db.session.commit()
+    assert jobs.run_due() == 1
+    job = _jobs(db)[0]
+    assert (job.status, job.attempts, job.last_error) == ("done", 2, None)
+    assert len(fake_smtp.connections[0].sent) == 1
+
+def test_missing_mail_configuration_fails_without_retrying(app, client, db, test_user, fake_smtp, monkeypatch):
+    monkeypatch.setitem(app.config, "MAIL_SERVER", None)
+    _forgot(client, test_user["user_obj"].email)
+    job = _jobs(db)[0]
+    assert (job.status, job.attempts) == ("failed", 1)
+    assert "Missing mail configuration" in job.last_error
+
+def test_thread_executor_runs_jobs_off_the_calling_thread(app, db, fake_smtp):
+    queue = JobQueue()
+    queue.app, queue.mode, queue.poll_seconds = app, EXECUTOR_THREAD, 0
+    ran_on = []
+    queue.handler("probe")(lambda payload: ran_on.append((threading.current_thread().name, payload)))
+    try:
+        queue.enqueue("probe", {"n": 1})
+        queue.drain(timeout=10)
+    finally:
+        queue.shutdown()
+
+    assert len(ran_on) == 1 and ran_on[0][0].startswith("jobs") and ran_on[0][1] == {"n": 1}
+    assert [job.status for job in _jobs(db)] == ["done"]
+
+def test_start_runs_the_poller_once_per_process(app):
+    queue = JobQueue()
+    queue.app, queue.mode, queue.poll_seconds = app, EXECUTOR_INLINE, 3600
+    queue.start()
+    assert queue._executor is None # Inline mode has no threads
+
+    queue.mode = EXECUTOR_THREAD
+    try:
+        queue.start()
+        executor, poller = queue._executor, queue._poller
+        assert queue._pid == os.getpid() and poller.is_alive()
+        queue.start()
+        assert queue._executor is executor
+
+        queue._pid = None # As seen by a forked child: the parent's threads are gone
+        queue.start()
+        assert queue._executor is not executor and queue._poller is not poller
+    finally:
+        queue.shutdown()
+        executor.shutdown()
@@ -0,0 +1,90 @@
+# backend/tests/auth/test_password_hashing.py
+
+import threading
+import bcrypt
+from flask_bcrypt import Bcrypt
+from backend.password_hasher import password_hasher, PasswordHasher, rounds_of, EXECUTOR_PROCESS, EXECUTOR_THREAD
+
+# --- Helpers ---
+
+def _login(client, user, password):
+    return client.post("/api/auth/login", json={"email": user.email, "password": password})
+
+# --- Tests ---
+
+def test_login_rehashes_when_the_cost_factor_changed(client, db, test_user):
+    user, password = test_user["user_obj"], test_user["password"]
+    user.password_hash = password_hasher.hash(password, rounds=4)
+    db.session.commit()
+    verified_before = password_hasher.stats()["verify"]["count"]
+
+    response = _login(client, user, password)
+    assert response.status_code == 200
+    assert any(timing.startswith("hash;dur=") for timing in response.headers.getlist("Server-Timing"))
+    db.session.refresh(user)
+    assert rounds_of(user.password_hash) == password_hasher.rounds
+    assert password_hasher.verify(user.password_hash, password)
+    assert password_hasher.stats()["verify"]["count"] > verified_before
+
+    # Already at the current cost: the stored hash is left alone
+    current_hash = user.password_hash
+    assert _login(client, user, password).status_code == 200
+    db.session.refresh(user)
+    assert user.password_hash == current_hash
+
+def test_wrong_password_does_not_rehash(client, db, test_user):
+    user = test_user["user_obj"]
+    user.password_hash = password_hasher.hash(test_user["password"], rounds=4)
+    db.session.commit()
+    assert _login(client, user, "not-the-password").status_code == 401
+    db.session.refresh(user)
+    assert rounds_of(user.password_hash) == 4
+
+def test_busy_hasher_returns_503(client, test_user, monkeypatch):
+    monkeypatch.setattr(password_hasher, "queue_timeout", 0.01)
+    _, slots = password_hasher._ensure_started()
+    taken = 0
+    while slots.acquire(blocking=False):
+        taken += 1
+    try:
+        response = _login(client, test_user["user_obj"], test_user["password"])
+    finally:
+        for _ in range(taken):
+            slots.release()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.get_json()["type"] == "HASHING_BUSY"
+
+def test_process_pool_hashes_are_flask_bcrypt_compatible():
+    hasher = PasswordHasher()
+    hasher.mode, hasher.rounds = EXECUTOR_PROCESS, 4
+    try:
+        password_hash = hasher.hash("Sw0rdfish!")
+        assert hasher.verify(password_hash, "Sw0rdfish!")
+        assert not hasher.verify(password_hash, "swordfish")
+        assert Bcrypt().check_password_hash(password_hash, "Sw0rdfish!")
+        assert hasher.verify(Bcrypt().generate_password_hash("Sw0rdfish!", 4).decode("utf-8"), "Sw0rdfish!")
+    finally:
+        hasher.shutdown()
+    assert not hasher.verify("not-a-bcrypt-hash", "Sw0rdfish!")
+    assert hasher.stats()["hash"]["count"] == 1
+
+def test_thread_pool_is_the_default_and_hashes_off_the_calling_thread(monkeypatch):
+    hasher = PasswordHasher()
+    assert hasher.mode == EXECUTOR_THREAD
+    hasher.rounds = 4
+    ran_on = []
+    real_hashpw = bcrypt.hashpw
+    def recording_hashpw(password, salt):
+        ran_on.append(threading.current_thread().name)
+        return real_hashpw(password, salt)
+    monkeypatch.setattr(bcrypt, "hashpw", recording_hashpw)
+    try:
+        assert hasher.verify(hasher.hash("Sw0rdfish!"), "Sw0rdfish!")
+    finally:
+        hasher.shutdown()
+    assert ran_on and ran_on[0].startswith("bcrypt")
+
+def test_tune_bcrypt_cli(app):
+    result = app.test_cli_runner().invoke(args=["tune-bcrypt", "--min-rounds", "4", "--max-rounds", "5", "--target-ms", "10000"])
+    assert "Suggested BCRYPT_LOG_ROUNDS=5" in result.output, result.output
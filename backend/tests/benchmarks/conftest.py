@@ -0,0 +1,151 @@
+# backend/tests/benchmarks/conftest.py
+#
+# Latency benchmarks over synthetic datasets. Opt-in, since seeding 100k matches
+# takes a while:
+#
+#   BENCHMARK_SIZES=1000,10000,100000 pytest backend/tests/benchmarks
+#
+# Each benchmark is compared with baselines.json and fails when its median is more
+# than BENCHMARK_TOLERANCE times the stored one (and at least MIN_SLACK_MS slower).
+# BENCHMARK_SAVE=1 rewrites the baselines from the current run (do this on the
+# reference machine only).
+
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+import pytest
+from sqlalchemy import select, insert, delete, func
+from backend import db as _db
+from backend.models import Commander, Deck, DeckStats, User
+from backend.services.commanders import invalidate_commander_catalog
+from backend.services.synthetic_data_service import seed_synthetic_data, purge_synthetic_data, DEFAULT_PASSWORD
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+SIZES = [int(size) for size in os.environ.get("BENCHMARK_SIZES", "").split(",") if size.strip()]
+ROUNDS = int(os.environ.get("BENCHMARK_ROUNDS", "7"))
+TOLERANCE = float(os.environ.get("BENCHMARK_TOLERANCE", "3.0"))
+# Sub-millisecond timings are mostly noise; never fail on less than this much slowdown
+MIN_SLACK_MS = 5.0
+SAVE_BASELINES = os.environ.get("BENCHMARK_SAVE") == "1"
+SYNTHETIC_USERS = 4
+BENCH_COMMANDERS = 400
+BENCH_COMMANDER_PREFIX = "bench-"
+# Pairing flags spread over the benchmark commanders (None = solo)
+BENCH_FLAG_CYCLE = ["partner", None, "background", None, "choose_a_background", None, "friends_forever", None, None, None]
+
+_results = {}
+
+def pytest_generate_tests(metafunc):
+    if "dataset_size" in metafunc.fixturenames:
+        if SIZES:
+            metafunc.parametrize("dataset_size", SIZES, scope="module")
+        else:
+            metafunc.parametrize("dataset_size", [
+                pytest.param(0, marks=pytest.mark.skip(reason="Set BENCHMARK_SIZES (e.g. 1000,10000) to run benchmarks."))
+            ], scope="module")
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    baselines = _load_baselines()
+    terminalreporter.section("benchmarks (ms)")
+    terminalreporter.write_line(f"{'benchmark':<45}{'min':>10}{'median':>10}{'baseline':>10}")
+    for name, timing in sorted(_results.items()):
+        baseline = baselines.get(name, {}).get("median_ms")
+        terminalreporter.write_line(
+            f"{name:<45}{timing['min_ms']:>10.2f}{timing['median_ms']:>10.2f}{baseline if baseline is not None else '-':>10}"
+        )
+    if SAVE_BASELINES:
+        baselines.update(_results)
+        BASELINES_PATH.write_text(json.dumps(dict(sorted(baselines.items())), indent=2) + "\n")
+        terminalreporter.write_line(f"Baselines written to {BASELINES_PATH}.")
+
+def _load_baselines():
+    return json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+
+# --- Dataset ---
+
+def _ensure_bench_commanders():
+    """Adds generic commanders when the test database has too few to build varied pods."""
+    if _db.session.scalar(select(func.count(Commander.id))) >= BENCH_COMMANDERS:
+        return False
+    _db.session.execute(insert(Commander), [{
+        "scryfall_id": f"{BENCH_COMMANDER_PREFIX}{n}",
+        "name": f"Benchmark Commander {n:03d}",
+        "mana_cost": "{2}{G}",
+        "type_line": "Legendary Creature — Elf",
+        "oracle_text": "",
+        "set_code": "bch",
+        **({flag: True} if (flag := BENCH_FLAG_CYCLE[n % len(BENCH_FLAG_CYCLE)]) else {}),
+    } for n in range(BENCH_COMMANDERS)])
+    _db.session.commit()
+    return True
+
+@pytest.fixture(scope="module")
+def synthetic_dataset(app, dataset_size):
+    """
+    `dataset_size` matches spread over SYNTHETIC_USERS synthetic users. Yields the
+    first user's id, credentials, most-played active deck and three commander ids
+    for opponents. Removed when the module finishes.
+    """
+    echo = _db.engine.echo
+    _db.engine.echo = False  # Statement logging would dominate the timings
+    added_commanders = _ensure_bench_commanders()
+    invalidate_commander_catalog()
+    report = seed_synthetic_data(SYNTHETIC_USERS, dataset_size // SYNTHETIC_USERS, seed=dataset_size)
+    user_id = report["user_ids"][0]
+    deck_id = _db.session.scalar(
+        select(Deck.id).join(DeckStats, DeckStats.deck_id == Deck.id)
+        .where(Deck.user_id == user_id, Deck.is_active.is_(True))
+        .order_by(DeckStats.total_matches.desc()).limit(1)
+    )
+    email = _db.session.scalar(select(User.email).where(User.id == user_id))
+    opponent_ids = _db.session.scalars(select(Commander.id).order_by(Commander.id).limit(3)).all()
+    yield {
+        "size": dataset_size, "user_id": user_id, "email": email, "password": DEFAULT_PASSWORD,
+        "deck_id": deck_id, "opponent_ids": opponent_ids,
+    }
+
+    purge_synthetic_data()
+    if added_commanders:
+        _db.session.execute(delete(Commander).where(Commander.scryfall_id.like(f"{BENCH_COMMANDER_PREFIX}%")))
+    _db.session.commit()
+    invalidate_commander_catalog()
+    _db.engine.echo = echo
+
+@pytest.fixture
+def synthetic_client(client, synthetic_dataset):
+    """The shared test client logged in as the dataset's user, plus a CSRF token."""
+    response = client.post("/api/auth/login", json={"email": synthetic_dataset["email"], "password": synthetic_dataset["password"]})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return client, client.get("/api/auth/csrf_token").get_json()["csrf_token"]
+
+# --- Timer ---
+
+@pytest.fixture
+def bench(request, dataset_size):
+    """
+    bench(fn) calls fn once to warm up, then ROUNDS times, records min/median in ms
+    under '<test name>[<size>]' and checks the median against the stored baseline.
+    """
+    def run(fn):
+        fn()
+        timings = []
+        for _ in range(ROUNDS):
+            started = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        name = f"{request.node.originalname.removeprefix('test_')}[{dataset_size}]"
+        _results[name] = {"min_ms": round(min(timings), 3), "median_ms": round(statistics.median(timings), 3), "rounds": ROUNDS}
+
+        baseline = _load_baselines().get(name)
+        if baseline and not SAVE_BASELINES:
+            limit = max(baseline["median_ms"] * TOLERANCE, baseline["median_ms"] + MIN_SLACK_MS)
+            assert _results[name]["median_ms"] <= limit, (
+                f"{name} regressed: median {_results[name]['median_ms']:.2f} ms > {limit:.2f} ms "
+                f"(baseline {baseline['median_ms']:.2f} ms, tolerance {TOLERANCE}x)"
+            )
+        return _results[name]
+    return run
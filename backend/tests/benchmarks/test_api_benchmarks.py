@@ -0,0 +1,64 @@
+# backend/tests/benchmarks/test_api_benchmarks.py
+
+from backend.services.matches import get_all_decks_stats, get_matches_by_user
+from backend.services.commanders import search_commanders, invalidate_commander_catalog
+
+HISTORY_PAGE_SIZE = 50
+
+# --- Service Benchmarks ---
+
+def test_get_all_decks_stats(bench, synthetic_dataset):
+    user_id = synthetic_dataset["user_id"]
+    bench(lambda: get_all_decks_stats(user_id))
+
+def test_get_matches_by_user(bench, synthetic_dataset):
+    user_id = synthetic_dataset["user_id"]
+    bench(lambda: get_matches_by_user(user_id, limit=HISTORY_PAGE_SIZE, offset=0))
+
+def test_search_commanders(bench, synthetic_dataset, app):
+    app.config["COMMANDER_CATALOG_CHECK_SECONDS"] = 30
+    invalidate_commander_catalog()
+    try:
+        bench(lambda: search_commanders("comm", limit=20))
+    finally:
+        app.config["COMMANDER_CATALOG_CHECK_SECONDS"] = 0
+
+# --- Endpoint Benchmarks ---
+
+def test_deck_details(bench, synthetic_dataset, synthetic_client):
+    client, _ = synthetic_client
+    path = f"/api/decks/{synthetic_dataset['deck_id']}"
+
+    def request():
+        assert client.get(path).status_code == 200
+    bench(request)
+
+def test_get_performance_summary(bench, synthetic_dataset, synthetic_client):
+    client, _ = synthetic_client
+
+    def request():
+        assert client.get("/api/performance-summary").status_code == 200
+    bench(request)
+
+def test_get_performance_timeseries(bench, synthetic_dataset, synthetic_client):
+    client, _ = synthetic_client
+
+    def request():
+        assert client.get("/api/performance/timeseries?window=20").status_code == 200
+    bench(request)
+
+def test_log_match(bench, synthetic_dataset, synthetic_client):
+    client, csrf_token = synthetic_client
+    opponents = {
+        str(seat): [{"id": commander_id, "role": "primary"}]
+        for seat, commander_id in zip((1, 3, 4), synthetic_dataset["opponent_ids"])
+    }
+    payload = {
+        "deck_id": synthetic_dataset["deck_id"], "result": 0, "player_position": 2, "player_mulligans": 1,
+        "tags": ["benchmark"], "opponent_commanders_by_seat": opponents,
+    }
+
+    def request():
+        response = client.post("/api/log_match", json=payload, headers={"X-CSRF-TOKEN": csrf_token})
+        assert response.status_code == 201, response.get_data(as_text=True)
+    bench(request)
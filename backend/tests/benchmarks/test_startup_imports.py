@@ -0,0 +1,56 @@
+# backend/tests/benchmarks/test_startup_imports.py
+#
+# Cold-start budget. Each scale-from-zero boot pays for `import app`, which also
+# runs create_app. These tests measure it in a fresh interpreter with
+# `python -X importtime`. They take about a second, so they run with the regular
+# suite. On a slow machine, raise the budget with STARTUP_BUDGET_MS.
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "2500"))
+# Needed by `flask <command>` only; serving requests must not import them
+CLI_ONLY_MODULES = {"manage", "requests", "flask_migrate", "alembic"}
+
+# --- Helpers ---
+
+def _import_app():
+    """Returns (stdout, {module: cumulative import µs}, other stderr lines) for `import app`."""
+    env = {**os.environ, "FLASK_ENV": "testing"}
+    env.pop("LOG_LEVEL", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    timings, other_lines = {}, []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            other_lines.append(line)
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            timings.setdefault(module.strip(), int(cumulative))
+    return result.stdout, timings, other_lines
+
+# --- Tests ---
+
+def test_app_startup_within_budget():
+    stdout, timings, other_lines = _import_app()
+    assert CLI_ONLY_MODULES.isdisjoint(timings), sorted(CLI_ONLY_MODULES & set(timings))
+    startup_ms = timings["app"] / 1000
+    assert startup_ms <= STARTUP_BUDGET_MS, f"import app took {startup_ms:.0f} ms (budget {STARTUP_BUDGET_MS:.0f} ms)"
+
+    # Silent factory: nothing on stdout, and INFO is below the default level outside development
+    assert stdout == ""
+    assert not [line for line in other_lines if " INFO in " in line], other_lines
+
+def test_cli_commands_load_on_demand(app):
+    runner = app.test_cli_runner()
+    assert {"db", "purge-sessions", "update-commanders"} <= set(app.cli.list_commands(None))
+    result = runner.invoke(args=["db", "--help"])
+    assert "upgrade" in result.output, result.output
+    assert "migrate" in app.extensions
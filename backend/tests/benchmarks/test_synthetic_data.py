@@ -0,0 +1,58 @@
+# backend/tests/benchmarks/test_synthetic_data.py
+
+import pytest
+from sqlalchemy import select, func
+from backend.models import User, LoggedMatch, OpponentSeatSignature
+from backend.services.decks.deck_stats_service import verify_deck_stats
+from backend.services.synthetic_data_service import seed_synthetic_data, purge_synthetic_data, SYNTHETIC_EMAIL_DOMAIN
+
+# --- Fixtures ---
+
+@pytest.fixture
+def purge_after(db):
+    yield
+    purge_synthetic_data()
+    db.session.commit()
+
+def _synthetic_user_count(db):
+    return db.session.scalar(select(func.count(User.id)).where(User.email.like(f"%@{SYNTHETIC_EMAIL_DOMAIN}")))
+
+def _match_shapes(db, user_id):
+    return db.session.execute(
+        select(LoggedMatch.result, LoggedMatch.player_position, LoggedMatch.player_mulligans, LoggedMatch.is_active)
+        .where(LoggedMatch.logger_user_id == user_id).order_by(LoggedMatch.timestamp)
+    ).all()
+
+# --- Tests ---
+
+def test_seed_synthetic_data_builds_consistent_pods(db, commanders, purge_after):
+    report = seed_synthetic_data(2, 60, decks_per_user=4, seed=11)
+    assert len(report["user_ids"]) == 2
+    assert report["matches"] == 120 and report["decks"] == 8
+
+    for user_id in report["user_ids"]:
+        matches = db.session.execute(
+            select(LoggedMatch.id, LoggedMatch.is_active, LoggedMatch.deleted_at).where(LoggedMatch.logger_user_id == user_id)
+        ).all()
+        assert len(matches) == 60
+        assert all((match.deleted_at is None) == match.is_active for match in matches)
+        # Every pod has three opponent seats, each with a signature
+        assert db.session.scalar(
+            select(func.count()).select_from(OpponentSeatSignature).where(OpponentSeatSignature.logger_user_id == user_id)
+        ) == 60 * 3
+        assert verify_deck_stats(user_id) == []
+
+def test_seed_synthetic_data_is_reproducible(db, commanders, purge_after):
+    first = seed_synthetic_data(1, 30, seed=5)["user_ids"][0]
+    second = seed_synthetic_data(1, 30, seed=5)["user_ids"][0]
+    assert _match_shapes(db, first) == _match_shapes(db, second)
+
+def test_seed_synthetic_cli_and_purge(app, db, commanders, purge_after):
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["seed-synthetic", "--users", "2", "--matches-per-user", "5", "--seed", "3"])
+    assert "Created 2 users" in result.output, result.output
+    assert _synthetic_user_count(db) == 2
+
+    result = runner.invoke(args=["seed-synthetic", "--purge"])
+    assert "Removed 2 synthetic users" in result.output, result.output
+    assert _synthetic_user_count(db) == 0
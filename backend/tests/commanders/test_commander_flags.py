@@ -0,0 +1,52 @@
+# backend/tests/commanders/test_commander_flags.py
+
+import pytest
+from sqlalchemy import select, delete
+from backend.models import Commander
+from backend.services.commanders.commander_flag_service import classify_flags, reclassify_commander_flags, FLAG_NAMES
+
+# --- Fixtures ---
+
+@pytest.fixture
+def flag_commanders(db):
+    rows = [
+        # Stale partner flag that no longer applies, and a missing friends_forever flag
+        Commander(scryfall_id="flags-test-1", name="Flags Stale Test", type_line="Legendary Creature — Human",
+                  oracle_text="Friends forever (You can have two commanders if both have friends forever.)", partner=True),
+        Commander(scryfall_id="flags-test-2", name="Flags Background Test", type_line="Legendary Enchantment — Background",
+                  oracle_text="Commander creatures you own have haste.", background=True),
+        Commander(scryfall_id="flags-test-3", name="Flags Doctor Test", type_line="Legendary Creature — Time Lord Doctor",
+                  oracle_text="Whenever you attack, investigate."),
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    yield {row.scryfall_id: row.id for row in rows}
+    db.session.execute(delete(Commander).where(Commander.scryfall_id.like("flags-test-%")))
+    db.session.commit()
+
+# --- Tests ---
+
+def test_classify_flags():
+    assert classify_flags("Legendary Creature — Cat", "Partner with Pir\nFlying")["partner"]
+    assert not classify_flags("Legendary Creature — Cat", "Your partners draw a card.")["partner"]
+    assert classify_flags("Legendary Creature — Human", "Doctor’s companion")["doctor_companion"]
+    assert classify_flags("Legendary Enchantment — Background", "")["background"]
+    assert classify_flags("Legendary Creature — Elf", "Choose a Background")["choose_a_background"]
+    assert classify_flags(None, None) == dict.fromkeys(FLAG_NAMES, False)
+
+def test_reclassify_sets_and_clears_only_changed_rows(db, flag_commanders):
+    report = reclassify_commander_flags(list(flag_commanders.values()))
+    db.session.commit()
+    assert (report["checked"], report["changed"]) == (3, 2)
+    assert report["cleared"]["partner"] == 1
+    assert report["set"]["friends_forever"] == 1 and report["set"]["time_lord_doctor"] == 1
+
+    db.session.expire_all()
+    rows = {c.scryfall_id: c for c in db.session.scalars(select(Commander).where(Commander.id.in_(flag_commanders.values())))}
+    stale = rows["flags-test-1"]
+    assert (stale.partner, stale.friends_forever) == (False, True)
+    assert stale.content_hash is not None
+    assert rows["flags-test-2"].content_hash is None
+    assert rows["flags-test-3"].time_lord_doctor
+
+    assert reclassify_commander_flags(list(flag_commanders.values()))["changed"] == 0
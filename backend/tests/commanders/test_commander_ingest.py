@@ -0,0 +1,109 @@
+# backend/tests/commanders/test_commander_ingest.py
+
+import io
+import json
+import os
+import pytest
+from datetime import datetime
+from sqlalchemy import select, delete, update
+from backend.models import Commander, OpponentSeatSignature, Rating
+from backend.services.commanders.commander_ingest_service import (
+    iter_json_array, ingest_bulk_file, content_hash, HASHED_COLUMNS, BulkDataError
+)
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "scryfall_oracle_cards_sample.json")
+STALE_TIMESTAMP = datetime(2020, 1, 1)
+
+# --- Fixtures ---
+
+@pytest.fixture
+def ingested_cleanup(db):
+    yield
+    db.session.execute(delete(Commander).where(Commander.scryfall_id.like("ingest-test-%")))
+    db.session.commit()
+
+def _ingested(db):
+    db.session.expire_all()
+    return {c.scryfall_id: c for c in db.session.scalars(select(Commander).where(Commander.scryfall_id.like("ingest-test-%")))}
+
+# --- Tests ---
+
+def test_iter_json_array_streams_across_chunk_boundaries():
+    with open(FIXTURE_PATH, encoding="utf-8") as fp:
+        expected = json.load(fp)
+    with open(FIXTURE_PATH, encoding="utf-8") as fp:
+        assert list(iter_json_array(fp, chunk_size=7)) == expected
+    assert list(iter_json_array(io.StringIO(" [ ] "))) == []
+
+    for bad in ('{"id": 1}', '[{"id": 1}, {"id": ', ""):
+        with pytest.raises(BulkDataError):
+            list(iter_json_array(io.StringIO(bad), chunk_size=4))
+
+def test_ingest_filters_and_sets_flags(db, ingested_cleanup):
+    report = ingest_bulk_file(FIXTURE_PATH, batch_size=2)
+    assert report == {"read": 9, "added": 5, "changed": 0, "unchanged": 0, "skipped": 4}
+
+    rows = _ingested(db)
+    assert all(row.content_hash == content_hash({c: getattr(row, c) for c in HASHED_COLUMNS}) for row in rows.values())
+    assert set(rows) == {"ingest-test-0001", "ingest-test-0002", "ingest-test-0003", "ingest-test-0007", "ingest-test-0008"}
+    kraum = rows["ingest-test-0001"]
+    assert (kraum.partner, kraum.background, kraum.colors, kraum.art_crop) == (True, False, "R,U", "https://img.test/kraum_art.jpg")
+    assert rows["ingest-test-0002"].background and not rows["ingest-test-0002"].partner
+    assert rows["ingest-test-0003"].choose_a_background
+    dfc = rows["ingest-test-0008"]
+    assert dfc.doctor_companion and dfc.image_url == "https://img.test/front.jpg"
+    assert "Haste" in dfc.oracle_text
+
+def test_ingest_only_touches_changed_cards(app, db, tmp_path, ingested_cleanup):
+    ingest_bulk_file(FIXTURE_PATH)
+    original_id = _ingested(db)["ingest-test-0002"].id
+    db.session.execute(
+        update(Commander).where(Commander.scryfall_id.like("ingest-test-%")).values(updated_at=STALE_TIMESTAMP)
+    )
+    db.session.commit()
+
+    assert ingest_bulk_file(FIXTURE_PATH)["unchanged"] == 5
+    assert {row.updated_at for row in _ingested(db).values()} == {STALE_TIMESTAMP}
+
+    with open(FIXTURE_PATH, encoding="utf-8") as fp:
+        cards = json.load(fp)
+    cards[2]["name"] = "Ingest Background Renamed Test"
+    updated_path = tmp_path / "oracle_cards.json"
+    updated_path.write_text(json.dumps(cards), encoding="utf-8")
+
+    result = app.test_cli_runner().invoke(args=["update-commanders", "--bulk-file", str(updated_path)])
+    assert "Added: 0, Changed: 1, Unchanged: 4" in result.output, result.output
+    rows = _ingested(db)
+    assert len(rows) == 5
+    assert rows["ingest-test-0002"].id == original_id
+    assert rows["ingest-test-0002"].name == "Ingest Background Renamed Test"
+    assert rows["ingest-test-0002"].updated_at > STALE_TIMESTAMP
+    assert rows["ingest-test-0001"].updated_at == STALE_TIMESTAMP
+
+def test_renamed_commanders_rebuild_logged_signatures(app, db, tmp_path, logged_in_client, setup_deck, ingested_cleanup):
+    client, csrf_token = logged_in_client
+    ingest_bulk_file(FIXTURE_PATH)
+    background = _ingested(db)["ingest-test-0002"]
+    response = client.post("/api/log_match", headers={"X-CSRF-TOKEN": csrf_token}, json={
+        "deck_id": setup_deck["deck"].id, "result": 1, "player_position": 1,
+        "opponent_commanders_by_seat": {"2": [{"id": background.id, "role": "primary"}]}
+    })
+    assert response.status_code == 201
+    match_id = response.get_json()["match"]["id"]
+
+    with open(FIXTURE_PATH, encoding="utf-8") as fp:
+        cards = json.load(fp)
+    cards[2]["name"] = "Ingest Background Renamed Test"
+    updated_path = tmp_path / "oracle_cards.json"
+    updated_path.write_text(json.dumps(cards), encoding="utf-8")
+    result = app.test_cli_runner().invoke(args=["update-commanders", "--bulk-file", str(updated_path)])
+    assert "rebuilding opponent signatures for 1 users" in result.output, result.output
+
+    db.session.expire_all()
+    assert db.session.scalar(
+        select(OpponentSeatSignature.signature).where(OpponentSeatSignature.logged_match_id == match_id)
+    ) == "Ingest Background Renamed Test"
+    user_id = setup_deck["deck"].user_id
+    assert "Ingest Background Renamed Test" in db.session.scalars(
+        select(Rating.signature).where(Rating.user_id == user_id, Rating.signature.isnot(None))
+    ).all()
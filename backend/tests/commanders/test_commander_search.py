@@ -0,0 +1,69 @@
+# backend/tests/commanders/test_commander_search.py
+
+import pytest
+from collections import namedtuple
+from datetime import datetime, timedelta
+from sqlalchemy import delete
+from backend.models import Commander
+from backend.services.commanders import commander_catalog_service as catalog_service
+from backend.services.commanders.commander_catalog_service import CommanderCatalog, PAIRING_FLAGS
+
+Row = namedtuple("Row", ["id", "name", "image_url", "art_crop"] + PAIRING_FLAGS)
+
+# --- Helpers ---
+
+def _row(id, name, **flags):
+    return Row(id, name, f"img/{id}", None, **{flag: flags.get(flag, False) for flag in PAIRING_FLAGS})
+
+def _names(results):
+    return [result["name"] for result in results]
+
+# --- Tests ---
+
+def test_catalog_ranks_prefix_then_word_prefix_then_substring():
+    catalog = CommanderCatalog([
+        _row(1, "Atraxa, Praetors' Voice"),
+        _row(2, "Sythis, Harvest's Hand"),
+        _row(3, "Praetor's Grasp Keeper", partner=True),
+        _row(4, "Kraum, Ludevic's Opus", partner=True),
+        _row(5, "Araumi of the Dead Tide"),
+    ], version=("v", 5))
+
+    assert _names(catalog.search("pra")) == ["Praetor's Grasp Keeper", "Atraxa, Praetors' Voice"]
+    assert _names(catalog.search("RAUM")) == ["Araumi of the Dead Tide", "Kraum, Ludevic's Opus"]
+    assert _names(catalog.search("ra", relation_type="partner")) == ["Kraum, Ludevic's Opus", "Praetor's Grasp Keeper"]
+    assert _names(catalog.search("a", limit=2)) == ["Araumi of the Dead Tide", "Atraxa, Praetors' Voice"]
+    assert catalog.search("zzz") == []
+    assert catalog.search("praetors'")[0] == {"id": 1, "name": "Atraxa, Praetors' Voice", "image_url": "img/1"}
+
+def test_search_route_filters_by_pairing_type(client, commanders):
+    response = client.get("/api/search_commanders?q=cmdr")
+    assert {"Solo Cmdr Test", "Partner Cmdr 1 Test", "Partner Cmdr 2 Test"} <= set(_names(response.get_json()))
+
+    partners = _names(client.get("/api/search_commanders?q=test&type=partner").get_json())
+    assert "Partner Cmdr 1 Test" in partners and "Solo Cmdr Test" not in partners
+    backgrounds = _names(client.get("/api/search_commanders?q=test&type=choose_a_background").get_json())
+    assert backgrounds == ["Is Background Test"]
+    assert client.get("/api/search_commanders?q=").get_json() == []
+
+def test_catalog_is_served_from_memory_and_reloads_on_change(app, client, db, commanders, monkeypatch):
+    app.config["COMMANDER_CATALOG_CHECK_SECONDS"] = 3600
+    try:
+        client.get("/api/search_commanders?q=solo")
+        with monkeypatch.context() as patch:
+            patch.setattr(catalog_service, "_catalog_version", lambda: pytest.fail("catalog version was queried"))
+            assert "Solo Cmdr Test" in _names(client.get("/api/search_commanders?q=solo").get_json())
+    finally:
+        app.config["COMMANDER_CATALOG_CHECK_SECONDS"] = 0
+
+    db.session.add(Commander(
+        scryfall_id="catalog_new_test", name="Solo Newcomer Test",
+        updated_at=datetime.utcnow() + timedelta(days=1)
+    ))
+    db.session.commit()
+    try:
+        assert "Solo Newcomer Test" in _names(client.get("/api/search_commanders?q=solo").get_json())
+    finally:
+        db.session.execute(delete(Commander).where(Commander.scryfall_id == "catalog_new_test"))
+        db.session.commit()
+    assert "Solo Newcomer Test" not in _names(client.get("/api/search_commanders?q=solo").get_json())
@@ -7,8 +7,11 @@ from flask_bcrypt import Bcrypt
 from flask.testing import FlaskClient
 # Updated import: Replace Match with LoggedMatch
 from backend.models import (
-    User, Commander, DeckType, Deck, CommanderDeck, Tag, UserDeck, LoggedMatch
+    User, Commander, DeckType, Deck, CommanderDeck, Tag, UserDeck, LoggedMatch, DeckStats,
+    OpponentCommanderInMatch, OpponentSeatSignature, Rating
 )
+from backend.models.logged_match import match_tags
+from backend.models.tag import deck_tags
 from sqlalchemy import select, delete
 from datetime import datetime, timezone
 import logging
@@ -17,6 +20,23 @@ ORIGINAL_DATABASE_URL = os.environ.get('DATABASE_URL')
 ORIGINAL_FLASK_ENV = os.environ.get('FLASK_ENV')
 logger = logging.getLogger("conftest")
 
+def purge_user_data(db, user_id):
+    """Hard-deletes a user's decks, matches, tags and their link rows (SQLite does not cascade)."""
+    match_ids = select(LoggedMatch.id).where(LoggedMatch.logger_user_id == user_id)
+    deck_ids = select(Deck.id).where(Deck.user_id == user_id)
+    tag_ids = select(Tag.id).where(Tag.user_id == user_id)
+    db.session.execute(delete(match_tags).where(match_tags.c.match_id.in_(match_ids) | match_tags.c.tag_id.in_(tag_ids)))
+    db.session.execute(delete(deck_tags).where(deck_tags.c.deck_id.in_(deck_ids) | deck_tags.c.tag_id.in_(tag_ids)))
+    db.session.execute(delete(OpponentCommanderInMatch).where(OpponentCommanderInMatch.logged_match_id.in_(match_ids)))
+    db.session.execute(delete(OpponentSeatSignature).where(OpponentSeatSignature.logger_user_id == user_id))
+    db.session.execute(delete(LoggedMatch).where(LoggedMatch.logger_user_id == user_id))
+    db.session.execute(delete(DeckStats).where(DeckStats.user_id == user_id))
+    db.session.execute(delete(Rating).where(Rating.user_id == user_id))
+    db.session.execute(delete(UserDeck).where(UserDeck.user_id == user_id))
+    db.session.execute(delete(CommanderDeck).where(CommanderDeck.deck_id.in_(deck_ids)))
+    db.session.execute(delete(Deck).where(Deck.user_id == user_id))
+    db.session.execute(delete(Tag).where(Tag.user_id == user_id))
+
 @pytest.fixture(scope='session')
 def app():
     """Creates and configures a Flask app instance FOR TESTING."""
@@ -102,11 +122,7 @@ def test_user(app, db):
         existing_user = db.session.scalar(select(User).where(User.username == username))
         if existing_user:
             logger.warning(f"Found existing user '{username}' in fixture setup. Cleaning up.")
-            # Add more cleanup as needed based on FKs
-            db.session.execute(delete(LoggedMatch).where(LoggedMatch.logger_user_id == existing_user.id))
-            db.session.execute(delete(Deck).where(Deck.user_id == existing_user.id)) # Cascades should handle CommanderDeck, UserDeck
-            db.session.execute(delete(Tag).where(Tag.user_id == existing_user.id))
-            # Add other direct user dependencies if necessary
+            purge_user_data(db, existing_user.id)
             db.session.delete(existing_user)
             try:
                 db.session.commit()
@@ -178,10 +194,7 @@ def test_user_2(app, db):
         existing_user = db.session.scalar(select(User).where(User.email == email))
         if existing_user:
             logger.warning(f"Found existing user '{email}' (user 2) in fixture setup. Cleaning up.")
-            # Add cleanup for user 2's potential data
-            db.session.execute(delete(LoggedMatch).where(LoggedMatch.logger_user_id == existing_user.id))
-            db.session.execute(delete(Deck).where(Deck.user_id == existing_user.id))
-            db.session.execute(delete(Tag).where(Tag.user_id == existing_user.id))
+            purge_user_data(db, existing_user.id)
             db.session.delete(existing_user)
             try:
                 db.session.commit()
@@ -288,9 +301,9 @@ def commanders(app, db):
         yield commander_ids # Yield IDs for tests to use
 
 @pytest.fixture(scope='function')
-def setup_deck(db, test_user, commanders):
+def setup_deck(app, db, test_user, commanders):
     """Sets up a basic deck, tag, and logged_match for tests."""
-    with db.app.app_context():
+    with app.app_context():
         user = test_user['user_obj']
         if not user or not user.id:
              pytest.fail("setup_deck: test_user fixture failed.")
@@ -319,7 +332,8 @@ def setup_deck(db, test_user, commanders):
         # --- Create LoggedMatch (Updated) ---
         logged_match = LoggedMatch(
             timestamp=datetime.now(timezone.utc),
-            result=1, # Example: Win
+            result=1, # Example: Loss
+            player_position=1,
             logger_user_id=user.id, # Use direct user ID
             deck_id=deck.id # Use direct deck ID
         )
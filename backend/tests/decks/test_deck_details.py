@@ -0,0 +1,89 @@
+# backend/tests/decks/test_deck_details.py
+
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
+from backend.services.decks.deck_analytics_service import get_deck_details
+
+# --- Helpers ---
+
+@contextmanager
+def count_queries(db):
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+def _log(client, csrf_token, deck_id, result, position, mulligans=None, opponents=None):
+    payload = {"deck_id": deck_id, "result": result, "player_position": position}
+    if mulligans is not None:
+        payload["player_mulligans"] = mulligans
+    if opponents:
+        payload["opponent_commanders_by_seat"] = opponents
+    response = client.post("/api/log_match", json=payload, headers={"X-CSRF-TOKEN": csrf_token})
+    assert response.status_code == 201, response.get_data(as_text=True)
+
+# --- Tests ---
+
+@pytest.mark.parametrize("flags", [
+    {},
+    {"include_turn_stats": True},
+    {"include_matchup_stats": True},
+    {"include_turn_stats": True, "include_matchup_stats": True, "recent_matches_limit": 5},
+])
+def test_deck_details_query_count_is_constant(app, db, setup_deck, flags):
+    deck = setup_deck["deck"]
+    with app.app_context():
+        with count_queries(db) as statements:
+            deck_data = get_deck_details(deck.id, deck.user_id, **flags)
+    assert deck_data is not None
+    assert len(statements) == 2, statements
+
+def test_deck_details_unknown_deck_returns_none(app, db, setup_deck):
+    with app.app_context():
+        with count_queries(db) as statements:
+            assert get_deck_details(999999, setup_deck["deck"].user_id) is None
+    assert len(statements) == 1
+
+def test_deck_details_route_payload(logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    deck_id = setup_deck["deck"].id
+    opponents = {"2": [{"id": commanders["no_partner"], "role": "primary"}]}
+    for _ in range(3):
+        _log(client, csrf_token, deck_id, 0, 1, mulligans=0, opponents=opponents)
+    _log(client, csrf_token, deck_id, 1, 2, mulligans=1)
+
+    response = client.get(
+        f"/api/decks/{deck_id}?include_turn_stats=true&include_matchup_stats=true&include_recent_matches=2"
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+
+    assert data["commander_id"] == commanders["no_partner"]
+    assert (data["total_matches"], data["total_wins"]) == (5, 3)
+    # Seat rates are smoothed towards the deck's 3/5 overall rate
+    assert data["turn_order_stats"]["1"] == {
+        "matches": 4, "wins": 3, "win_rate": 75.0,
+        "win_rate_lower": 30.1, "win_rate_upper": 95.4, "smoothed_win_rate": 65.0
+    }
+    assert data["turn_order_stats"]["2"]["matches"] == 1
+    assert [m["label"] for m in data["mulligan_stats"]] == ["Keep First 7", "To 6 (1)"]
+    assert data["mulligan_stats"][0]["win_count"] == 3
+    assert data["matchup_stats"]["favorable"][0]["wins"] == 3
+    assert len(data["recent_matches"]) == 2
+    assert data["recent_matches"][0]["player_position"] == 2
+    assert {tag["name"] for tag in data["tags"]} == {setup_deck["tag"].name}
+
+def test_deck_details_omits_optional_sections(logged_in_client, setup_deck):
+    client, _ = logged_in_client
+    response = client.get(f"/api/decks/{setup_deck['deck'].id}")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert "turn_order_stats" not in data
+    assert "matchup_stats" not in data
+    assert data["recent_matches"] == []
+    assert data["mulligan_stats"] == []
@@ -0,0 +1,89 @@
+# backend/tests/decks/test_deck_stats.py
+
+from backend.models import DeckStats, LoggedMatch
+from backend.services.decks.deck_stats_service import rebuild_deck_stats, verify_deck_stats
+
+# --- Helpers ---
+
+def _log(client, csrf_token, deck_id, result, position):
+    response = client.post("/api/log_match", json={
+        "deck_id": deck_id, "result": result, "player_position": position
+    }, headers={"X-CSRF-TOKEN": csrf_token})
+    assert response.status_code == 201, response.get_data(as_text=True)
+    return response.get_json()["match"]["id"]
+
+def _stats(db, deck_id):
+    db.session.expire_all()
+    return db.session.get(DeckStats, deck_id)
+
+# --- Tests ---
+
+def test_log_match_creates_and_updates_rollup(db, logged_in_client, setup_deck):
+    client, csrf_token = logged_in_client
+    deck_id = setup_deck["deck"].id
+    # setup_deck inserts one loss directly, so the first log_match takes the refresh path.
+    _log(client, csrf_token, deck_id, 0, 1)
+    _log(client, csrf_token, deck_id, 2, 3)
+
+    stats = _stats(db, deck_id)
+    assert stats is not None
+    assert (stats.total_matches, stats.total_wins, stats.total_draws) == (3, 1, 1)
+    assert stats.seat_stats(1) == (2, 1)
+    assert stats.seat_stats(3) == (1, 0)
+    assert verify_deck_stats(setup_deck["deck"].user_id) == []
+
+def test_delete_match_decrements_rollup(db, logged_in_client, setup_deck):
+    client, csrf_token = logged_in_client
+    deck_id = setup_deck["deck"].id
+    first_id = _log(client, csrf_token, deck_id, 0, 1)
+    latest_id = _log(client, csrf_token, deck_id, 1, 4)
+
+    response = client.delete(f"/api/matches/{latest_id}", headers={"X-CSRF-TOKEN": csrf_token})
+    assert response.status_code == 204
+
+    stats = _stats(db, deck_id)
+    first_match = db.session.get(LoggedMatch, first_id)
+    assert (stats.total_matches, stats.total_wins) == (2, 1)
+    assert stats.seat_stats(4) == (0, 0)
+    assert stats.last_match.replace(tzinfo=None) == first_match.timestamp.replace(tzinfo=None)
+    assert verify_deck_stats(setup_deck["deck"].user_id) == []
+
+def test_user_decks_uses_rollup(logged_in_client, setup_deck):
+    client, csrf_token = logged_in_client
+    deck_id = setup_deck["deck"].id
+    _log(client, csrf_token, deck_id, 0, 1)
+
+    response = client.get("/api/user_decks")
+    deck_info = next(d for d in response.get_json() if d["id"] == deck_id)
+    assert deck_info["total_matches"] == 2
+    assert deck_info["total_wins"] == 1
+    assert deck_info["win_rate"] == 50.0
+    assert deck_info["last_match"] is not None
+
+def test_delete_deck_drops_rollup_row(db, logged_in_client, setup_deck):
+    client, csrf_token = logged_in_client
+    deck_id = setup_deck["deck"].id
+    _log(client, csrf_token, deck_id, 0, 1)
+
+    response = client.delete(f"/api/decks/{deck_id}", headers={"X-CSRF-TOKEN": csrf_token})
+    assert response.status_code == 200
+    assert _stats(db, deck_id) is None
+
+def test_rebuild_repairs_drifted_rows(db, setup_deck):
+    deck = setup_deck["deck"]
+    db.session.add(DeckStats(deck_id=deck.id, user_id=deck.user_id, total_matches=42))
+    db.session.commit()
+
+    mismatches = verify_deck_stats(deck.user_id)
+    assert {"deck_id": deck.id, "field": "total_matches", "expected": 1, "actual": 42} in mismatches
+
+    rebuild_deck_stats(deck.user_id)
+    db.session.commit()
+    assert verify_deck_stats(deck.user_id) == []
+    assert _stats(db, deck.id).total_matches == 1
+
+def test_rebuild_deck_stats_cli(app, setup_deck):
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["rebuild-deck-stats", "--user-id", str(setup_deck["deck"].user_id)])
+    assert result.exit_code == 0
+    assert "Deck stats match logged match history" in result.output
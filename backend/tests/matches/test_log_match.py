@@ -0,0 +1,79 @@
+# backend/tests/matches/test_log_match.py
+
+from sqlalchemy import select, func
+from backend.models import Tag, LoggedMatch, OpponentCommanderInMatch
+from backend.routes.matches import resolve_match_tags
+
+# --- Helpers ---
+
+def _post(client, csrf_token, payload):
+    return client.post("/api/log_match", json=payload, headers={"X-CSRF-TOKEN": csrf_token})
+
+# --- Tests ---
+
+def test_log_match_batched_response(db, logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    existing_tag = setup_deck["tag"]
+    response = _post(client, csrf_token, {
+        "deck_id": setup_deck["deck"].id, "result": 0, "player_position": 1,
+        "tags": [existing_tag.id, "Base Tag", "game night", "game night"],
+        "opponent_commanders_by_seat": {
+            "2": [{"id": commanders["can_partner_1"], "role": "primary"}, {"id": commanders["can_partner_2"], "role": "partner"}],
+            "4": [{"id": commanders["no_partner"], "role": "primary"}],
+        }
+    })
+    assert response.status_code == 201, response.get_data(as_text=True)
+    match = response.get_json()["match"]
+
+    assert [tag["name"] for tag in match["tags"]] == ["Base Tag", "game night"]
+    assert [c["name"] for c in match["opponent_commanders_by_seat"]["2"]] == ["Partner Cmdr 1 Test", "Partner Cmdr 2 Test"]
+    assert match["opponent_commanders_by_seat"]["4"][0]["id"] == commanders["no_partner"]
+    assert match["result_text"] == "Win"
+    assert match["is_active"] is True
+
+    db.session.expire_all()
+    stored = db.session.get(LoggedMatch, match["id"])
+    assert {tag.name for tag in stored.tags} == {"Base Tag", "game night"}
+    assert len(stored.opponent_commanders) == 3
+    assert db.session.scalar(
+        select(func.count()).select_from(Tag).where(Tag.user_id == existing_tag.user_id, Tag.name == "game night")
+    ) == 1
+
+def test_log_match_statement_count(db, logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    payload = {
+        "deck_id": setup_deck["deck"].id, "result": 0, "player_position": 1, "tags": [setup_deck["tag"].id],
+        "opponent_commanders_by_seat": {"3": [{"id": commanders["no_partner"], "role": "primary"}]}
+    }
+    assert _post(client, csrf_token, {**payload, "tags": ["first night"]}).status_code == 201
+    response = _post(client, csrf_token, payload)
+    assert response.status_code == 201
+    # 4 reads (commanders, deck taking the rating lock, ratings, tags), 4 inserts (match,
+    # opponents, signatures, match_tags), the rollup UPDATE and the ratings UPDATE
+    assert 'desc="10 queries"' in response.headers["Server-Timing"]
+
+def test_log_match_unknown_commander_is_rejected(db, logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    response = _post(client, csrf_token, {
+        "deck_id": setup_deck["deck"].id, "result": 1, "player_position": 2,
+        "opponent_commanders_by_seat": {
+            "1": [{"id": commanders["no_partner"], "role": "primary"}],
+            "3": [{"id": 987654, "role": "primary"}],
+        }
+    })
+    assert response.status_code == 400
+    assert "Commander ID 987654 for opponent at seat 3" in response.get_json()["error"]
+    assert db.session.scalar(
+        select(func.count()).select_from(OpponentCommanderInMatch)
+        .join(LoggedMatch, LoggedMatch.id == OpponentCommanderInMatch.logged_match_id)
+        .where(LoggedMatch.deck_id == setup_deck["deck"].id)
+    ) == 0
+
+def test_resolve_match_tags_ignores_unknown_and_foreign_ids(app, db, setup_deck, test_user_2):
+    foreign_tag = Tag(user_id=test_user_2["user_obj"].id, name="not yours")
+    db.session.add(foreign_tag)
+    db.session.flush()
+    with app.test_request_context("/"):
+        tags = resolve_match_tags(setup_deck["deck"].user_id, [foreign_tag.id, 999999, "", True])
+    assert tags == []
+    db.session.rollback()
@@ -0,0 +1,65 @@
+# backend/tests/matches/test_match_export.py
+
+import csv
+import io
+import json
+from backend.services.matches.match_export_service import iter_match_export_rows
+
+# --- Helpers ---
+
+def _log_with_opponent(client, csrf_token, deck_id, commander_id):
+    response = client.post("/api/log_match", json={
+        "deck_id": deck_id, "result": 0, "player_position": 1, "player_mulligans": 1,
+        "opponent_commanders_by_seat": {"3": [{"id": commander_id, "role": "primary"}]},
+        "pod_notes": 'Close game, "quoted", with commas'
+    }, headers={"X-CSRF-TOKEN": csrf_token})
+    assert response.status_code == 201, response.get_data(as_text=True)
+    return response.get_json()["match"]["id"]
+
+# --- Tests ---
+
+def test_export_ndjson(logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    match_id = _log_with_opponent(client, csrf_token, setup_deck["deck"].id, commanders["no_partner"])
+
+    response = client.get("/api/matches/export?format=ndjson")
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert "attachment" in response.headers["Content-Disposition"]
+
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row["id"] for row in rows][-1] == match_id
+    exported = rows[-1]
+    assert exported["result"] == "Win"
+    assert exported["deck_name"] == "Base Test Deck"
+    assert exported["opponents"][0]["seat"] == 3
+    assert len(exported["opponents"][0]["commanders"]) == 1
+    assert rows[0]["tags"] == ["Base Tag"]
+
+def test_export_csv(logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    _log_with_opponent(client, csrf_token, setup_deck["deck"].id, commanders["no_partner"])
+
+    response = client.get("/api/matches/export?format=csv")
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == 2
+    assert rows[-1]["opponents"].startswith("seat 3: ")
+    assert rows[-1]["pod_notes"] == 'Close game, "quoted", with commas'
+
+def test_export_invalid_format(logged_in_client):
+    client, _ = logged_in_client
+    response = client.get("/api/matches/export?format=xml")
+    assert response.status_code == 400
+
+def test_export_rows_span_batches(app, db, logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    for _ in range(3):
+        _log_with_opponent(client, csrf_token, setup_deck["deck"].id, commanders["no_partner"])
+
+    with app.app_context():
+        rows = list(iter_match_export_rows(setup_deck["deck"].user_id, batch_size=2))
+    assert len(rows) == 4
+    assert all(row["opponents"] for row in rows[1:])
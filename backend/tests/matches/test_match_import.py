@@ -0,0 +1,112 @@
+# backend/tests/matches/test_match_import.py
+
+import io
+import pytest
+from sqlalchemy import select, func
+from backend.models import LoggedMatch, DeckStats, Tag, OpponentSeatSignature
+from backend.services.matches.match_import_service import import_matches, _parse_opponents, MatchImportError
+
+# --- Helpers ---
+
+def _deck_match_count(db, deck_id):
+    return db.session.scalar(select(func.count()).select_from(LoggedMatch).where(LoggedMatch.deck_id == deck_id))
+
+# --- Tests ---
+
+def test_bulk_import_json_with_per_row_errors(db, logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    deck = setup_deck["deck"]
+    before = _deck_match_count(db, deck.id)
+    response = client.post("/api/matches/bulk", json={"matches": [
+        {"deck_id": deck.id, "result": "win", "player_position": 2, "date": "2024-03-01T20:00:00Z",
+         "opponents": {"1": ["Partner Cmdr 1 Test", "p2_test"], "3": ["Solo Cmdr Test"]},
+         "tags": ["imported", "Base Tag"]},
+        {"deck_name": "Base Test Deck", "result": 2, "player_position": 3, "player_mulligans": 1},
+        {"deck_id": deck.id, "result": "maybe", "player_position": 1},
+        {"deck_id": deck.id, "result": 1, "player_position": 1, "opponents": {"2": ["No Such Commander"]}},
+    ]}, headers={"X-CSRF-TOKEN": csrf_token})
+
+    assert response.status_code == 201, response.get_data(as_text=True)
+    report = response.get_json()
+    assert report["imported"] == 2
+    assert [error["row"] for error in report["errors"]] == [3, 4]
+    assert "No Such Commander" in report["errors"][1]["error"]
+
+    db.session.expire_all()
+    assert _deck_match_count(db, deck.id) == before + 2
+    imported = db.session.scalars(
+        select(LoggedMatch).where(LoggedMatch.deck_id == deck.id, LoggedMatch.player_position == 2)
+    ).one()
+    assert {tag.name for tag in imported.tags} == {"imported", "Base Tag"}
+    assert sorted((o.seat_number, o.role) for o in imported.opponent_commanders) == [(1, "partner"), (1, "primary"), (3, "primary")]
+    assert db.session.scalar(
+        select(OpponentSeatSignature.signature).where(
+            OpponentSeatSignature.logged_match_id == imported.id, OpponentSeatSignature.seat_number == 1)
+    ) == "Partner Cmdr 1 Test / Partner Cmdr 2 Test"
+
+    stats = db.session.get(DeckStats, deck.id)
+    assert (stats.total_matches, stats.total_wins, stats.total_draws) == (before + 2, 1, 1)
+
+def test_bulk_import_csv_round_trip_from_export(db, logged_in_client, setup_deck):
+    client, csrf_token = logged_in_client
+    deck = setup_deck["deck"]
+    exported = client.get("/api/matches/export?format=csv").get_data(as_text=True)
+    before = _deck_match_count(db, deck.id)
+
+    response = client.post(
+        "/api/matches/bulk", headers={"X-CSRF-TOKEN": csrf_token},
+        data={"file": (io.BytesIO(exported.encode("utf-8")), "history.csv")}, content_type="multipart/form-data"
+    )
+    assert response.status_code == 201, response.get_data(as_text=True)
+    assert response.get_json() == {"imported": before, "failed": 0, "errors": []}
+    db.session.expire_all()
+    assert _deck_match_count(db, deck.id) == before * 2
+
+@pytest.mark.parametrize("opponents", [["Solo Cmdr Test"], {"2": "Solo Cmdr Test"}, [{"seat": 2, "commanders": [7]}]])
+def test_malformed_opponents_are_row_errors(opponents):
+    with pytest.raises(MatchImportError):
+        _parse_opponents(opponents)
+
+def test_bulk_import_reports_malformed_opponents_per_row(logged_in_client, setup_deck):
+    client, csrf_token = logged_in_client
+    deck_id = setup_deck["deck"].id
+    response = client.post("/api/matches/bulk", json=[
+        {"deck_id": deck_id, "result": 0, "player_position": 1, "opponents": ["Solo Cmdr Test"]},
+        {"deck_id": deck_id, "result": 0, "player_position": 1, "opponents": {"2": "Solo Cmdr Test"}},
+        {"deck_id": deck_id, "result": 0, "player_position": 1, "opponents": [{"seat": 2, "commanders": ["Solo Cmdr Test"]}]},
+    ], headers={"X-CSRF-TOKEN": csrf_token})
+    assert response.status_code == 201, response.get_data(as_text=True)
+    report = response.get_json()
+    assert report["imported"] == 1 and [error["row"] for error in report["errors"]] == [1, 2]
+
+def test_bulk_import_rejects_empty_and_foreign_decks(logged_in_client, logged_in_client_user_2, setup_deck):
+    client, csrf_token = logged_in_client_user_2
+    response = client.post("/api/matches/bulk", json=[
+        {"deck_id": setup_deck["deck"].id, "result": 0, "player_position": 1}
+    ], headers={"X-CSRF-TOKEN": csrf_token})
+    assert response.status_code == 400
+    assert response.get_json()["imported"] == 0
+    assert "not owned" in response.get_json()["errors"][0]["error"]
+
+    response = client.post("/api/matches/bulk", data="not json", content_type="application/json",
+                           headers={"X-CSRF-TOKEN": csrf_token})
+    assert response.status_code == 400
+
+def test_import_reuses_tags_across_chunks(db, setup_deck):
+    user_id = setup_deck["deck"].user_id
+    rows = [{"deck_id": setup_deck["deck"].id, "result": 0, "player_position": 1, "tags": "chunked; league"} for _ in range(5)]
+    report = import_matches(user_id, rows, chunk_size=2)
+    assert report == {"imported": 5, "failed": 0, "errors": []}
+    assert db.session.scalar(
+        select(func.count()).select_from(Tag).where(Tag.user_id == user_id, Tag.name.in_(["chunked", "league"]))
+    ) == 2
+
+def test_import_matches_cli(app, db, setup_deck, tmp_path):
+    path = tmp_path / "matches.json"
+    path.write_text(f'[{{"deck_id": {setup_deck["deck"].id}, "result": "loss", "player_position": 4}}]')
+    before = _deck_match_count(db, setup_deck["deck"].id)
+
+    result = app.test_cli_runner().invoke(args=["import-matches", str(path), "--user-id", str(setup_deck["deck"].user_id)])
+    assert "Imported 1 matches (0 failed)" in result.output, result.output
+    db.session.expire_all()
+    assert _deck_match_count(db, setup_deck["deck"].id) == before + 1
@@ -0,0 +1,94 @@
+# backend/tests/matches/test_match_timeseries.py
+
+import random
+from datetime import datetime, timezone
+import pytest
+from backend.models import Deck, LoggedMatch
+from backend.services.matches.match_timeseries_service import compute_timeseries, MAX_WINDOW
+
+WIN, LOSS, DRAW = 0, 1, 2
+
+# --- Helpers ---
+
+def _seed_form(db, user_id):
+    """Alpha: W W L | W D L | L over three Monday-based weeks; Beta wins once in week one."""
+    decks = {}
+    for name in ("Alpha", "Beta"):
+        deck = Deck(name=name, deck_type_id=7, user_id=user_id)
+        db.session.add(deck)
+        db.session.flush()
+        decks[name] = deck.id
+
+    history = [
+        ("Alpha", WIN, 6), ("Alpha", WIN, 7), ("Alpha", LOSS, 8), ("Beta", WIN, 9),
+        ("Alpha", WIN, 13), ("Alpha", DRAW, 14), ("Alpha", LOSS, 15), ("Alpha", LOSS, 20),
+    ]
+    for deck, result, day in history:
+        db.session.add(LoggedMatch(deck_id=decks[deck], logger_user_id=user_id, result=result, player_position=1,
+                                   timestamp=datetime(2025, 1, day, 10, tzinfo=timezone.utc)))
+    db.session.add(LoggedMatch(deck_id=decks["Alpha"], logger_user_id=user_id, result=WIN, player_position=1,
+                               is_active=False, timestamp=datetime(2025, 1, 21, 10, tzinfo=timezone.utc)))
+    db.session.commit()
+    return decks
+
+# --- Tests ---
+
+def test_deck_timeseries(db, logged_in_client, test_user):
+    client, _ = logged_in_client
+    decks = _seed_form(db, test_user["user_obj"].id)
+
+    response = client.get(f"/api/decks/{decks['Alpha']}/timeseries?window=3")
+    assert response.status_code == 200
+    series = response.get_json()
+
+    assert series["window"] == 3 and series["total_matches"] == 7
+    assert series["timestamps"][0] == "2025-01-06T10:00:00Z"
+    assert series["results"] == [WIN, WIN, LOSS, WIN, DRAW, LOSS, LOSS]
+    assert series["rolling_win_rate"] == [100.0, 100.0, 66.7, 66.7, 33.3, 33.3, 0.0]
+    assert series["cumulative_win_rate"] == [100.0, 100.0, 66.7, 75.0, 60.0, 50.0, 42.9]
+    assert series["longest_win_streak"] == 2 and series["longest_loss_streak"] == 2
+    assert series["current_streak"] == {"result": LOSS, "length": 2}
+    assert series["weekly"] == [
+        {"week": "2025-01-06", "matches": 3, "wins": 2, "win_rate": 66.7},
+        {"week": "2025-01-13", "matches": 3, "wins": 1, "win_rate": 33.3},
+        {"week": "2025-01-20", "matches": 1, "wins": 0, "win_rate": 0.0},
+    ]
+
+def test_performance_timeseries_spans_all_decks(db, logged_in_client, test_user):
+    client, _ = logged_in_client
+    _seed_form(db, test_user["user_obj"].id)
+
+    # query_budget(1) raises under TESTING if more than one statement runs
+    series = client.get("/api/performance/timeseries").get_json()
+    assert series["window"] == 10 and series["total_matches"] == 8
+    assert series["results"] == [WIN, WIN, LOSS, WIN, WIN, DRAW, LOSS, LOSS]
+    assert series["cumulative_win_rate"][-1] == 50.0
+    assert series["weekly"][0] == {"week": "2025-01-06", "matches": 4, "wins": 3, "win_rate": 75.0}
+
+def test_timeseries_rejects_bad_window_and_foreign_decks(db, logged_in_client, setup_deck):
+    client, _ = logged_in_client
+    assert client.get("/api/performance/timeseries?window=abc").status_code == 400
+    assert client.get(f"/api/performance/timeseries?window={MAX_WINDOW + 1}").status_code == 400
+    assert client.get("/api/decks/999999/timeseries").status_code == 404
+
+    series = client.get(f"/api/decks/{setup_deck['deck'].id}/timeseries").get_json()
+    assert series["total_matches"] == 1 and series["current_streak"] == {"result": LOSS, "length": 1}
+
+def test_timeseries_without_matches(logged_in_client):
+    client, _ = logged_in_client
+    series = client.get("/api/performance/timeseries").get_json()
+    assert series["total_matches"] == 0 and series["weekly"] == [] and series["current_streak"] is None
+
+@pytest.mark.parametrize("window", [1, 7, 50])
+def test_numpy_and_python_paths_agree(window):
+    pytest.importorskip("numpy")
+    rng = random.Random(window)
+    epoch = int(datetime(2024, 3, 1, tzinfo=timezone.utc).timestamp())
+    epochs, results = [], []
+    for _ in range(500):
+        epoch += rng.randrange(60, 3 * 86400)
+        epochs.append(epoch)
+        results.append(rng.choice([WIN, WIN, LOSS, LOSS, LOSS, DRAW]))
+
+    assert compute_timeseries(epochs, results, window, use_numpy=True) == \
+        compute_timeseries(epochs, results, window, use_numpy=False)
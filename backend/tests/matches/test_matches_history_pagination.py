@@ -0,0 +1,80 @@
+# backend/tests/matches/test_matches_history_pagination.py
+
+import pytest
+from datetime import datetime, timezone, timedelta
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+from backend.models import LoggedMatch
+from backend.services.matches.match_history_service import encode_cursor, decode_cursor
+
+# --- Fixtures ---
+
+@pytest.fixture(scope='function')
+def history_matches(app, db, setup_deck):
+    """Adds five matches to the setup deck, two of them sharing a timestamp."""
+    deck = setup_deck["deck"]
+    base = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    with app.app_context():
+        timestamps = [base, base + timedelta(hours=1), base + timedelta(hours=1), base + timedelta(hours=2), base + timedelta(hours=3)]
+        for ts in timestamps:
+            db.session.add(LoggedMatch(
+                timestamp=ts, result=0, player_position=2,
+                logger_user_id=deck.user_id, deck_id=deck.id
+            ))
+        db.session.commit()
+    yield deck
+
+# --- Tests ---
+
+def test_cursor_roundtrip():
+    ts = datetime(2025, 3, 4, 5, 6, 7, 891011, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+
+def test_cursor_pages_cover_history_once_in_order(logged_in_client, history_matches):
+    client, _ = logged_in_client
+    seen, cursor, pages = [], "", 0
+    while cursor is not None:
+        response = client.get(f"/api/matches_history?deck_id={history_matches.id}&page_size=2&cursor={cursor}")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert len(data["matches"]) <= 2
+        seen.extend(data["matches"])
+        cursor = data["next_cursor"]
+        pages += 1
+
+    # 5 fixture matches + the match setup_deck logs itself
+    assert pages == 3
+    assert len({m["id"] for m in seen}) == len(seen) == 6
+    ordering = [(m["date"], m["id"]) for m in seen]
+    assert ordering == sorted(ordering, reverse=True)
+
+def test_cursor_mode_defaults_page_size(logged_in_client, history_matches):
+    client, _ = logged_in_client
+    response = client.get(f"/api/matches_history?deck_id={history_matches.id}&cursor=")
+    data = response.get_json()
+    assert len(data["matches"]) == 6
+    assert data["next_cursor"] is None
+
+def test_invalid_cursor_is_rejected(logged_in_client, history_matches):
+    client, _ = logged_in_client
+    response = client.get("/api/matches_history?cursor=not-a-cursor")
+    assert response.status_code == 400
+    assert "cursor" in response.get_json()["error"]
+
+def test_offset_mode_still_returns_list(logged_in_client, history_matches):
+    client, _ = logged_in_client
+    response = client.get(f"/api/matches_history?deck_id={history_matches.id}&limit=2&offset=4")
+    data = response.get_json()
+    assert isinstance(data, list)
+    assert len(data) == 2
+
+def test_offset_mode_defaults_to_one_page(logged_in_client, history_matches, monkeypatch):
+    monkeypatch.setattr("backend.routes.match_history.DEFAULT_PAGE_SIZE", 2)
+    client, _ = logged_in_client
+    data = client.get(f"/api/matches_history?deck_id={history_matches.id}").get_json()
+    assert [m["id"] for m in data] == [m["id"] for m in client.get(f"/api/matches_history?deck_id={history_matches.id}&cursor=").get_json()["matches"][:2]]
+
+def test_keyset_index_matches_the_sort_order():
+    index = next(index for index in LoggedMatch.__table__.indexes if index.name == "ix_logged_matches_user_active_timestamp_id")
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert ddl.endswith("(logger_user_id, is_active, timestamp DESC, id DESC)")
@@ -0,0 +1,72 @@
+# backend/tests/matches/test_opponent_signatures.py
+
+from sqlalchemy import select
+from backend.models import OpponentSeatSignature
+from backend.services.matches.opponent_signature_service import (
+    build_signature, signature_hash, rebuild_opponent_signatures
+)
+
+# --- Helpers ---
+
+def _log(client, csrf_token, deck_id, result, opponents):
+    response = client.post("/api/log_match", json={
+        "deck_id": deck_id, "result": result, "player_position": 1,
+        "opponent_commanders_by_seat": opponents
+    }, headers={"X-CSRF-TOKEN": csrf_token})
+    assert response.status_code == 201, response.get_data(as_text=True)
+    return response.get_json()["match"]["id"]
+
+def _partner_pod(commanders):
+    return {
+        "2": [{"id": commanders["can_partner_2"], "role": "partner"}, {"id": commanders["can_partner_1"], "role": "primary"}],
+        "3": [{"id": commanders["no_partner"], "role": "primary"}],
+    }
+
+def _signatures(db, match_id):
+    db.session.expire_all()
+    return db.session.scalars(
+        select(OpponentSeatSignature).where(OpponentSeatSignature.logged_match_id == match_id)
+        .order_by(OpponentSeatSignature.seat_number)
+    ).all()
+
+# --- Tests ---
+
+def test_signature_is_order_independent():
+    assert build_signature(["B", "A"]) == build_signature(["A", "B"]) == "A / B"
+    assert signature_hash("A / B") == signature_hash(build_signature(["B", "A"]))
+    assert len(signature_hash("A / B")) == 16
+
+def test_log_match_writes_seat_signatures(db, logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    match_id = _log(client, csrf_token, setup_deck["deck"].id, 0, _partner_pod(commanders))
+
+    rows = _signatures(db, match_id)
+    assert [(row.seat_number, row.signature) for row in rows] == [
+        (2, "Partner Cmdr 1 Test / Partner Cmdr 2 Test"),
+        (3, "Solo Cmdr Test"),
+    ]
+    assert all(row.logger_user_id == setup_deck["deck"].user_id for row in rows)
+    assert rows[0].signature_hash == signature_hash(rows[0].signature)
+
+def test_metagame_and_matchups_group_signatures(logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    deck_id = setup_deck["deck"].id
+    for result in (0, 0, 0):
+        _log(client, csrf_token, deck_id, result, _partner_pod(commanders))
+
+    summary = client.get("/api/performance-summary").get_json()
+    assert {"name": "Partner Cmdr 1 Test / Partner Cmdr 2 Test", "count": 3} in summary["personal_metagame"]
+
+    details = client.get(f"/api/decks/{deck_id}?include_matchup_stats=true").get_json()
+    favorable = {m["name"]: m for m in details["matchup_stats"]["favorable"]}
+    assert favorable["Solo Cmdr Test"]["wins"] == 3
+
+def test_rebuild_matches_write_path(db, logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    match_id = _log(client, csrf_token, setup_deck["deck"].id, 1, _partner_pod(commanders))
+    before = [(r.seat_number, r.signature, r.signature_hash) for r in _signatures(db, match_id)]
+
+    rebuild_opponent_signatures(setup_deck["deck"].user_id)
+    db.session.commit()
+    after = [(r.seat_number, r.signature, r.signature_hash) for r in _signatures(db, match_id)]
+    assert after == before
@@ -0,0 +1,113 @@
+# backend/tests/matches/test_performance_summary.py
+
+from collections import namedtuple
+from datetime import datetime, timezone
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+from backend.models import Deck, LoggedMatch, OpponentSeatSignature
+from backend.services.matches.opponent_signature_service import signature_rows
+from backend.services.matches.player_performance_service import (
+    get_player_performance_summary, _grouped_summary_stmt, _collect, _build_summary,
+    KIND_TOTAL, KIND_SEAT, KIND_DECK, KIND_MONTH, KIND_METAGAME
+)
+
+SummaryRow = namedtuple("SummaryRow", "kind seat deck_id label month games wins")
+
+# --- Helpers ---
+
+def _seed_history(db, user_id):
+    """Two decks over three months; the soft-deleted match must not count anywhere."""
+    decks = {}
+    for name in ("Alpha", "Beta"):
+        deck = Deck(name=name, deck_type_id=7, user_id=user_id)
+        db.session.add(deck)
+        db.session.flush()
+        decks[name] = deck.id
+
+    # (deck, result, seat, month, opponents)
+    history = [
+        ("Alpha", 0, 1, 1, ["Atraxa"]), ("Alpha", 0, 1, 1, ["Atraxa"]), ("Alpha", 1, 2, 2, ["Atraxa"]),
+        ("Alpha", 0, 3, 2, ["Kinnan"]), ("Alpha", 1, 4, 3, ["Kinnan"]), ("Alpha", 0, 1, 3, ["Atraxa"]),
+        ("Beta", 1, 2, 1, ["Kinnan"]), ("Beta", 2, 2, 3, ["Tymna", "Thrasios"]),
+    ]
+    for deck, result, seat, month, opponents in history:
+        match = LoggedMatch(deck_id=decks[deck], logger_user_id=user_id, result=result, player_position=seat,
+                            timestamp=datetime(2025, month, 15, 12, tzinfo=timezone.utc))
+        db.session.add(match)
+        db.session.flush()
+        db.session.execute(insert(OpponentSeatSignature), signature_rows(match.id, user_id, {seat % 4 + 1: opponents}))
+
+    deleted = LoggedMatch(deck_id=decks["Beta"], logger_user_id=user_id, result=0, player_position=1, is_active=False,
+                          timestamp=datetime(2025, 4, 1, tzinfo=timezone.utc))
+    db.session.add(deleted)
+    db.session.commit()
+    return decks
+
+# --- Tests ---
+
+def test_performance_summary_single_statement(db, logged_in_client, test_user):
+    client, _ = logged_in_client
+    _seed_history(db, test_user["user_obj"].id)
+
+    # query_budget(1) raises under TESTING if the view issues more than one statement
+    response = client.get("/api/performance-summary")
+    assert response.status_code == 200
+    summary = response.get_json()
+
+    assert summary["has_data"] is True
+    assert summary["total_matches"] == 8
+    assert summary["overall_win_rate"] == 50.0
+    assert summary["most_played_deck"] == "Alpha (6 plays)"
+    assert summary["winningest_deck"] == "Alpha (66.7%)"
+    assert summary["turn_order_stats"]["1"] == {
+        "matches": 3, "wins": 3, "win_rate": 100.0,
+        "win_rate_lower": 43.9, "win_rate_upper": 100.0, "smoothed_win_rate": 63.6
+    }
+    assert summary["turn_order_stats"]["2"] == {
+        "matches": 3, "wins": 0, "win_rate": 0.0,
+        "win_rate_lower": 0.0, "win_rate_upper": 56.1, "smoothed_win_rate": 36.4
+    }
+    assert summary["personal_metagame"] == [
+        {"name": "Atraxa", "count": 4}, {"name": "Kinnan", "count": 3}, {"name": "Thrasios / Tymna", "count": 1}
+    ]
+    assert summary["monthly_trend"] == [
+        {"month": "2025-01", "matches": 3, "wins": 2, "win_rate": 66.7},
+        {"month": "2025-02", "matches": 2, "wins": 1, "win_rate": 50.0},
+        {"month": "2025-03", "matches": 3, "wins": 1, "win_rate": 33.3},
+    ]
+
+def test_performance_summary_without_matches(logged_in_client):
+    client, _ = logged_in_client
+    summary = client.get("/api/performance-summary").get_json()
+    assert summary["has_data"] is False
+    assert summary["monthly_trend"] == []
+
+def test_grouped_rows_build_the_same_summary(db, test_user):
+    """The PostgreSQL GROUPING SETS rows and the SQLite per-cell rows fold to one payload."""
+    user_id = test_user["user_obj"].id
+    decks = _seed_history(db, user_id)
+    folded = get_player_performance_summary(user_id)
+
+    grouped_rows = [
+        SummaryRow(KIND_TOTAL, None, None, None, None, 8, 4),
+        SummaryRow(KIND_SEAT, 1, None, None, None, 3, 3),
+        SummaryRow(KIND_SEAT, 2, None, None, None, 3, 0),
+        SummaryRow(KIND_SEAT, 3, None, None, None, 1, 1),
+        SummaryRow(KIND_SEAT, 4, None, None, None, 1, 0),
+        SummaryRow(KIND_DECK, None, decks["Alpha"], "Alpha", None, 6, 4),
+        SummaryRow(KIND_DECK, None, decks["Beta"], "Beta", None, 2, 0),
+        SummaryRow(KIND_MONTH, None, None, None, "2025-01", 3, 2),
+        SummaryRow(KIND_MONTH, None, None, None, "2025-02", 2, 1),
+        SummaryRow(KIND_MONTH, None, None, None, "2025-03", 3, 1),
+        SummaryRow(KIND_METAGAME, None, None, "Kinnan", None, 3, None),
+        SummaryRow(KIND_METAGAME, None, None, "Atraxa", None, 4, None),
+        SummaryRow(KIND_METAGAME, None, None, "Thrasios / Tymna", None, 1, None),
+    ]
+    assert _build_summary(*_collect(grouped_rows)) == folded
+
+def test_grouped_statement_is_one_cte_scan_on_postgres():
+    sql = str(_grouped_summary_stmt(1).compile(dialect=postgresql.dialect()))
+    assert sql.count("FROM logged_matches") == 1
+    assert "WITH active_matches AS" in sql
+    assert "GROUPING SETS" in sql
+    assert "row_number() OVER" in sql
@@ -0,0 +1,191 @@
+# backend/tests/matches/test_ratings.py
+
+import random
+import pytest
+from sqlalchemy import select, event, Select
+from sqlalchemy.dialects import postgresql
+from backend.database import request_query_stats
+from backend.models import Rating, Job
+from backend.routes import matches as matches_routes
+from backend.services.matches import rating_service
+from backend.services.matches.rating_service import (
+    pod_surprises, apply_pod, replay_ratings, queue_rating_replay, NEW_RATING, RatingState, INITIAL_RATING,
+    MIN_DEVIATION, REPLAY_RATINGS_JOB
+)
+
+WIN, LOSS, DRAW = 0, 1, 2
+
+# --- Helpers ---
+
+def _log(client, csrf_token, deck_id, result, opponents_by_seat, player_position=1):
+    response = client.post("/api/log_match", headers={"X-CSRF-TOKEN": csrf_token}, json={
+        "deck_id": deck_id, "result": result, "player_position": player_position,
+        "opponent_commanders_by_seat": {
+            str(seat): [{"id": commander_id, "role": "primary"}] for seat, commander_id in opponents_by_seat.items()
+        }
+    })
+    assert response.status_code == 201, response.get_data(as_text=True)
+    return response.get_json()["match"]["id"]
+
+def _stored_ratings(db, user_id):
+    rows = db.session.execute(
+        select(Rating.deck_id, Rating.signature, Rating.rating, Rating.deviation, Rating.games)
+        .where(Rating.user_id == user_id)
+    ).all()
+    return {(row.deck_id, row.signature): (row.rating, row.deviation, row.games) for row in rows}
+
+# --- Rating Math ---
+
+def test_pod_surprises_for_an_even_pod():
+    field = [NEW_RATING] * 3
+    assert pod_surprises(NEW_RATING, field, WIN) == pytest.approx([0.75, -0.25, -0.25, -0.25])
+    assert pod_surprises(NEW_RATING, field, LOSS) == pytest.approx([-0.25, 1 / 12, 1 / 12, 1 / 12])
+    assert pod_surprises(NEW_RATING, field, DRAW) == pytest.approx([0, 0, 0, 0])
+    # Unlogged seats are average players: a lone deck still expects a quarter of the wins
+    assert pod_surprises(NEW_RATING, [], WIN) == pytest.approx([0.75])
+
+def test_pod_surprises_are_zero_sum_with_a_full_pod():
+    rng = random.Random(3)
+    for _ in range(50):
+        seats = [RatingState(rng.uniform(1200, 1800), 100, 10) for _ in range(4)]
+        surprises = pod_surprises(seats[0], seats[1:], rng.choice([WIN, LOSS, DRAW]))
+        assert sum(surprises) == pytest.approx(0, abs=1e-12)
+
+def test_an_average_deck_stays_average():
+    states = {}
+    for game in range(400):
+        apply_pod(states, "deck", ["a", "b", "c"], WIN if game % 4 == 0 else LOSS)
+    assert states["deck"].rating == pytest.approx(INITIAL_RATING, abs=25)
+    assert states["deck"].deviation == MIN_DEVIATION and states["deck"].games == 400
+
+def test_repeated_command_zone_in_one_pod_is_rated_once():
+    states = {}
+    apply_pod(states, "deck", ["twin", "twin", "other"], LOSS)
+    assert states["twin"].games == 1
+    assert states["twin"].rating > states["other"].rating > INITIAL_RATING
+
+# --- Incremental Updates and Replay ---
+
+def test_log_match_updates_ratings_like_a_replay(db, logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    user_id = setup_deck["deck"].user_id
+    deck_id = setup_deck["deck"].id
+    replay_ratings(user_id) # The fixture inserts its match directly
+    db.session.commit()
+
+    opponents = {2: commanders["can_partner_1"], 3: commanders["no_partner"], 4: commanders["can_partner_2"]}
+    _log(client, csrf_token, deck_id, WIN, opponents)
+    _log(client, csrf_token, deck_id, LOSS, {2: commanders["no_partner"]})
+    _log(client, csrf_token, deck_id, WIN, opponents)
+    incremental = _stored_ratings(db, user_id)
+
+    assert incremental[(deck_id, None)][2] == 4
+    assert incremental[(None, "Solo Cmdr Test")][2] == 3
+
+    replay_ratings(user_id)
+    db.session.commit()
+    replayed = _stored_ratings(db, user_id)
+    assert replayed.keys() == incremental.keys()
+    for key, (rating, deviation, games) in incremental.items():
+        assert replayed[key] == (pytest.approx(rating), pytest.approx(deviation), games)
+
+def test_deleting_a_match_replays_ratings(db, logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    deck_id = setup_deck["deck"].id
+    opponents = {2: commanders["no_partner"]}
+    _log(client, csrf_token, deck_id, WIN, opponents)
+    match_id = _log(client, csrf_token, deck_id, WIN, opponents)
+
+    response = client.delete(f"/api/matches/{match_id}", headers={"X-CSRF-TOKEN": csrf_token})
+    assert response.status_code == 204
+    db.session.expire_all()
+    # The replay is a job (run inline under TESTING)
+    job = db.session.scalars(select(Job).where(Job.kind == REPLAY_RATINGS_JOB).order_by(Job.id.desc())).first()
+    assert job.payload == {"user_id": setup_deck["deck"].user_id} and job.status == "done"
+
+    # Replayed history: the fixture's loss (no opponents logged), then the first win
+    expected = {}
+    apply_pod(expected, "deck", [], LOSS)
+    apply_pod(expected, "deck", ["no_partner"], WIN)
+    stored = _stored_ratings(db, setup_deck["deck"].user_id)
+    deck_rating = expected["deck"]
+    assert stored[(deck_id, None)] == (pytest.approx(deck_rating.rating), pytest.approx(deck_rating.deviation), 2)
+    assert stored[(None, "Solo Cmdr Test")][2] == 1
+
+# --- Serialized Writes ---
+
+def test_rating_writers_lock_the_user_row(db, logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    user_id = setup_deck["deck"].user_id
+    statements = []
+    def capture(orm_execute_state):
+        if isinstance(orm_execute_state.statement, Select):
+            statements.append(str(orm_execute_state.statement.compile(dialect=postgresql.dialect())))
+    event.listen(db.session, "do_orm_execute", capture)
+    try:
+        _log(client, csrf_token, setup_deck["deck"].id, WIN, {2: commanders["no_partner"]})
+        logged = statements[:]
+        replay_ratings(user_id)
+        db.session.commit()
+    finally:
+        event.remove(db.session, "do_orm_execute", capture)
+
+    # The ownership check takes the lock, before the ratings are read
+    lock_index = next(i for i, sql in enumerate(logged) if "FOR NO KEY UPDATE OF users" in sql)
+    assert any("FROM ratings" in sql for sql in logged[lock_index + 1:])
+    assert not any("FROM ratings" in sql for sql in logged[:lock_index])
+    # The replay takes the same lock before reading the history
+    assert "FOR NO KEY UPDATE" in statements[len(logged)]
+    assert "FOR NO KEY UPDATE" in str(rating_service.rating_lock(user_id).compile(dialect=postgresql.dialect()))
+
+def test_replay_interleaved_with_a_logged_match(db, logged_in_client, setup_deck, commanders, monkeypatch):
+    client, csrf_token = logged_in_client
+    user_id = setup_deck["deck"].user_id
+    deck_id = setup_deck["deck"].id
+    # The fixture's match is not rated yet, so this rating is stale until a replay runs
+    _log(client, csrf_token, deck_id, WIN, {2: commanders["no_partner"]})
+
+    # A replay job that commits while log_match waits for the lock: the match must
+    # build on the replayed rows (new ids) instead of writing to the deleted ones
+    def load_after_replay(*args):
+        stats = request_query_stats()
+        count = stats.count
+        queue_rating_replay(user_id)
+        stats.count = count # The replay's statements belong to another transaction, not to log_match's budget
+        return rating_service.load_deck_with_ratings(*args)
+    monkeypatch.setattr(matches_routes, "load_deck_with_ratings", load_after_replay)
+    _log(client, csrf_token, deck_id, LOSS, {2: commanders["no_partner"], 3: commanders["can_partner_1"]})
+    monkeypatch.undo()
+    db.session.expire_all()
+    interleaved = _stored_ratings(db, user_id)
+    assert interleaved[(deck_id, None)][2] == 3
+
+    replay_ratings(user_id)
+    db.session.commit()
+    replayed = _stored_ratings(db, user_id)
+    assert replayed.keys() == interleaved.keys()
+    for key, (rating, deviation, games) in interleaved.items():
+        assert replayed[key] == (pytest.approx(rating), pytest.approx(deviation), games)
+
+# --- Read Paths ---
+
+def test_ratings_on_deck_details_and_performance_page(db, logged_in_client, setup_deck, commanders):
+    client, csrf_token = logged_in_client
+    deck_id = setup_deck["deck"].id
+    for result in (WIN, WIN, LOSS):
+        _log(client, csrf_token, deck_id, result, {3: commanders["no_partner"], 4: commanders["can_partner_1"]})
+
+    rating = client.get(f"/api/decks/{deck_id}").get_json()["rating"]
+    assert rating["rating"] > INITIAL_RATING and rating["provisional"] is True
+
+    # query_budget(1) raises under TESTING if more than one statement runs
+    ratings = client.get("/api/performance/ratings").get_json()
+    assert [deck["deck_id"] for deck in ratings["decks"]] == [deck_id]
+    assert ratings["decks"][0] == {"deck_id": deck_id, "name": "Base Test Deck", **rating}
+    assert {opponent["name"] for opponent in ratings["opponents"]} == {"Solo Cmdr Test", "Partner Cmdr 1 Test"}
+    assert all(opponent["games"] == 3 for opponent in ratings["opponents"])
+
+def test_replay_ratings_cli(app, db, setup_deck):
+    result = app.test_cli_runner().invoke(args=["replay-ratings", "--user-id", str(setup_deck["deck"].user_id)])
+    assert "Wrote 1 ratings" in result.output, result.output
+    assert _stored_ratings(db, setup_deck["deck"].user_id)[(setup_deck["deck"].id, None)][2] == 1
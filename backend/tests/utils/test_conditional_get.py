@@ -0,0 +1,63 @@
+# backend/tests/utils/test_conditional_get.py
+
+import re
+from backend.cache import bump_global_data_version
+
+# --- Helpers ---
+
+def _query_count(response):
+    return int(re.search(r'desc="(\d+) queries"', response.headers["Server-Timing"]).group(1))
+
+# --- Tests ---
+
+def test_matching_etag_returns_304_without_running_view(logged_in_client, setup_deck):
+    client, _ = logged_in_client
+    first = client.get("/api/matches_history")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    cached = client.get("/api/matches_history", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.get_data() == b""
+    assert cached.headers["ETag"] == etag
+    assert _query_count(cached) < _query_count(first)
+
+    other_query = client.get("/api/matches_history?deck_id=1", headers={"If-None-Match": etag})
+    assert other_query.status_code == 200 and other_query.headers["ETag"] != etag
+
+def test_writes_change_the_etag(logged_in_client, test_user_2, setup_deck):
+    client, csrf_token = logged_in_client
+    etags = {path: client.get(path).headers["ETag"] for path in ("/api/tags", "/api/user_decks", "/api/performance-summary")}
+
+    assert client.post("/api/tags", json={"name": "etag bump"}, headers={"X-CSRF-TOKEN": csrf_token}).status_code == 201
+    for path, etag in etags.items():
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 200, path
+        assert response.headers["ETag"] != etag
+
+    # Same URL, different user: never a 304 for someone else's ETag
+    tags_etag = client.get("/api/tags").headers["ETag"]
+    client.post("/api/auth/login", json={"email": test_user_2["user_obj"].email, "password": test_user_2["password"]})
+    assert client.get("/api/tags", headers={"If-None-Match": tags_etag}).status_code == 200
+
+def test_deck_types_use_global_version(logged_in_client):
+    client, _ = logged_in_client
+    etag = client.get("/api/deck_types").headers["ETag"]
+    assert client.get("/api/deck_types", headers={"If-None-Match": etag}).status_code == 304
+
+    bump_global_data_version()
+    assert client.get("/api/deck_types", headers={"If-None-Match": etag}).status_code == 200
+
+def test_maintenance_commands_change_per_user_etags(app, logged_in_client, setup_deck):
+    client, _ = logged_in_client
+    for args in (["rebuild-deck-stats"], ["replay-ratings"], ["rebuild-opponent-signatures"]):
+        etag = client.get("/api/user_decks").headers["ETag"]
+        result = app.test_cli_runner().invoke(args=args)
+        assert "ERROR" not in result.output, result.output
+        assert client.get("/api/user_decks", headers={"If-None-Match": etag}).status_code == 200, args
+
+    # Scoped to one user, the command only bumps that user's version
+    etag = client.get("/api/deck_types").headers["ETag"]
+    app.test_cli_runner().invoke(args=["replay-ratings", "--user-id", str(setup_deck["deck"].user_id)])
+    assert client.get("/api/deck_types", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,44 @@
+# backend/tests/utils/test_query_budget.py
+
+import pytest
+from sqlalchemy import text
+from backend.database import request_query_stats
+from backend.utils.decorators import query_budget, QueryBudgetExceeded
+
+# --- Helpers ---
+
+def _run_queries(db, count):
+    for _ in range(count):
+        db.session.execute(text("SELECT 1"))
+    return "ok"
+
+# --- Tests ---
+
+def test_request_stats_count_statements(app, db):
+    with app.test_request_context("/"):
+        _run_queries(db, 3)
+        stats = request_query_stats()
+        assert stats.count == 3
+        assert stats.duration >= 0
+
+def test_no_stats_outside_request(app):
+    assert request_query_stats() is None
+
+def test_query_budget_allows_views_within_budget(app, db):
+    view = query_budget(2)(lambda: _run_queries(db, 2))
+    with app.test_request_context("/"):
+        assert view() == "ok"
+
+def test_query_budget_raises_when_exceeded(app, db):
+    view = query_budget(1)(lambda: _run_queries(db, 2))
+    with app.test_request_context("/"):
+        with pytest.raises(QueryBudgetExceeded, match="2 statements"):
+            view()
+
+def test_server_timing_header(logged_in_client, setup_deck):
+    client, _ = logged_in_client
+    response = client.get(f"/api/decks/{setup_deck['deck'].id}")
+    assert response.status_code == 200
+    server_timing = response.headers.get("Server-Timing")
+    assert server_timing.startswith("db;dur=")
+    assert "queries" in server_timing
@@ -0,0 +1,92 @@
+# backend/tests/utils/test_query_indexes.py
+
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+from backend.models import LoggedMatch, Deck, Tag
+
+PARTIAL_INDEXES = [
+    (LoggedMatch, "ix_logged_matches_active_user_summary"),
+    (LoggedMatch, "ix_logged_matches_active_deck_user_mulligans"),
+    (LoggedMatch, "ix_logged_matches_active_deck_timestamp_id"),
+    (Deck, "ix_decks_active_user_type"),
+]
+
+# --- Helpers ---
+
+@contextmanager
+def _captured_selects(engine):
+    """Collects (statement, parameters) of every SELECT run while the block is active."""
+    captured = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+def _query_plans(db, client, path):
+    """EXPLAIN QUERY PLAN details for each SELECT a request issued, keyed by statement."""
+    with _captured_selects(db.engine) as captured:
+        response = client.get(path)
+    assert response.status_code == 200, path
+    with db.engine.connect() as conn:
+        return {
+            statement: " | ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+            for statement, parameters in captured
+        }
+
+def _plan_using(plans, index_name):
+    return next((plan for plan in plans.values() if f"INDEX {index_name} " in plan), None)
+
+# --- Tests ---
+
+@pytest.mark.parametrize("path, index_name", [
+    ("/api/decks/{deck_id}", "ix_logged_matches_active_deck_user_mulligans"),
+    ("/api/user_decks", "ix_decks_active_user_type"),
+])
+def test_hot_queries_use_partial_indexes(logged_in_client, setup_deck, db, path, index_name):
+    client, _ = logged_in_client
+    plans = _query_plans(db, client, path.format(deck_id=setup_deck["deck"].id))
+    assert _plan_using(plans, index_name), f"{index_name} unused by {path}:\n" + "\n".join(plans.values())
+
+def test_deck_history_page_needs_no_sort(logged_in_client, setup_deck, db):
+    # Both indexes match the page's ORDER BY timestamp DESC, id DESC, so either one serves it
+    # without sorting; SQLite without statistics picks the user index (more equality columns),
+    # PostgreSQL the far more selective deck index
+    client, _ = logged_in_client
+    plans = _query_plans(db, client, f"/api/matches_history?deck_id={setup_deck['deck'].id}")
+    plan = (_plan_using(plans, "ix_logged_matches_active_deck_timestamp_id")
+            or _plan_using(plans, "ix_logged_matches_user_active_timestamp_id"))
+    assert plan and "TEMP B-TREE" not in plan, "\n".join(plans.values())
+
+@pytest.mark.parametrize("path", [
+    "/api/performance-summary", "/api/decks/{deck_id}", "/api/user_decks", "/api/matches_history",
+])
+def test_hot_queries_never_scan_matches_or_decks(logged_in_client, setup_deck, db, path):
+    client, _ = logged_in_client
+    plans = _query_plans(db, client, path.format(deck_id=setup_deck["deck"].id))
+    for plan in plans.values():
+        assert "SCAN logged_matches" not in plan and "SCAN decks" not in plan, plan
+
+@pytest.mark.parametrize("model, index_name", PARTIAL_INDEXES)
+def test_partial_indexes_cover_only_active_rows_on_postgres(model, index_name):
+    index = next(index for index in model.__table__.indexes if index.name == index_name)
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert ddl.endswith("WHERE is_active")
+
+def test_performance_summary_index_covers_the_scan():
+    # Built for the PostgreSQL GROUPING SETS scan; SQLite's per-cell fallback walks
+    # ix_logged_matches_user_active_timestamp_id instead (checked by the no-scan test)
+    index = next(index for index in LoggedMatch.__table__.indexes if index.name == "ix_logged_matches_active_user_summary")
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert "INCLUDE (id)" in ddl
+
+def test_tags_user_active_index_is_declared():
+    assert any(index.name == "ix_tags_user_id_is_active" for index in Tag.__table__.indexes)
@@ -0,0 +1,43 @@
+# backend/tests/utils/test_rate_stats.py
+
+import random
+from collections import namedtuple
+import pytest
+from backend.utils.rate_stats import rate_estimates, pooled_rate, RateEstimate
+from backend.services.decks.deck_service import partition_matchups
+
+MatchupRow = namedtuple("MatchupRow", "opponent_signature games wins")
+
+def test_wilson_interval_and_smoothing():
+    estimates = rate_estimates([3, 0, 40, 0], [3, 3, 100, 0], prior_rate=0.25, prior_games=8)
+    assert estimates[0] == RateEstimate(100.0, 43.9, 100.0, 45.5)
+    assert estimates[1] == RateEstimate(0.0, 0.0, 56.1, 18.2)
+    assert estimates[2] == RateEstimate(40.0, 30.9, 49.8, 38.9)
+    # No games: nothing is known, so the interval is everything and the prior stands
+    assert estimates[3] == RateEstimate(0.0, 0.0, 100.0, 25.0)
+
+def test_pooled_rate_falls_back_to_the_pod_rate():
+    assert pooled_rate([3, 1], [4, 6]) == 0.4
+    assert pooled_rate([], []) == 0.25
+
+@pytest.mark.parametrize("prior_rate", [0.0, 0.25, 0.6])
+def test_numpy_and_python_paths_agree(prior_rate):
+    pytest.importorskip("numpy")
+    rng = random.Random(7)
+    games = [rng.randrange(0, 300) for _ in range(500)]
+    wins = [rng.randint(0, n) for n in games]
+    vectorized = rate_estimates(wins, games, prior_rate=prior_rate, use_numpy=True)
+    scalar = rate_estimates(wins, games, prior_rate=prior_rate, use_numpy=False)
+    for left, right in zip(vectorized, scalar):
+        assert left == pytest.approx(right, abs=0.1)
+
+def test_matchups_rank_by_confidence_not_raw_rate():
+    rows = [
+        MatchupRow("Lucky Streak", 3, 3), MatchupRow("Solid Edge", 100, 60),
+        MatchupRow("Bad Start", 3, 0), MatchupRow("True Nemesis", 100, 10),
+    ]
+    matchups = partition_matchups(rows, deck_average_wr=30.0)
+    assert [m["name"] for m in matchups["favorable"]] == ["Solid Edge", "Lucky Streak"]
+    assert [m["name"] for m in matchups["nemesis"]] == ["True Nemesis", "Bad Start"]
+    # Smoothing towards the deck average keeps a matchup on its side of it
+    assert matchups["favorable"][1]["smoothed_win_rate"] > 30.0 > matchups["nemesis"][1]["smoothed_win_rate"]
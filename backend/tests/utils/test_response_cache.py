@@ -0,0 +1,73 @@
+# backend/tests/utils/test_response_cache.py
+
+import pytest
+from backend.cache import LocalCacheBackend, response_cache, bump_global_data_version
+
+# --- Fixtures ---
+
+@pytest.fixture
+def cache_enabled(app):
+    app.config["RESPONSE_CACHE_ENABLED"] = True
+    response_cache.clear()
+    yield response_cache
+    app.config["RESPONSE_CACHE_ENABLED"] = False
+    response_cache.clear()
+
+# --- Tests ---
+
+def test_local_backend_lru_and_ttl():
+    backend = LocalCacheBackend(max_entries=2)
+    backend.set("a", 1, ttl=60)
+    backend.set("b", 2, ttl=60)
+    assert backend.get("a") == 1  # "a" becomes most recently used
+    backend.set("c", 3, ttl=60)
+    assert (backend.get("a"), backend.get("b"), backend.get("c")) == (1, None, 3)
+
+    backend.set("expired", 4, ttl=-1)
+    assert backend.get("expired") is None
+    assert backend.incr_version("v") == 1 and backend.get_version("v") == 1
+    assert backend.get_versions(["v", "unset"]) == [1, 0]
+
+def test_cached_endpoints_hit_until_user_writes(cache_enabled, logged_in_client, test_user_2, setup_deck):
+    client, csrf_token = logged_in_client
+    deck_id = setup_deck["deck"].id
+
+    first = client.get("/api/user_decks")
+    second = client.get("/api/user_decks")
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert second.get_json() == first.get_json()
+    assert client.get(f"/api/decks/{deck_id}").headers["X-Cache"] == "MISS"
+    assert client.get(f"/api/decks/{deck_id}").headers["X-Cache"] == "HIT"
+    assert client.get(f"/api/decks/{deck_id}?include_turn_stats=true").headers["X-Cache"] == "MISS"
+    summary = client.get("/api/performance-summary")
+    assert client.get("/api/performance-summary").headers["X-Cache"] == "HIT"
+
+    response = client.post("/api/log_match", json={"deck_id": deck_id, "result": 0, "player_position": 1},
+                           headers={"X-CSRF-TOKEN": csrf_token})
+    assert response.status_code == 201
+    after = client.get("/api/performance-summary")
+    assert after.headers["X-Cache"] == "MISS"
+    assert after.get_json()["total_matches"] == summary.get_json()["total_matches"] + 1
+    refreshed = client.get("/api/user_decks")
+    assert refreshed.headers["X-Cache"] == "MISS"
+    assert {d["id"]: d for d in refreshed.get_json()}[deck_id]["total_matches"] > \
+        {d["id"]: d for d in first.get_json()}[deck_id]["total_matches"]
+
+    # Another user's requests never see these entries
+    client.post("/api/auth/login", json={"email": test_user_2["user_obj"].email, "password": test_user_2["password"]})
+    other = client.get("/api/user_decks")
+    assert other.headers["X-Cache"] == "MISS"
+    assert deck_id not in {deck["id"] for deck in other.get_json()}
+
+def test_errors_are_not_cached(cache_enabled, logged_in_client):
+    client, _ = logged_in_client
+    for _ in range(2):
+        response = client.get("/api/decks/999999")
+        assert (response.status_code, response.headers["X-Cache"]) == (404, "MISS")
+
+def test_global_version_invalidates_every_user(cache_enabled, logged_in_client, setup_deck):
+    client, _ = logged_in_client
+    assert client.get("/api/user_decks").headers["X-Cache"] == "MISS"
+    assert client.get("/api/user_decks").headers["X-Cache"] == "HIT"
+    bump_global_data_version()
+    assert client.get("/api/user_decks").headers["X-Cache"] == "MISS"
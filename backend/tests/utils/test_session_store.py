@@ -0,0 +1,77 @@
+# backend/tests/utils/test_session_store.py
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import event, insert, select, delete, func, table, column, Integer, String, DateTime
+from backend.session_store import LocalSessionInterface, purge_expired_sessions
+
+SESSIONS = table("sessions", column("id", Integer), column("session_id", String), column("expiry", DateTime))
+
+# --- Helpers ---
+
+@contextmanager
+def _session_statements(db):
+    """Collects the SQL statements that touch the sessions table."""
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "sessions" in statement:
+            statements.append(statement.split()[0].upper())
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+# --- Tests ---
+
+def test_authenticated_requests_skip_the_sessions_table(app, db, logged_in_client, monkeypatch):
+    client, _ = logged_in_client
+    interface = app.session_interface
+
+    with _session_statements(db) as statements:
+        for _ in range(3):
+            assert client.get("/api/auth/csrf_token").status_code == 200
+    assert statements == []
+
+    # Without the cache every request reads the row and refreshes its expiry
+    monkeypatch.setattr(interface, "read_cache_ttl", 0)
+    monkeypatch.setattr(interface, "refresh_interval", 0)
+    with _session_statements(db) as statements:
+        assert client.get("/api/auth/csrf_token").status_code == 200
+    assert statements.count("SELECT") >= 1 and "UPDATE" in statements
+
+def test_logout_is_not_served_from_the_cache(logged_in_client):
+    client, csrf_token = logged_in_client
+    assert client.get("/api/auth/profile").status_code == 200
+    assert client.post("/api/auth/logout", headers={"X-CSRF-TOKEN": csrf_token}).status_code == 200
+    assert client.get("/api/auth/profile").status_code == 401
+
+def test_local_session_backend(app, client, test_user, monkeypatch):
+    monkeypatch.setattr(app, "session_interface", LocalSessionInterface(app))
+    client.delete_cookie("session")
+    user = test_user["user_obj"]
+    response = client.post("/api/auth/login", json={"email": user.email, "password": test_user["password"]})
+    assert response.status_code == 200
+    assert client.get("/api/auth/profile").get_json()["email"] == user.email
+    assert len(app.session_interface.store._entries) == 1
+    client.post("/api/auth/logout")
+    assert client.get("/api/auth/profile").status_code == 401
+
+def test_purge_expired_sessions_in_batches(app, db):
+    now = datetime.utcnow()
+    rows = [{"session_id": f"session:purge-{n}", "expiry": now - timedelta(hours=n + 1)} for n in range(5)]
+    rows += [{"session_id": "session:purge-null", "expiry": None}]
+    rows += [{"session_id": f"session:keep-{n}", "expiry": now + timedelta(days=1)} for n in range(2)]
+    db.session.execute(insert(SESSIONS), rows)
+    db.session.commit()
+
+    assert purge_expired_sessions(batch_size=2) == 6
+    remaining = db.session.scalars(select(SESSIONS.c.session_id).where(SESSIONS.c.session_id.like("session:%-%"))).all()
+    assert sorted(remaining) == ["session:keep-0", "session:keep-1"]
+
+    db.session.execute(delete(SESSIONS).where(SESSIONS.c.session_id.like("session:keep-%")))
+    db.session.execute(insert(SESSIONS), [{"session_id": "session:purge-cli", "expiry": now - timedelta(days=1)}])
+    db.session.commit()
+    result = app.test_cli_runner().invoke(args=["purge-sessions", "--batch-size", "1"])
+    assert "Purged 1 expired sessions" in result.output, result.output
+    assert db.session.scalar(select(func.count()).select_from(SESSIONS).where(SESSIONS.c.session_id == "session:purge-cli")) == 0
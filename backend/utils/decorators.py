@@ -2,6 +2,10 @@
 
 from functools import wraps
 from flask import session, jsonify, request, current_app
+from backend.database import request_query_stats
+from backend.cache import response_cache, GLOBAL_SCOPE
+from urllib.parse import urlencode
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,4 +25,93 @@ def login_required(f):
 
         print(f"--- DEBUG: @login_required - Proceeding for user {user_id} ---", flush=True)
         return f(*args, **kwargs)
-    return decorated_function
\ No newline at end of file
+    return decorated_function
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised (in testing or with QUERY_BUDGET_STRICT) when a view runs more SQL statements than its budget."""
+
+
+def query_budget(max_queries):
+    """
+    Declares how many SQL statements a view may execute. Place it below @login_required
+    so only the view's own statements are counted. Over budget is a warning in
+    production and raises QueryBudgetExceeded under TESTING or QUERY_BUDGET_STRICT.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            stats = request_query_stats()
+            start_count = stats.count if stats else 0
+            response = f(*args, **kwargs)
+            used = (stats.count - start_count) if stats else 0
+            if used > max_queries:
+                message = f"Query budget exceeded for {request.endpoint}: {used} statements (budget {max_queries})."
+                if current_app.config.get("TESTING") or current_app.config.get("QUERY_BUDGET_STRICT"):
+                    raise QueryBudgetExceeded(message)
+                logger.warning(message)
+            return response
+        return decorated_function
+    return decorator
+
+
+def cached_response(ttl=None):
+    """
+    Serves a view's 200 JSON responses from the response cache, keyed on the user,
+    their data version, the path and the query string. Place it below @login_required
+    and above @query_budget; a hit skips the view (and its queries) entirely.
+    Sets X-Cache: HIT/MISS. Disabled with RESPONSE_CACHE_ENABLED = False.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            user_id = session.get("user_id")
+            if not current_app.config.get("RESPONSE_CACHE_ENABLED") or user_id is None:
+                return f(*args, **kwargs)
+            version = response_cache.data_version(user_id)
+            if version is None:
+                return f(*args, **kwargs)
+
+            query_string = urlencode(sorted(request.args.items(multi=True)))
+            key = f"resp:{user_id}:{version}:{request.path}?{query_string}"
+            cached = response_cache.get(key)
+            if cached is not None:
+                response = current_app.response_class(cached["body"], status=200, mimetype=cached["mimetype"])
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code == 200 and response.is_json:
+                response_cache.set(key, {"body": response.get_data(as_text=True), "mimetype": response.mimetype}, ttl)
+            response.headers["X-Cache"] = "MISS"
+            return response
+        return decorated_function
+    return decorator
+
+
+def conditional_get(per_user=True):
+    """
+    Strong ETag from the data version (the user's, or the global one with
+    per_user=False) plus the path and query string. A matching If-None-Match returns
+    304 before the view runs. Place it below @login_required and above @cached_response.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            scope = session.get("user_id") if per_user else GLOBAL_SCOPE
+            version = response_cache.etag_version(scope) if scope is not None else None
+            if version is None:
+                return f(*args, **kwargs)
+
+            query_string = urlencode(sorted(request.args.items(multi=True)))
+            etag = hashlib.sha1(f"{scope}:{version}:{request.path}?{query_string}".encode()).hexdigest()[:32]
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return decorated_function
+    return decorator
@@ -0,0 +1,79 @@
+# backend/utils/rate_stats.py
+
+from collections import namedtuple
+import math
+
+try:
+    import numpy as np  # Optional dependency; the pure-Python path below is the fallback
+except ImportError:  # pragma: no cover - exercised only where NumPy is absent
+    np = None
+
+Z_95 = 1.959963984540054 # Two-sided 95% normal quantile
+POD_WIN_RATE = 0.25 # An average deck wins one 4-player pod in four
+PRIOR_GAMES = 8 # Weight of the smoothing prior, in pseudo-games
+
+RateEstimate = namedtuple("RateEstimate", "win_rate lower upper smoothed")
+
+
+def pooled_rate(wins, games, default=POD_WIN_RATE):
+    """Overall wins / games of a group of buckets, used as their smoothing prior."""
+    total_games = sum(games)
+    return sum(wins) / total_games if total_games > 0 else default
+
+
+def _estimates_numpy(wins, games, prior_rate, prior_games, z):
+    wins = np.asarray(wins, dtype=np.float64)
+    games = np.asarray(games, dtype=np.float64)
+    played = games > 0
+    n = np.where(played, games, 1.0)
+    p = np.where(played, wins / n, 0.0)
+
+    z2 = z * z
+    denominator = 1 + z2 / n
+    center = (p + z2 / (2 * n)) / denominator
+    margin = z / denominator * np.sqrt(p * (1 - p) / n + z2 / (4 * n * n))
+    lower = np.where(played, np.clip(center - margin, 0.0, 1.0), 0.0)
+    upper = np.where(played, np.clip(center + margin, 0.0, 1.0), 1.0)
+    smoothed = (wins + prior_rate * prior_games) / (games + prior_games)
+    return zip(p.tolist(), lower.tolist(), upper.tolist(), smoothed.tolist())
+
+
+def _estimates_python(wins, games, prior_rate, prior_games, z):
+    z2 = z * z
+    for won, n in zip(wins, games):
+        smoothed = (won + prior_rate * prior_games) / (n + prior_games)
+        if n <= 0:
+            yield 0.0, 0.0, 1.0, smoothed
+            continue
+        p = won / n
+        denominator = 1 + z2 / n
+        center = (p + z2 / (2 * n)) / denominator
+        margin = z / denominator * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n))
+        yield p, min(max(center - margin, 0.0), 1.0), min(max(center + margin, 0.0), 1.0), smoothed
+
+
+def rate_estimates(wins, games, prior_rate=POD_WIN_RATE, prior_games=PRIOR_GAMES, z=Z_95, use_numpy=None):
+    """
+    Raw win rate, Wilson score interval and beta-smoothed win rate for parallel
+    sequences of win and game counts, computed in one vectorized pass. Smoothing
+    adds `prior_games` pseudo-games won at `prior_rate` (the mean of a Beta prior),
+    so small samples are pulled towards the prior and large ones barely move.
+    Returns RateEstimate tuples in percent, rounded to one decimal. A bucket
+    without games has a 0-100 interval and the prior as its smoothed rate.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    compute = _estimates_numpy if use_numpy else _estimates_python
+    return [
+        RateEstimate(*(round(value * 100, 1) for value in values))
+        for values in compute(wins, games, prior_rate, prior_games, z)
+    ]
+
+
+def estimate_fields(estimate):
+    """The interval and smoothed rate as the extra keys of a stats payload."""
+    return {
+        "win_rate_lower": estimate.lower,
+        "win_rate_upper": estimate.upper,
+        "smoothed_win_rate": estimate.smoothed,
+    }
@@ -0,0 +1,64 @@
+# gunicorn.conf.py
+#
+# Production server profile, read automatically by `gunicorn app:app` from the
+# project root. Every value can be overridden through the environment:
+#
+#   WEB_CONCURRENCY    worker processes (default: 2 x CPUs + 1, capped by GUNICORN_MAX_WORKERS)
+#   GUNICORN_THREADS   threads per worker (default 4; 1 switches to the sync worker)
+#   DB_POOL_SIZE       SQLAlchemy connections kept per worker (default: threads + JOBS_WORKERS)
+#   AUTH_HASH_WORKERS  bcrypt threads per worker (default: CPUs / workers, at least 1)
+#
+# The app is loaded once in the master (preload_app) and forked, so workers
+# share its memory pages and start instantly. Anything holding a socket at fork
+# time must be reopened in the child: post_fork drops the inherited database
+# connections, gives the local response cache a new epoch, and starts the
+# worker's job runner threads (so queued retries run without waiting for a
+# request). The local response cache only works in one process, so with more
+# than one worker the response cache and ETags need REDIS_URL (they are
+# switched off without it). The password hasher starts its pool lazily per
+# process, and redis-py reconnects by itself after a fork.
+import os
+
+CPU_COUNT = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+
+bind = f"[::]:{os.environ.get('PORT', '8080')}"
+preload_app = True
+
+workers = int(os.environ.get("WEB_CONCURRENCY", min(CPU_COUNT * 2 + 1, int(os.environ.get("GUNICORN_MAX_WORKERS", 8)))))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+worker_class = "gthread" if threads > 1 else "sync"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+# Recycle workers now and then so slow leaks cannot grow forever; jitter keeps them from restarting together
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 200))
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+# Tells create_app how many processes serve requests (see the response cache note above)
+os.environ["WEB_CONCURRENCY"] = str(workers)
+# Every request thread plus every job thread may hold a connection at once.
+# Set before the app is preloaded so create_app sizes each worker's pool from it.
+os.environ.setdefault("DB_POOL_SIZE", str(threads + int(os.environ.get("JOBS_WORKERS", 2))))
+# bcrypt is CPU bound: share the cores between the workers' hashing pools instead of 2 threads each
+os.environ.setdefault("AUTH_HASH_WORKERS", str(max(1, CPU_COUNT // workers)))
+
+
+def when_ready(server):
+    per_worker = int(os.environ["DB_POOL_SIZE"]) + int(os.environ.get("DB_MAX_OVERFLOW", 5))
+    server.log.info(
+        f"Serving with {workers} workers x {threads} threads ({worker_class}); "
+        f"up to {workers * per_worker} database connections ({per_worker} per worker)."
+    )
+
+
+def post_fork(server, worker):
+    app = server.app.wsgi()
+    if server.cfg.preload_app:
+        from backend.database import dispose_engines_after_fork
+        dispose_engines_after_fork(app)
+        app.extensions["response_cache"].after_fork()
+    app.extensions["jobs"].start()
@@ -1,12 +1,26 @@
 import os
 import time
-import requests
 import click
+from flask import current_app
 from backend import db
-from sqlalchemy import func, update
 
 try:
-    from backend.models import DeckType, Commander
+    from backend.models import DeckType
+    from backend.services.decks.deck_stats_service import rebuild_deck_stats, verify_deck_stats
+    from backend.services.matches.opponent_signature_service import rebuild_opponent_signatures, users_who_logged_commanders
+    from backend.services.matches.rating_service import replay_ratings
+    from backend.services.matches.match_import_service import parse_import_payload, import_matches, MatchImportError
+    from backend.services.synthetic_data_service import seed_synthetic_data, purge_synthetic_data, SyntheticDataError, DEFAULT_PASSWORD
+    from backend.services.commanders.commander_catalog_service import invalidate_commander_catalog
+    from backend.cache import bump_user_data_version, bump_global_data_version
+    from backend.jobs import jobs
+    from backend.password_hasher import time_rounds
+    from backend.session_store import purge_expired_sessions, PURGE_BATCH_SIZE
+    from backend.services.commanders.commander_flag_service import reclassify_commander_flags, FLAG_NAMES
+    from backend.services.commanders.commander_ingest_service import (
+        ingest_bulk_file, BulkDataError, card_to_row, load_content_hashes, sync_commander_rows,
+        load_commander_names, renamed_commander_ids
+    )
 except ImportError:
     print("Error: models not imported")
     exit()
@@ -42,6 +56,7 @@ def seed_deck_types():
 
         if count > 0:
             db.session.commit()
+            bump_global_data_version()
             print(f"Successfully added {count} new deck types.")
         else:
             print("No new deck types to add.")
@@ -52,15 +67,34 @@ def seed_deck_types():
 
 
 @click.command("update-commanders")
-def update_commanders_data():
+@click.option("--bulk-file", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="Ingest a downloaded Scryfall bulk-data file (oracle_cards.json) instead of paging the search API.")
+def update_commanders_data(bulk_file):
     """Fetches and updates commander data from Scryfall."""
+    names_before = load_commander_names()
+    if bulk_file:
+        print(f"Ingesting Scryfall bulk data from {bulk_file}...")
+        try:
+            report = ingest_bulk_file(bulk_file)
+        except BulkDataError as e:
+            db.session.rollback()
+            print(f"ERROR: {e}")
+            return
+        finally:
+            _rebuild_signatures_after_renames(names_before)
+            invalidate_commander_catalog()
+            bump_global_data_version() # Commander names and images appear in every user's responses
+        print(f"Finished bulk ingest. Cards read: {report['read']}, Added: {report['added']}, Changed: {report['changed']}, Unchanged: {report['unchanged']}, Skipped: {report['skipped']}")
+        return
+
+    import requests # Only the Scryfall path needs it
     print("Connecting using Flask-SQLAlchemy context...")
     base_url = 'https://api.scryfall.com/cards/search?q=is:commander+not:digital'
     next_page = base_url
     count_processed = 0
-    count_added = 0
-    count_updated = 0
+    totals = {"added": 0, "changed": 0, "unchanged": 0}
     page_count = 0
+    known_hashes = load_content_hashes()
 
     print("Starting Scryfall commander update...")
     while next_page:
@@ -77,72 +111,13 @@ def update_commanders_data():
                 break
 
             print(f"Processing {len(cards_in_page)} cards from page {page_count}...")
-            page_added = 0
-            page_updated = 0
-
-            for card_data in cards_in_page:
-                scryfall_id = card_data.get("id")
-                if not scryfall_id: continue
-
-                existing_commander = db.session.execute(
-                    db.select(Commander).filter_by(scryfall_id=scryfall_id)
-                ).scalar_one_or_none()
-
-                name = card_data.get("name", "")
-                flavor_name = card_data.get("flavor_name", None)
-                mana_cost = card_data.get("mana_cost", "")
-                type_line = card_data.get("type_line", "")
-                oracle_text = card_data.get("oracle_text", "")
-                power = card_data.get("power", None)
-                toughness = card_data.get("toughness", None)
-                loyalty = card_data.get("loyalty", None)
-                colors = ",".join(card_data.get("colors", [])) 
-                color_identity = ",".join(card_data.get("color_identity", [])) 
-                set_code = card_data.get("set", "")
-                image_uris = card_data.get("image_uris", {}) 
-                image_url = image_uris.get("normal") if image_uris else None
-                art_crop = image_uris.get("art_crop") if image_uris else None
-
-                if existing_commander:
-                    existing_commander.name = name
-                    existing_commander.flavor_name = flavor_name
-                    existing_commander.mana_cost = mana_cost
-                    existing_commander.type_line = type_line
-                    existing_commander.oracle_text = oracle_text
-                    existing_commander.power = power
-                    existing_commander.toughness = toughness
-                    existing_commander.loyalty = loyalty
-                    existing_commander.colors = colors
-                    existing_commander.color_identity = color_identity
-                    existing_commander.set_code = set_code
-                    existing_commander.image_url = image_url
-                    existing_commander.art_crop = art_crop
-                    page_updated += 1
-                else:
-                    new_commander = Commander(
-                        scryfall_id=scryfall_id,
-                        name=name,
-                        flavor_name=flavor_name,
-                        mana_cost=mana_cost,
-                        type_line=type_line,
-                        oracle_text=oracle_text,
-                        power=power,
-                        toughness=toughness,
-                        loyalty=loyalty,
-                        colors=colors,
-                        color_identity=color_identity,
-                        set_code=set_code,
-                        image_url=image_url,
-                        art_crop=art_crop
-                    )
-                    db.session.add(new_commander)
-                    page_added += 1
-                count_processed += 1
-
+            rows = [card_to_row(card_data) for card_data in cards_in_page if card_data.get("id")]
+            page_counts = sync_commander_rows(rows, known_hashes)
             db.session.commit()
-            count_added += page_added
-            count_updated += page_updated
-            print(f"Page {page_count} committed. Added this page: {page_added}, Updated this page: {page_updated}")
+            count_processed += len(rows)
+            for key, value in page_counts.items():
+                totals[key] += value
+            print(f"Page {page_count} committed. Added: {page_counts['added']}, Changed: {page_counts['changed']}, Unchanged: {page_counts['unchanged']}")
 
         except requests.exceptions.RequestException as e:
             print(f"Scryfall request error on page {page_count}: {e}")
@@ -161,63 +136,228 @@ def update_commanders_data():
              else:
                  print("No next_page URL found. Update should be complete.")
 
+    _rebuild_signatures_after_renames(names_before)
+    invalidate_commander_catalog()
+    bump_global_data_version()
+    print(f"Finished commander update. Total Processed: {count_processed}. Added: {totals['added']}, Changed: {totals['changed']}, Unchanged: {totals['unchanged']}")
 
-    print(f"Finished commander update. Total Processed: {count_processed}. Total Added: {count_added}, Total Updated: {count_updated}")
+
+def _rebuild_signatures_after_renames(names_before):
+    """
+    Seat signatures are built from commander names, so a renamed commander would
+    split its opponents' matchups and ratings. Rebuilds the signatures (and replays
+    the ratings) of every user who logged a renamed commander, one user per commit.
+    """
+    db.session.rollback() # Whatever failed above must not leak into the rebuild
+    renamed = renamed_commander_ids(names_before)
+    if not renamed:
+        return
+    user_ids = users_who_logged_commanders(renamed)
+    print(f"{len(renamed)} commanders renamed; rebuilding opponent signatures for {len(user_ids)} users...")
+    for user_id in user_ids:
+        try:
+            rebuild_opponent_signatures(user_id)
+            replay_ratings(user_id)
+            db.session.commit()
+            bump_user_data_version(user_id)
+        except Exception as e:
+            db.session.rollback()
+            print(f"ERROR rebuilding opponent signatures for user {user_id}: {e} (run `flask rebuild-opponent-signatures --user-id {user_id}`)")
 
 
 @click.command("update-flags")
 def update_flags():
-    """Updates boolean flags on Commander records based on oracle text or type line."""
+    """Recomputes pairing flags on Commander records from oracle text and type line."""
     print("Updating commander flags...")
     try:
-        print("Updating 'partner' flag...")
-        stmt_partner = update(Commander).where(
-            Commander.oracle_text.like('%Partner%')
-        ).values(partner=True)
-        result_partner = db.session.execute(stmt_partner)
-        print(f"Rows potentially affected by partner update: {result_partner.rowcount}")
-
-        print("Updating 'background' flag...")
-        stmt_bg = update(Commander).where(
-            Commander.type_line == 'Legendary Enchantment — Background'
-        ).values(background=True)
-        result_bg = db.session.execute(stmt_bg)
-        print(f"Rows potentially affected by background update: {result_bg.rowcount}")
-
-        print("Updating 'friends_forever' flag...")
-        stmt_ff = update(Commander).where(
-            func.lower(Commander.oracle_text).like('%friends forever%')
-        ).values(friends_forever=True)
-        result_ff = db.session.execute(stmt_ff)
-        print(f"Rows potentially affected by friends_forever update: {result_ff.rowcount}")
-
-        print("Updating 'doctor_companion' flag...")
-        normalized_text_dc = func.replace(Commander.oracle_text, '’', "'")
-        pattern_dc = '%Doctor\'s companion%'
-        stmt_dc = update(Commander).where(
-            normalized_text_dc.ilike(pattern_dc)
-        ).values(doctor_companion=True)
-        result_dc = db.session.execute(stmt_dc)
-        print(f"Rows potentially affected by doctor_companion update: {result_dc.rowcount}")
-
-        print("Updating 'time_lord_doctor' flag...")
-        stmt_tld = update(Commander).where(
-            Commander.type_line.ilike('%Time Lord Doctor%')
-        ).values(time_lord_doctor=True)
-        result_tld = db.session.execute(stmt_tld)
-        print(f"Rows potentially affected by time_lord_doctor update: {result_tld.rowcount}")
-
-        print("Updating 'choose_a_background' flag...")
-        stmt_cab = update(Commander).where(
-            func.lower(Commander.oracle_text).like('%choose a background%')
-        ).values(choose_a_background=True)
-        result_cab = db.session.execute(stmt_cab)
-        print(f"Rows potentially affected by choose_a_background update: {result_cab.rowcount}")
-
-        print("Committing flag updates...")
+        report = reclassify_commander_flags()
+        for flag in FLAG_NAMES:
+            print(f"  {flag}: set on {report['set'][flag]}, cleared on {report['cleared'][flag]}")
+        db.session.commit()
+        invalidate_commander_catalog()
+        bump_global_data_version()
+        print(f"✅ Commander flags updated successfully. Checked: {report['checked']}, Changed: {report['changed']}")
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"ERROR updating flags: {e}")
+
+
+def _bump_data_version(user_id):
+    """Invalidates cached responses after a rebuild scoped to one user, or everyone's without one."""
+    if user_id:
+        bump_user_data_version(user_id)
+    else:
+        bump_global_data_version()
+
+
+@click.command("rebuild-deck-stats")
+@click.option("--user-id", type=int, default=None, help="Only rebuild/verify decks owned by this user.")
+@click.option("--verify-only", is_flag=True, help="Report rollup rows that disagree with match history without rewriting them.")
+def rebuild_deck_stats_command(user_id, verify_only):
+    """Backfills the deck_stats rollup table from logged matches and verifies it."""
+    scope = f"user {user_id}" if user_id else "all users"
+    try:
+        if not verify_only:
+            print(f"Rebuilding deck stats for {scope}...")
+            rebuilt = rebuild_deck_stats(user_id)
+            db.session.commit()
+            _bump_data_version(user_id)
+            print(f"Rebuilt {rebuilt} deck stats rows.")
+
+        print(f"Verifying deck stats for {scope}...")
+        mismatches = verify_deck_stats(user_id)
+        if not mismatches:
+            print("✅ Deck stats match logged match history.")
+            return
+        for mismatch in mismatches[:50]:
+            print(f"  ! Deck {mismatch['deck_id']} {mismatch['field']}: expected {mismatch['expected']}, found {mismatch['actual']}")
+        if len(mismatches) > 50:
+            print(f"  ... and {len(mismatches) - 50} more.")
+        print(f"Found {len(mismatches)} mismatches. Run without --verify-only to rebuild.")
+    except Exception as e:
+        db.session.rollback()
+        print(f"ERROR rebuilding deck stats: {e}")
+
+
+@click.command("rebuild-opponent-signatures")
+@click.option("--user-id", type=int, default=None, help="Only rebuild signatures for matches logged by this user.")
+def rebuild_opponent_signatures_command(user_id):
+    """Recomputes opponent_seat_signatures from opponent commanders (e.g. after commander renames)."""
+    scope = f"user {user_id}" if user_id else "all users"
+    try:
+        print(f"Rebuilding opponent seat signatures for {scope}...")
+        written = rebuild_opponent_signatures(user_id)
+        # Opponent ratings are keyed by signature, so they follow the rebuilt rows
+        replay_ratings(user_id)
+        db.session.commit()
+        _bump_data_version(user_id)
+        print(f"✅ Wrote {written} opponent seat signatures and replayed ratings.")
+    except Exception as e:
+        db.session.rollback()
+        print(f"ERROR rebuilding opponent seat signatures: {e}")
+
+
+@click.command("replay-ratings")
+@click.option("--user-id", type=int, default=None, help="Only replay ratings for matches logged by this user.")
+def replay_ratings_command(user_id):
+    """Recomputes deck and opponent ratings from match history, oldest match first."""
+    scope = f"user {user_id}" if user_id else "all users"
+    try:
+        print(f"Replaying ratings for {scope}...")
+        written = replay_ratings(user_id)
         db.session.commit()
-        print("✅ Commander flags updated successfully.")
+        _bump_data_version(user_id)
+        print(f"✅ Wrote {written} ratings.")
+    except Exception as e:
+        db.session.rollback()
+        print(f"ERROR replaying ratings: {e}")
+
 
+@click.command("run-jobs")
+@click.option("--limit", type=click.IntRange(min=1), default=100, show_default=True, help="Maximum jobs to attempt.")
+def run_jobs_command(limit):
+    """Attempts due background jobs (retries and jobs left by a stopped worker) in this process."""
+    try:
+        attempted = jobs.run_due(limit)
+        print(f"✅ Attempted {attempted} jobs.")
     except Exception as e:
         db.session.rollback()
-        print(f"ERROR updating flags: {e}")
\ No newline at end of file
+        print(f"ERROR running jobs: {e}")
+
+
+@click.command("tune-bcrypt")
+@click.option("--target-ms", type=click.IntRange(min=1), default=250, show_default=True, help="Longest acceptable time for one hash.")
+@click.option("--min-rounds", type=click.IntRange(min=4, max=31), default=10, show_default=True)
+@click.option("--max-rounds", type=click.IntRange(min=4, max=31), default=14, show_default=True)
+def tune_bcrypt_command(target_ms, min_rounds, max_rounds):
+    """Times bcrypt cost factors on this machine and suggests BCRYPT_LOG_ROUNDS."""
+    print(f"Current BCRYPT_LOG_ROUNDS: {current_app.config.get('BCRYPT_LOG_ROUNDS')}")
+    best = None
+    for rounds in range(min_rounds, max_rounds + 1):
+        elapsed_ms = time_rounds(rounds) * 1000
+        print(f"  cost {rounds:>2}: {elapsed_ms:8.1f} ms")
+        if elapsed_ms > target_ms:
+            break # Each step doubles the time, so no higher cost can fit
+        best = rounds
+    if best is None:
+        print(f"No cost factor from {min_rounds} hashes within {target_ms} ms on this machine.")
+    else:
+        print(f"✅ Suggested BCRYPT_LOG_ROUNDS={best} (existing hashes are upgraded on next login).")
+
+
+@click.command("purge-sessions")
+@click.option("--batch-size", type=click.IntRange(min=1), default=PURGE_BATCH_SIZE, show_default=True, help="Rows deleted per transaction.")
+def purge_sessions_command(batch_size):
+    """Deletes expired rows from the sessions table in batches (run from cron)."""
+    table_name = current_app.config.get("SESSION_SQLALCHEMY_TABLE", "sessions")
+    try:
+        deleted = purge_expired_sessions(table_name, batch_size)
+        print(f"✅ Purged {deleted} expired sessions from '{table_name}'.")
+    except Exception as e:
+        db.session.rollback()
+        print(f"ERROR purging sessions: {e}")
+
+
+@click.command("import-matches")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--user-id", type=int, required=True, help="User the matches are imported for.")
+@click.option("--format", "import_format", type=click.Choice(["csv", "json"]), default=None, help="Defaults to the file extension.")
+def import_matches_command(path, user_id, import_format):
+    """Bulk-imports historical matches for a user from a CSV or JSON file."""
+    import_format = import_format or ("csv" if path.lower().endswith(".csv") else "json")
+    try:
+        with open(path, "rb") as f:
+            rows = parse_import_payload(f.read(), import_format)
+        print(f"Importing {len(rows)} rows for user {user_id}...")
+        report = import_matches(user_id, rows)
+    except MatchImportError as e:
+        print(f"ERROR: {e}")
+        return
+
+    if report["imported"]:
+        bump_user_data_version(user_id)
+    for error in report["errors"][:50]:
+        print(f"  ! Row {error['row']}: {error['error']}")
+    if len(report["errors"]) > 50:
+        print(f"  ... and {len(report['errors']) - 50} more.")
+    print(f"✅ Imported {report['imported']} matches ({report['failed']} failed).")
+
+
+@click.command("seed-synthetic")
+@click.option("--users", type=click.IntRange(min=1), default=10, show_default=True, help="Synthetic accounts to create.")
+@click.option("--matches-per-user", type=click.IntRange(min=0), default=1000, show_default=True, help="Matches logged by each account.")
+@click.option("--decks-per-user", type=click.IntRange(min=1), default=6, show_default=True, help="Decks owned by each account.")
+@click.option("--seed", type=int, default=None, help="Random seed for reproducible data.")
+@click.option("--password", default=DEFAULT_PASSWORD, show_default=True, help="Password of every synthetic account.")
+@click.option("--purge", is_flag=True, help="Delete all previously generated synthetic users and their data instead.")
+def seed_synthetic_command(users, matches_per_user, decks_per_user, seed, password, purge):
+    """Generates synthetic users, decks, tags and matches for benchmarking and load tests."""
+    if purge:
+        try:
+            removed = purge_synthetic_data()
+            db.session.commit()
+            print(f"✅ Removed {removed} synthetic users and their data.")
+        except Exception as e:
+            db.session.rollback()
+            print(f"ERROR purging synthetic data: {e}")
+        return
+
+    print(f"Seeding {users} synthetic users with {matches_per_user} matches each...")
+    started = time.perf_counter()
+    try:
+        report = seed_synthetic_data(users, matches_per_user, decks_per_user=decks_per_user, seed=seed, password=password)
+    except SyntheticDataError as e:
+        print(f"ERROR: {e}")
+        return
+    except Exception as e:
+        db.session.rollback()
+        print(f"ERROR seeding synthetic data: {e}")
+        return
+
+    user_ids = report["user_ids"]
+    print(
+        f"✅ Created {len(user_ids)} users (ids {user_ids[0]}-{user_ids[-1]}), {report['decks']} decks "
+        f"({report['deleted_decks']} deleted), {report['tags']} tags and {report['matches']} matches "
+        f"({report['deleted_matches']} deleted) in {time.perf_counter() - started:.1f}s."
+    )
@@ -0,0 +1,72 @@
+"""Add deck_stats rollup table and backfill it from logged_matches
+
+Revision ID: a3c9e1f2b7d4
+Revises: 79bc8bbe0474
+Create Date: 2026-10-18 10:12:41.118302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c9e1f2b7d4'
+down_revision = '79bc8bbe0474'
+branch_labels = None
+depends_on = None
+
+SEATS = (1, 2, 3, 4)
+
+
+def upgrade():
+    counter_columns = [
+        sa.Column('total_matches', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('total_wins', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('total_draws', sa.Integer(), server_default='0', nullable=False),
+    ]
+    for seat in SEATS:
+        counter_columns.append(sa.Column(f'seat_{seat}_matches', sa.Integer(), server_default='0', nullable=False))
+        counter_columns.append(sa.Column(f'seat_{seat}_wins', sa.Integer(), server_default='0', nullable=False))
+
+    op.create_table('deck_stats',
+    sa.Column('deck_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    *counter_columns,
+    sa.Column('last_match', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['deck_id'], ['decks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('deck_id')
+    )
+    with op.batch_alter_table('deck_stats', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_deck_stats_user_id'), ['user_id'], unique=False)
+
+    # Backfill: one row per active deck, counting only active matches logged by the deck owner.
+    seat_sums = ",\n".join(
+        f"SUM(CASE WHEN lm.player_position = {seat} THEN 1 ELSE 0 END), "
+        f"SUM(CASE WHEN lm.player_position = {seat} AND lm.result = 0 THEN 1 ELSE 0 END)"
+        for seat in SEATS
+    )
+    seat_columns = ", ".join(f"seat_{seat}_matches, seat_{seat}_wins" for seat in SEATS)
+    op.execute(f"""
+        INSERT INTO deck_stats (deck_id, user_id, total_matches, total_wins, total_draws, {seat_columns}, last_match)
+        SELECT
+            d.id, d.user_id,
+            COUNT(lm.id),
+            SUM(CASE WHEN lm.result = 0 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN lm.result = 2 THEN 1 ELSE 0 END),
+            {seat_sums},
+            MAX(lm.timestamp)
+        FROM decks d
+        LEFT OUTER JOIN logged_matches lm
+            ON lm.deck_id = d.id AND lm.logger_user_id = d.user_id AND lm.is_active = TRUE
+        WHERE d.is_active = TRUE
+        GROUP BY d.id, d.user_id
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('deck_stats', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_deck_stats_user_id'))
+
+    op.drop_table('deck_stats')
@@ -0,0 +1,43 @@
+"""Add ratings table for deck and opponent command zone ratings
+
+Existing history is rated by running `flask replay-ratings` once after upgrading;
+the rating math lives in backend/services/matches/rating_service.py.
+
+Revision ID: a8d4e6f10b52
+Revises: f1c7a2e9b403
+Create Date: 2026-10-18 18:05:41.527310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d4e6f10b52'
+down_revision = 'f1c7a2e9b403'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ratings',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('deck_id', sa.Integer(), nullable=True),
+    sa.Column('signature_hash', sa.String(length=16), nullable=True),
+    sa.Column('signature', sa.Text(), nullable=True),
+    sa.Column('rating', sa.Float(), nullable=False),
+    sa.Column('deviation', sa.Float(), nullable=False),
+    sa.Column('games', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.CheckConstraint('(deck_id IS NULL) <> (signature_hash IS NULL)', name='check_rating_single_subject'),
+    sa.ForeignKeyConstraint(['deck_id'], ['decks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'deck_id', name='uq_ratings_user_deck'),
+    sa.UniqueConstraint('user_id', 'signature_hash', name='uq_ratings_user_signature')
+    )
+
+
+def downgrade():
+    op.drop_table('ratings')
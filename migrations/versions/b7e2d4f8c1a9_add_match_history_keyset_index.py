@@ -0,0 +1,31 @@
+"""Add composite index for keyset pagination of match history
+
+Revision ID: b7e2d4f8c1a9
+Revises: a3c9e1f2b7d4
+Create Date: 2026-10-18 11:02:17.540219
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2d4f8c1a9'
+down_revision = 'a3c9e1f2b7d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('logged_matches', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_logged_matches_user_active_timestamp_id',
+            # Same direction as ORDER BY timestamp DESC, id DESC
+            ['logger_user_id', 'is_active', sa.text('timestamp DESC'), sa.text('id DESC')],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('logged_matches', schema=None) as batch_op:
+        batch_op.drop_index('ix_logged_matches_user_active_timestamp_id')
@@ -0,0 +1,89 @@
+"""Add opponent_seat_signatures table and backfill it from opponent_commanders_in_match
+
+Revision ID: c4f1a8e93d27
+Revises: b7e2d4f8c1a9
+Create Date: 2026-10-18 11:48:03.662180
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from collections import defaultdict
+import hashlib
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f1a8e93d27'
+down_revision = 'b7e2d4f8c1a9'
+branch_labels = None
+depends_on = None
+
+SEPARATOR = ' / '
+BATCH_SIZE = 1000
+
+
+def _signature_rows(match_id, user_id, names_by_seat):
+    rows = []
+    for seat, names in sorted(names_by_seat.items()):
+        signature = SEPARATOR.join(sorted(names))
+        rows.append({
+            'logged_match_id': match_id,
+            'logger_user_id': user_id,
+            'seat_number': seat,
+            'signature': signature,
+            'signature_hash': hashlib.sha1(signature.encode('utf-8')).hexdigest()[:16],
+        })
+    return rows
+
+
+def upgrade():
+    signatures = op.create_table('opponent_seat_signatures',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('logged_match_id', sa.Integer(), nullable=False),
+    sa.Column('logger_user_id', sa.Integer(), nullable=False),
+    sa.Column('seat_number', sa.Integer(), nullable=False),
+    sa.Column('signature', sa.Text(), nullable=False),
+    sa.Column('signature_hash', sa.String(length=16), nullable=False),
+    sa.CheckConstraint('seat_number >= 1 AND seat_number <= 4', name='check_oss_seat_number'),
+    sa.ForeignKeyConstraint(['logged_match_id'], ['logged_matches.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['logger_user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('logged_match_id', 'seat_number', name='uq_opponent_seat_signature_match_seat')
+    )
+    with op.batch_alter_table('opponent_seat_signatures', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_opponent_seat_signatures_logged_match_id'), ['logged_match_id'], unique=False)
+        batch_op.create_index('ix_opponent_seat_signatures_user_hash', ['logger_user_id', 'signature_hash'], unique=False)
+
+    # Backfill in Python so the canonical signature and hash match the application code on every dialect.
+    # The join is streamed (server-side cursor where supported) and written in batches, so memory stays flat.
+    bind = op.get_bind()
+    source = bind.execute(sa.text("""
+        SELECT ocim.logged_match_id, lm.logger_user_id, ocim.seat_number, c.name
+        FROM opponent_commanders_in_match ocim
+        JOIN logged_matches lm ON lm.id = ocim.logged_match_id
+        JOIN commanders c ON c.id = ocim.commander_id
+        ORDER BY ocim.logged_match_id
+    """).execution_options(yield_per=BATCH_SIZE))
+
+    pending = []
+    current_match, current_user, names_by_seat = None, None, defaultdict(list)
+    for match_id, user_id, seat, name in source:
+        if match_id != current_match:
+            if current_match is not None:
+                pending.extend(_signature_rows(current_match, current_user, names_by_seat))
+            current_match, current_user, names_by_seat = match_id, user_id, defaultdict(list)
+            if len(pending) >= BATCH_SIZE:
+                op.bulk_insert(signatures, pending)
+                pending = []
+        names_by_seat[seat].append(name)
+    if current_match is not None:
+        pending.extend(_signature_rows(current_match, current_user, names_by_seat))
+    if pending:
+        op.bulk_insert(signatures, pending)
+
+
+def downgrade():
+    with op.batch_alter_table('opponent_seat_signatures', schema=None) as batch_op:
+        batch_op.drop_index('ix_opponent_seat_signatures_user_hash')
+        batch_op.drop_index(batch_op.f('ix_opponent_seat_signatures_logged_match_id'))
+
+    op.drop_table('opponent_seat_signatures')
@@ -0,0 +1,63 @@
+"""Add content_hash to commanders and backfill it from the stored Scryfall fields
+
+Revision ID: d9a3b6c2e015
+Revises: c4f1a8e93d27
+Create Date: 2026-10-18 14:02:41.318552
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import hashlib
+import json
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9a3b6c2e015'
+down_revision = 'c4f1a8e93d27'
+branch_labels = None
+depends_on = None
+
+# Must match commander_ingest_service.HASHED_COLUMNS / content_hash so the first
+# refresh after this migration only touches cards that really changed.
+CARD_COLUMNS = [
+    'name', 'flavor_name', 'mana_cost', 'cmc', 'type_line', 'oracle_text', 'power', 'toughness',
+    'loyalty', 'colors', 'color_identity', 'set_code', 'image_url', 'art_crop',
+]
+FLAG_COLUMNS = ['partner', 'background', 'choose_a_background', 'friends_forever', 'doctor_companion', 'time_lord_doctor']
+BATCH_SIZE = 1000
+
+
+def _content_hash(row):
+    values = []
+    for column in CARD_COLUMNS + FLAG_COLUMNS:
+        value = row[column]
+        if column in FLAG_COLUMNS:
+            value = bool(value)
+        elif column == 'cmc' and value is not None:
+            value = float(value)
+        values.append(value)
+    return hashlib.sha1(json.dumps(values, separators=(',', ':'), ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def upgrade():
+    with op.batch_alter_table('commanders', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=40), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        f"SELECT id, {', '.join(CARD_COLUMNS + FLAG_COLUMNS)} FROM commanders"
+    )).mappings().fetchall()
+    update = sa.text("UPDATE commanders SET content_hash = :content_hash WHERE id = :id")
+    pending = []
+    for row in rows:
+        pending.append({'id': row['id'], 'content_hash': _content_hash(row)})
+        if len(pending) >= BATCH_SIZE:
+            bind.execute(update, pending)
+            pending = []
+    if pending:
+        bind.execute(update, pending)
+
+
+def downgrade():
+    with op.batch_alter_table('commanders', schema=None) as batch_op:
+        batch_op.drop_column('content_hash')
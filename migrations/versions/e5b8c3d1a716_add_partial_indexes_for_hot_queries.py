@@ -0,0 +1,48 @@
+"""Add partial indexes over active rows for the dashboard, deck details and tag queries
+
+Replaces the single-column is_active indexes on logged_matches and decks.
+
+Revision ID: e5b8c3d1a716
+Revises: d9a3b6c2e015
+Create Date: 2026-10-18 15:11:52.907364
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b8c3d1a716'
+down_revision = 'd9a3b6c2e015'
+branch_labels = None
+depends_on = None
+
+# Same predicate as backend.database.ACTIVE_ROWS_ONLY
+ACTIVE_ROWS_ONLY = {'postgresql_where': sa.text('is_active'), 'sqlite_where': sa.text('is_active = 1')}
+
+LOGGED_MATCH_INDEXES = {
+    'ix_logged_matches_active_user_position': ['logger_user_id', 'player_position', 'result'],
+    'ix_logged_matches_active_user_deck': ['logger_user_id', 'deck_id', 'result'],
+    'ix_logged_matches_active_deck_user_mulligans': ['deck_id', 'logger_user_id', 'player_mulligans', 'result'],
+    'ix_logged_matches_active_deck_timestamp_id': ['deck_id', sa.text('timestamp DESC'), sa.text('id DESC')],
+}
+
+
+def upgrade():
+    for name, columns in LOGGED_MATCH_INDEXES.items():
+        op.create_index(name, 'logged_matches', columns, unique=False, **ACTIVE_ROWS_ONLY)
+    op.create_index('ix_decks_active_user_type', 'decks', ['user_id', 'deck_type_id'], unique=False, **ACTIVE_ROWS_ONLY)
+    op.create_index('ix_tags_user_id_is_active', 'tags', ['user_id', 'is_active'], unique=False)
+    # Every query on these tables is scoped to a user; the bare boolean indexes only
+    # tempt the planner into scanning all users' active rows.
+    op.drop_index('ix_logged_matches_is_active', table_name='logged_matches')
+    op.drop_index('ix_decks_is_active', table_name='decks')
+
+
+def downgrade():
+    op.create_index('ix_decks_is_active', 'decks', ['is_active'], unique=False)
+    op.create_index('ix_logged_matches_is_active', 'logged_matches', ['is_active'], unique=False)
+    op.drop_index('ix_tags_user_id_is_active', table_name='tags')
+    op.drop_index('ix_decks_active_user_type', table_name='decks')
+    for name in reversed(list(LOGGED_MATCH_INDEXES)):
+        op.drop_index(name, table_name='logged_matches')
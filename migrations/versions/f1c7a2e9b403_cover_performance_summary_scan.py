@@ -0,0 +1,40 @@
+"""Replace the per-aggregate performance summary indexes with one covering index
+
+The summary is now a single scan of the user's active matches, so the
+(user, position) and (user, deck) partial indexes no longer match any query.
+
+Revision ID: f1c7a2e9b403
+Revises: e5b8c3d1a716
+Create Date: 2026-10-18 16:40:03.118254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c7a2e9b403'
+down_revision = 'e5b8c3d1a716'
+branch_labels = None
+depends_on = None
+
+# Same predicate as backend.database.ACTIVE_ROWS_ONLY
+ACTIVE_ROWS_ONLY = {'postgresql_where': sa.text('is_active'), 'sqlite_where': sa.text('is_active = 1')}
+
+
+def upgrade():
+    op.create_index(
+        'ix_logged_matches_active_user_summary', 'logged_matches',
+        ['logger_user_id', 'timestamp', 'deck_id', 'player_position', 'result'],
+        unique=False, postgresql_include=['id'], **ACTIVE_ROWS_ONLY
+    )
+    op.drop_index('ix_logged_matches_active_user_deck', table_name='logged_matches')
+    op.drop_index('ix_logged_matches_active_user_position', table_name='logged_matches')
+
+
+def downgrade():
+    op.create_index('ix_logged_matches_active_user_position', 'logged_matches',
+                    ['logger_user_id', 'player_position', 'result'], unique=False, **ACTIVE_ROWS_ONLY)
+    op.create_index('ix_logged_matches_active_user_deck', 'logged_matches',
+                    ['logger_user_id', 'deck_id', 'result'], unique=False, **ACTIVE_ROWS_ONLY)
+    op.drop_index('ix_logged_matches_active_user_summary', table_name='logged_matches')